@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Admission Control
+=================
+
+/api/message used to accept unlimited traffic. One noisy API key, or a
+scammer bot hammering a single sessionId, could use up the LLM capacity
+for everyone.
+
+Every request now gets one of three outcomes:
+- serve: normal processing (LLM tier allowed)
+- degrade: processed, but replies come from the pattern-based tier and no
+  speculative LLM work is started
+- shed: rejected with 429
+
+Features:
+- Token buckets per API key and per session, refilled lazily on access
+- A request over its bucket rate is degraded first; only once the bucket
+  is a further `burst` tokens in debt is it shed
+- Global in-flight cap: degrade above `degrade_ratio` of the cap, shed at it
+- Bounded bucket tables (least recently used evicted)
+- No locks: everything runs on the event loop thread
+
+Author: Team YUKT
+License: MIT
+"""
+
+import time
+from typing import Dict, List, Optional
+
+SERVE = "serve"
+DEGRADE = "degrade"
+SHED = "shed"
+_SEVERITY = {SERVE: 0, DEGRADE: 1, SHED: 2}
+
+
+class TokenBuckets:
+    """Lazily refilled token buckets keyed by string, LRU-bounded"""
+
+    def __init__(self, rate: float, burst: float, max_buckets: int = 100000):
+        """
+        Args:
+            rate: Tokens added per second (0 disables the limit)
+            burst: Bucket capacity; also the debt allowed while degrading
+            max_buckets: Buckets kept before the least recently used is dropped
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        self.buckets: Dict[str, List[float]] = {}  # key -> [tokens, last refill]
+
+    def take(self, key: str, now: float) -> str:
+        """Spend one token; SERVE while in credit, DEGRADE in debt, SHED past it"""
+        if self.rate <= 0:
+            return SERVE
+        bucket = self.buckets.pop(key, None)
+        if bucket is None:
+            bucket = [self.burst, now]
+            if len(self.buckets) >= self.max_buckets:
+                del self.buckets[next(iter(self.buckets))]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        self.buckets[key] = bucket  # Re-insert: most recently used last
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return SERVE
+        if bucket[0] - 1 >= -self.burst:
+            bucket[0] -= 1
+            return DEGRADE
+        return SHED
+
+
+class AdmissionController:
+    """Decides serve/degrade/shed for each /api/message request"""
+
+    def __init__(self, key_rate: float = 200.0, key_burst: float = 400.0,
+                 session_rate: float = 1.0, session_burst: float = 10.0,
+                 max_in_flight: int = 64, degrade_ratio: float = 0.75):
+        """
+        Args:
+            key_rate / key_burst: Requests per second and burst per API key
+            session_rate / session_burst: Requests per second and burst per sessionId
+            max_in_flight: Requests processed at once before shedding (0 = no cap)
+            degrade_ratio: Share of max_in_flight above which requests degrade
+        """
+        self.keys = TokenBuckets(key_rate, key_burst, max_buckets=1000)
+        self.sessions = TokenBuckets(session_rate, session_burst)
+        self.max_in_flight = max_in_flight
+        self.degrade_at = int(max_in_flight * degrade_ratio) if max_in_flight else 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.counts = {SERVE: 0, DEGRADE: 0, SHED: 0}
+        self.shed_reasons: Dict[str, int] = {}
+
+    def admit(self, api_key: Optional[str], session_id: str) -> str:
+        """
+        Classify a request; for SERVE/DEGRADE the caller must call release()
+
+        Returns:
+            SERVE, DEGRADE or SHED
+        """
+        now = time.monotonic()
+        decision, reason = SERVE, None
+
+        if self.max_in_flight:
+            if self.in_flight >= self.max_in_flight:
+                decision, reason = SHED, "in_flight"
+            elif self.in_flight >= self.degrade_at:
+                decision = DEGRADE
+
+        if decision != SHED:
+            for name, buckets, key in (("key", self.keys, api_key or ""),
+                                       ("session", self.sessions, session_id)):
+                outcome = buckets.take(key, now)
+                if _SEVERITY[outcome] > _SEVERITY[decision]:
+                    decision = outcome
+                    if outcome == SHED:
+                        reason = name
+                        break
+
+        self.counts[decision] += 1
+        if decision == SHED:
+            self.shed_reasons[reason] = self.shed_reasons.get(reason, 0) + 1
+            return decision
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return decision
+
+    def release(self):
+        """A served or degraded request finished"""
+        self.in_flight = max(self.in_flight - 1, 0)
+
+    def load(self) -> float:
+        """Requests in flight as a share of the cap (0 without a cap)"""
+        return self.in_flight / self.max_in_flight if self.max_in_flight else 0.0
+
+    def reset(self):
+        """Forget all buckets and counters"""
+        self.keys.buckets.clear()
+        self.sessions.buckets.clear()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.counts = {SERVE: 0, DEGRADE: 0, SHED: 0}
+        self.shed_reasons = {}
+
+    def stats(self) -> Dict:
+        """Served/degraded/shed counts and current load"""
+        return {
+            "served": self.counts[SERVE],
+            "degraded": self.counts[DEGRADE],
+            "shed": self.counts[SHED],
+            "shedReasons": dict(self.shed_reasons),
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "maxInFlight": self.max_in_flight,
+            "trackedSessions": len(self.sessions.buckets)
+        }
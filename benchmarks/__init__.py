@@ -0,0 +1,7 @@
+"""
+Benchmark suite for the honeypot pipeline
+
+Run from the repository root:
+    python -m benchmarks.run
+    python -m benchmarks.run --suite pipeline --baseline benchmarks/baseline.json
+"""
@@ -0,0 +1,66 @@
+"""
+Session archive throughput, compression and lazy-load cost
+
+Plays finalized conversations through the app, then archives them exactly
+as the background archiver does (payload build, batch compression, append,
+memory release) into a temporary directory, and reads them back through
+the index the way GET /api/session/{id} does for archived sessions.
+"""
+
+import asyncio
+import tempfile
+import time
+from typing import Dict
+
+from .bench_http import drive_conversations, load_app, reset_state
+from .corpus import generate_conversations
+from .harness import measure
+
+
+def run(args) -> Dict[str, Dict]:
+    """Archive finalized sessions, then lazily load them back"""
+    from session_archive import SessionArchive
+
+    main = load_app()
+    # Sessions finalize after 10 scammer turns
+    conversations = generate_conversations(args.sessions, turns=max(args.turns, 10), seed=args.seed)
+    reset_state(main)
+    drive_conversations(main, conversations, args.concurrency)
+    session_ids = [conv["sessionId"] for conv in conversations]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        archive = main.session_archive = SessionArchive(directory)
+
+        async def archive_all():
+            while await main.archive_idle_sessions(idle_seconds=0):
+                pass
+
+        started = time.perf_counter()
+        asyncio.run(archive_all())
+        elapsed = time.perf_counter() - started
+        stats = archive.stats()
+        results["archive.write"] = {
+            "ops": stats["archivedThisRun"],
+            "us_per_op": round(elapsed / max(stats["archivedThisRun"], 1) * 1e6, 3),
+            "ops_per_sec": round(stats["archivedThisRun"] / elapsed, 1) if elapsed else 0.0,
+            "compression_ratio": stats["compressionRatio"],
+            "bytes_raw": stats["bytesRaw"],
+            "bytes_compressed": stats["bytesCompressed"],
+            "sessions_left_in_memory": len(main.sessions),
+        }
+
+        def load_cold():
+            archive._members.clear()
+            for session_id in session_ids:
+                archive._members.clear()
+                archive.load(session_id)
+
+        def load_warm():
+            for session_id in session_ids:
+                archive.load(session_id)
+
+        results["archive.load.cold"] = measure(load_cold, len(session_ids), args.repeat)
+        results["archive.load.cached"] = measure(load_warm, len(session_ids), args.repeat)
+        main.session_archive = None
+    return results
@@ -0,0 +1,150 @@
+"""
+End-to-end load test against the ASGI app
+
+Requests go through the full FastAPI stack (routing, auth, JSON, every
+pipeline stage) in-process via httpx.ASGITransport. The LLM is replaced
+by a deterministic stub so results measure our own code, not the provider.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import httpx
+
+from .corpus import generate_conversations
+from .harness import latency_stats
+
+CANDIDATES_PATTERN = re.compile(r"Generate (\d+) DIFFERENT")
+
+
+class StubLLM:
+    """
+    Drop-in for the Groq/OpenAI client: client.chat.completions.create(...)
+
+    Returns unique, short victim-style replies (a numbered list when the
+    prompt asks for several) with a usage block, and can simulate provider
+    latency.
+    """
+
+    REPLIES = [
+        "Which branch did you say you are calling from",
+        "Can you send me your official email id",
+        "What is your employee ID number",
+        "Okay but what number should I call back on",
+        "Where exactly should I send the money",
+        "Who is your supervisor there",
+    ]
+
+    def __init__(self, latency_ms: float = 0.0, seed: int = 7):
+        self.latency = latency_ms / 1000.0
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        match = CANDIDATES_PATTERN.search(kwargs["messages"][-1]["content"])
+        if match:
+            count = int(match.group(1))
+            text = "\n".join(f"{i}. {self.rng.choice(self.REPLIES)} {self.calls}-{i}?"
+                              for i in range(1, count + 1))
+        else:
+            text = f"{self.rng.choice(self.REPLIES)} {self.calls}?"
+        usage = SimpleNamespace(prompt_tokens=400, completion_tokens=20, total_tokens=420)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=usage,
+        )
+
+
+def load_app(llm_latency_ms: float = 0.0):
+    """Import the API module with the LLM stubbed, callbacks, persistence, archiving and snapshots disabled"""
+    os.environ.setdefault("INTEL_INDEX_PATH", "")
+    os.environ.setdefault("DOMAIN_INDEX_PATH", "")
+    os.environ.setdefault("ARCHIVE_DIR", "")
+    os.environ.setdefault("SNAPSHOT_PATH", "")
+    # One API key drives all traffic at full speed, and long runs (--turns)
+    # replay a session faster than a human: keep both rate limits off
+    os.environ.setdefault("RATE_LIMIT_KEY_PER_SEC", "0")
+    os.environ.setdefault("RATE_LIMIT_SESSION_PER_SEC", "0")
+    import main
+
+    async def _no_callback(final_output: Dict):
+        return None
+
+    main.send_to_guvi = _no_callback
+    main.response_generator.groq_client = StubLLM(llm_latency_ms)
+    logging.disable(logging.INFO)
+    return main
+
+
+def reset_state(main, seed: int = 42):
+    """Clear all per-session state between runs and reseed reply selection"""
+    from campaign_clustering import CampaignClusterer
+    from script_registry import ScriptRegistry
+    from session_index import SessionIndex
+
+    random.seed(seed)
+    main.sessions.clear()
+    main.response_generator.sessions.clear()
+    main.intel_index.entries.clear()
+    main.campaign_clusterer = CampaignClusterer()
+    main.script_registry = ScriptRegistry()
+    main.admission.reset()
+    main.llm_budget.reset()
+    main.session_index = SessionIndex()
+
+
+async def _run_conversations(main, conversations: List[Dict], concurrency: int) -> List[float]:
+    """Play conversations against the app; returns per-request latencies"""
+    transport = httpx.ASGITransport(app=main.app)
+    headers = {"x-api-key": main.API_SECRET_KEY}
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def play(conv: Dict):
+            async with semaphore:
+                for text in conv["messages"]:
+                    payload = {
+                        "sessionId": conv["sessionId"],
+                        "message": {"sender": "scammer", "text": text},
+                        "metadata": {"channel": "SMS", "language": "English", "locale": "IN"},
+                    }
+                    started = time.perf_counter()
+                    response = await client.post("/api/message", json=payload, headers=headers)
+                    latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+        await asyncio.gather(*(play(c) for c in conversations))
+    return latencies
+
+
+def drive_conversations(main, conversations: List[Dict], concurrency: int = 16) -> List[float]:
+    """Synchronous wrapper around _run_conversations"""
+    return asyncio.run(_run_conversations(main, conversations, concurrency))
+
+
+def run(args) -> Dict[str, Dict]:
+    """End-to-end POST /api/message load test"""
+    main = load_app(args.llm_latency_ms)
+    conversations = generate_conversations(args.sessions, turns=args.turns, seed=args.seed)
+
+    # Warm up imports, regex caches and the event loop machinery
+    reset_state(main)
+    drive_conversations(main, conversations[:2], args.concurrency)
+
+    reset_state(main)
+    started = time.perf_counter()
+    latencies = drive_conversations(main, conversations, args.concurrency)
+    wall = time.perf_counter() - started
+
+    return {"http.post_message": latency_stats(latencies, wall)}
@@ -0,0 +1,95 @@
+"""
+Keyword matching: raw substring checks vs token-aware phrase matching
+
+Scores a labelled corpus (scam messages + benign chatter that contains
+keywords as substrings, e.g. "know", "spinning", "yours", "company") with
+both matchers and reports accuracy next to throughput. The substring
+matcher is kept here as a reference copy of the previous behaviour.
+"""
+
+from typing import Dict, List, Tuple
+
+from .corpus import generate_labelled_messages
+from .harness import measure, print_section
+
+
+def legacy_detect(detector, text: str) -> Dict:
+    """Reference: AdvancedScamDetector scoring with `term in text` checks"""
+    lower = text.lower()
+    mask = 0
+    total = 0
+    for term, (weight, bit) in detector._term_columns.items():
+        if term in lower:
+            mask |= bit
+            total += weight
+    return detector._score(mask, total)
+
+
+def legacy_red_flags(red_flags, text: str) -> List[str]:
+    """Reference: RedFlagDetector pattern checks with `pattern in text`"""
+    lower = text.lower()
+    return [
+        name for name, flag in red_flags.red_flags.items()
+        if any(p in lower for p in flag["patterns"])
+    ]
+
+
+def accuracy(predictions: List[bool], labelled: List[Tuple[str, bool]]) -> Dict:
+    """Confusion-matrix summary of is_scam predictions"""
+    tp = sum(1 for p, (_, y) in zip(predictions, labelled) if p and y)
+    fp = sum(1 for p, (_, y) in zip(predictions, labelled) if p and not y)
+    fn = sum(1 for p, (_, y) in zip(predictions, labelled) if not p and y)
+    tn = len(labelled) - tp - fp - fn
+    return {
+        "accuracy": round((tp + tn) / len(labelled), 4),
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 0.0,
+        "false_positive_rate": round(fp / (fp + tn), 4) if fp + tn else 0.0,
+    }
+
+
+def run(args) -> Dict[str, Dict]:
+    """Accuracy and per-message cost of both matchers on the labelled corpus"""
+    from message_analysis import MessageAnalysis
+    from red_flag_detector import RedFlagDetector
+    from scam_detector import AdvancedScamDetector
+
+    detector = AdvancedScamDetector()
+    red_flags = RedFlagDetector()
+    labelled = generate_labelled_messages(args.messages, scam_ratio=0.5, seed=args.seed)
+    texts = [text for text, _ in labelled]
+    ham = [text for text, is_scam in labelled if not is_scam]
+
+    def legacy():
+        for text in texts:
+            legacy_detect(detector, text)
+            legacy_red_flags(red_flags, text)
+
+    def token_aware():
+        for text in texts:
+            analysis = MessageAnalysis(text)
+            detector.detect(analysis)
+            red_flags.detect_red_flags(analysis)
+
+    results = {
+        "matching.legacy_substring": measure(legacy, len(texts), args.repeat),
+        "matching.token_aware": measure(token_aware, len(texts), args.repeat),
+    }
+
+    results["matching.legacy_substring"].update(
+        accuracy([legacy_detect(detector, t)["is_scam"] for t in texts], labelled),
+        ham_flags_per_message=round(
+            sum(len(legacy_red_flags(red_flags, t)) for t in ham) / max(len(ham), 1), 4),
+    )
+    results["matching.token_aware"].update(
+        accuracy([detector.detect(t)["is_scam"] for t in texts], labelled),
+        ham_flags_per_message=round(
+            sum(len(red_flags.detect_red_flags(t)["red_flags"]) for t in ham) / max(len(ham), 1), 4),
+    )
+
+    columns = ("accuracy", "precision", "recall", "false_positive_rate", "ham_flags_per_message")
+    lines = [f"{'matcher':<30}" + "".join(f"{c:>22}" for c in columns)]
+    for name in ("matching.legacy_substring", "matching.token_aware"):
+        lines.append(f"{name:<30}" + "".join(f"{results[name][c]:>22}" for c in columns))
+    print_section(f"Keyword matching accuracy ({len(texts)} labelled messages)", "\n".join(lines))
+    return results
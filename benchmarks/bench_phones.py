@@ -0,0 +1,112 @@
+"""
+Phone extraction cost on account-number-heavy messages
+
+Compares the current extractor with the previous three-regex
+implementation (kept here as a reference) and counts how many
+phonenumbers.parse calls each one makes. The current path runs the full
+numeric span scan, which also classifies the message's accounts, cards
+and reference IDs for the other extractors.
+"""
+
+import random
+import re
+from typing import Dict, List
+
+import phonenumbers
+
+from .harness import measure
+
+
+def legacy_extract_phones(message: str) -> List[str]:
+    """Reference copy of the three-regex extractor the cached version replaced"""
+    phones = set()
+    for match in re.findall(r'\+91[\s\-]?\d{5}[\s\-]?\d{5}|\+91[\s\-]?\d{10}', message):
+        cleaned = re.sub(r'\D', '', match)
+        if len(cleaned) == 12 and cleaned.startswith('91'):
+            phones.add('+' + cleaned)
+    for match in re.findall(r'\b[6-9]\d{4}[\s\-]?\d{5}\b', message):
+        cleaned = re.sub(r'\D', '', match)
+        if len(cleaned) == 10:
+            phones.add(cleaned)
+    for match in re.findall(r'\(?\d{5}\)?[\s\-]?\d{5}', message):
+        cleaned = re.sub(r'\D', '', match)
+        if len(cleaned) == 10 and cleaned[0] in '6789':
+            phones.add(cleaned)
+
+    validated = []
+    for phone in phones:
+        try:
+            region = None if phone.startswith('+') else "IN"
+            phone_obj = phonenumbers.parse(phone, region)
+            if phonenumbers.is_valid_number(phone_obj):
+                validated.append(phonenumbers.format_number(phone_obj, phonenumbers.PhoneNumberFormat.E164))
+        except Exception:
+            if len(phone) >= 10:
+                validated.append(phone)
+    return validated
+
+
+def account_heavy_messages(count: int, seed: int) -> List[str]:
+    """Messages dominated by long account/reference numbers, a few phones"""
+    rng = random.Random(seed)
+
+    def digits(n: int, first: str = "") -> str:
+        return first + "".join(str(rng.randint(0, 9)) for _ in range(n - len(first)))
+
+    phones = [digits(10, rng.choice("6789")) for _ in range(20)]
+    messages = []
+    for _ in range(count):
+        parts = [
+            f"Transfer to account {digits(rng.randint(12, 18), rng.choice('6789'))} IFSC SBIN0{digits(6)}",
+            f"reference {digits(14, '9')} and txn {digits(16, '8')}",
+        ]
+        if rng.random() < 0.3:
+            parts.append(f"call +91 {rng.choice(phones)}")
+        messages.append(". ".join(parts))
+    return messages
+
+
+def _count_parse_calls(fn, messages: List[str]) -> int:
+    """Run fn over messages once, counting phonenumbers.parse calls"""
+    original = phonenumbers.parse
+    calls = 0
+
+    def counting_parse(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    phonenumbers.parse = counting_parse
+    try:
+        for message in messages:
+            fn(message)
+    finally:
+        phonenumbers.parse = original
+    return calls
+
+
+def run(args) -> Dict[str, Dict]:
+    """Legacy vs current phone extraction on account-heavy text"""
+    import enhanced_extractor
+
+    extractor = enhanced_extractor.EnhancedIntelligenceExtractor()
+    messages = account_heavy_messages(args.messages, args.seed)
+    results = {}
+
+    def legacy():
+        for message in messages:
+            legacy_extract_phones(message)
+
+    def current():
+        for message in messages:
+            extractor._extract_phones_advanced(message)
+
+    enhanced_extractor._to_e164.cache_clear()
+    current_parses = _count_parse_calls(extractor._extract_phones_advanced, messages)
+    legacy_parses = _count_parse_calls(legacy_extract_phones, messages)
+
+    results["phones.legacy_extract"] = measure(legacy, len(messages), args.repeat)
+    results["phones.legacy_extract"]["parse_calls"] = legacy_parses
+    results["phones.extract"] = measure(current, len(messages), args.repeat)
+    results["phones.extract"]["parse_calls"] = current_parses
+    return results
@@ -0,0 +1,82 @@
+"""
+Micro-benchmarks for the individual pipeline stages
+"""
+
+from typing import Dict
+
+from .bench_http import drive_conversations, load_app, reset_state
+from .corpus import generate_conversations, generate_scam_messages
+from .harness import measure
+
+
+def run(args) -> Dict[str, Dict]:
+    """Per-stage cost: normalization, detection, red flags, extraction, a full
+    turn through the shared MessageAnalysis, final output"""
+    from enhanced_extractor import EnhancedIntelligenceExtractor
+    from message_analysis import MessageAnalysis
+    from red_flag_detector import RedFlagDetector
+    from scam_detector import AdvancedScamDetector
+    from text_normalizer import normalize_message
+
+    messages = generate_scam_messages(args.messages, seed=args.seed)
+    detector = AdvancedScamDetector()
+    red_flags = RedFlagDetector()
+    extractor = EnhancedIntelligenceExtractor()
+
+    results = {}
+
+    def normalize():
+        for text in messages:
+            normalize_message(text)
+
+    def detect():
+        for text in messages:
+            detector.detect(text)
+
+    def detect_red_flags():
+        for text in messages:
+            red_flags.detect_red_flags(text)
+
+    def extract():
+        extractor.extracted_cache.clear()  # Measure extraction, not cache hits
+        for text in messages:
+            extractor.extract(text)
+
+    results["pipeline.normalize"] = measure(normalize, len(messages), args.repeat)
+    results["pipeline.detect"] = measure(detect, len(messages), args.repeat)
+    results["pipeline.detect_red_flags"] = measure(detect_red_flags, len(messages), args.repeat)
+    results["pipeline.extract"] = measure(extract, len(messages), args.repeat)
+
+    # One turn as handle_message runs it: analysis built once, shared by
+    # detection, red flags (with history) and extraction (with history)
+    conversations = generate_conversations(args.sessions, turns=args.turns, seed=args.seed)
+    turns = sum(len(c["messages"]) for c in conversations)
+
+    def turn():
+        extractor.extracted_cache.clear()
+        for conv in conversations:
+            history = []
+            texts = []
+            for text in conv["messages"]:
+                analysis = MessageAnalysis(normalize_message(text))
+                history.append({"sender": "scammer", "text": analysis.text})
+                texts.append(analysis.text)
+                detector.detect(analysis)
+                red_flags.detect_red_flags(analysis, history)
+                extractor.extract(analysis, texts, normalized=True)
+
+    results["pipeline.turn"] = measure(turn, turns, args.repeat)
+
+    # build_final_output runs on real sessions produced by the API itself
+    main = load_app()
+    reset_state(main)
+    drive_conversations(main, conversations)
+    items = list(main.sessions.items())
+
+    def final_output():
+        for session_id, session in items:
+            main.build_final_output(session_id, session)
+
+    results["pipeline.build_final_output"] = measure(final_output, len(items), args.repeat)
+    reset_state(main)
+    return results
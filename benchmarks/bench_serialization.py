@@ -0,0 +1,105 @@
+"""
+JSON parse/serialize cost per request
+
+Compares the previous stdlib path (json.loads + hand-navigated dicts on the
+way in, jsonable_encoder + JSONResponse on the way out) with the current
+orjson path: parse_incoming() into the IncomingRequest model, reply_response()
+for replies and ORJSONResponse for the /api/session payload. Request bodies
+carry a growing conversationHistory, as platform clients send it.
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from .bench_http import drive_conversations, load_app, reset_state
+from .corpus import generate_conversations
+from .harness import measure
+
+VICTIM_REPLY = "Which branch did you say you are calling from?"
+
+
+def request_bodies(conversations: List[Dict]) -> List[bytes]:
+    """One encoded /api/message body per turn, history included"""
+    stamp = datetime.now(timezone.utc).isoformat()
+    bodies = []
+    for conv in conversations:
+        history = []
+        for text in conv["messages"]:
+            bodies.append(json.dumps({
+                "sessionId": conv["sessionId"],
+                "message": {"sender": "scammer", "text": text, "timestamp": stamp},
+                "conversationHistory": history,
+                "metadata": {"channel": "SMS", "language": "English", "locale": "IN"},
+            }).encode())
+            history = history + [
+                {"sender": "scammer", "text": text, "timestamp": stamp},
+                {"sender": "user", "text": VICTIM_REPLY, "timestamp": stamp},
+            ]
+    return bodies
+
+
+def legacy_parse(raw: bytes) -> Dict:
+    """Reference copy of the request handling parse_incoming() replaced"""
+    try:
+        body = json.loads(raw)
+    except Exception:
+        body = {}
+    if not body:
+        return {}
+    session_id = body.get("sessionId", "session-0")
+    if "message" in body and isinstance(body["message"], dict):
+        text = body["message"].get("text", "")
+        sender = body["message"].get("sender", "scammer")
+    else:
+        text, sender = "", "scammer"
+    return {"sessionId": session_id, "text": text, "sender": sender}
+
+
+def run(args) -> Dict[str, Dict]:
+    """Request parsing, reply rendering and session payload encoding"""
+    main = load_app()
+    conversations = generate_conversations(min(args.sessions, 50), turns=args.turns, seed=args.seed)
+    bodies = request_bodies(conversations)
+
+    reset_state(main)
+    drive_conversations(main, conversations, args.concurrency)
+    payloads = [main.session_details(conv["sessionId"]) for conv in conversations]
+    reply = main.APIResponse(status="success", reply=VICTIM_REPLY)
+    replies = 1000
+
+    def parse_legacy():
+        for raw in bodies:
+            legacy_parse(raw)
+
+    def parse_current():
+        for raw in bodies:
+            main.parse_incoming(raw)
+
+    def reply_legacy():
+        for _ in range(replies):
+            JSONResponse(jsonable_encoder(reply))
+
+    def reply_current():
+        for _ in range(replies):
+            main.reply_response(reply)
+
+    def session_legacy():
+        for payload in payloads:
+            JSONResponse(jsonable_encoder(payload))
+
+    def session_current():
+        for payload in payloads:
+            main.ORJSONResponse(payload)
+
+    return {
+        "serialization.request.legacy": measure(parse_legacy, len(bodies), args.repeat),
+        "serialization.request": measure(parse_current, len(bodies), args.repeat),
+        "serialization.reply.legacy": measure(reply_legacy, replies, args.repeat),
+        "serialization.reply": measure(reply_current, replies, args.repeat),
+        "serialization.session.legacy": measure(session_legacy, len(payloads), args.repeat),
+        "serialization.session": measure(session_current, len(payloads), args.repeat),
+    }
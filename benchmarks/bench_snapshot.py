@@ -0,0 +1,76 @@
+"""
+Snapshot pause and warm-restart cost at scale
+
+Plays a few real conversations, clones their state up to
+--snapshot-sessions sessions (100k by default), then measures:
+- a first snapshot of every session (longest event-loop pause and total)
+- an incremental snapshot with 1% of sessions dirty
+- restoring the file, as startup does
+"""
+
+import asyncio
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict
+
+from .bench_http import drive_conversations, load_app, reset_state
+from .corpus import generate_conversations
+
+
+def _result(ops: int, seconds: float, **extra) -> Dict:
+    return {
+        "ops": ops,
+        "us_per_op": round(seconds / max(ops, 1) * 1e6, 3),
+        "ops_per_sec": round(ops / seconds, 1) if seconds else 0.0,
+        **extra,
+    }
+
+
+def run(args) -> Dict[str, Dict]:
+    """Full snapshot, incremental snapshot and restore of many sessions"""
+    from session_snapshot import SnapshotLog
+
+    main = load_app()
+    conversations = generate_conversations(min(args.sessions, 100), turns=args.turns, seed=args.seed)
+    reset_state(main)
+    drive_conversations(main, conversations, args.concurrency)
+
+    templates = [pickle.dumps(main.capture_session(conv["sessionId"])) for conv in conversations]
+    main.sessions.clear()
+    main.response_generator.sessions.clear()
+    for i in range(args.snapshot_sessions):
+        session, generator_state = pickle.loads(templates[i % len(templates)])
+        session_id = f"snapshot-{i}"
+        main.sessions[session_id] = session
+        if generator_state is not None:
+            main.response_generator.sessions[session_id] = generator_state
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.snapshot")
+        snapshots = main.session_snapshots = SnapshotLog(path)
+        session_ids = list(main.sessions)
+
+        for session_id in session_ids:
+            snapshots.mark(session_id)
+        started = time.perf_counter()
+        written = asyncio.run(main.take_snapshot())
+        results["snapshot.full"] = _result(written, time.perf_counter() - started,
+                                           max_pause_ms=round(snapshots.last_pause_ms, 3),
+                                           file_bytes=snapshots.log_bytes)
+
+        for session_id in session_ids[::100]:
+            snapshots.mark(session_id)
+        started = time.perf_counter()
+        written = asyncio.run(main.take_snapshot())
+        results["snapshot.incremental"] = _result(written, time.perf_counter() - started,
+                                                  max_pause_ms=round(snapshots.last_pause_ms, 3))
+
+        restored = SnapshotLog(path)
+        started = time.perf_counter()
+        states = restored.load()
+        results["snapshot.restore"] = _result(len(states), time.perf_counter() - started)
+        main.session_snapshots = None
+    return results
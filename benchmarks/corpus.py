@@ -0,0 +1,158 @@
+"""
+Synthetic scam conversation generator
+
+Every generator takes a seed and returns the same corpus for the same
+arguments, so benchmark runs are reproducible and comparable.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+BANKS = ["SBI", "HDFC", "ICICI", "Axis", "Kotak", "PNB"]
+NAMES = ["Rahul Sharma", "Priya Verma", "Amit Kumar", "Neha Singh", "Vikram Rao"]
+UPI_HANDLES = ["ybl", "paytm", "okaxis", "ibl", "upi", "axl"]
+DOMAINS = ["sbi-kyc-update.com", "hdfc-secure.in", "reward-claim.net", "icici-verify.org"]
+SHORTENERS = ["bit.ly", "tinyurl.com", "is.gd"]
+
+OPENERS = {
+    "bank": [
+        "URGENT: Your {bank} account has been blocked due to pending KYC. Call {phone} immediately.",
+        "Dear customer, your {bank} account will be suspended today. Verify now at {url}",
+        "This is {name} from {bank} fraud department. Your account is locked, share OTP to unlock.",
+    ],
+    "upi": [
+        "Your UPI ID is deactivated. Send Rs 1 to {upi} to reactivate immediately.",
+        "Payment of Rs {amount} pending. Confirm by sending to {upi} now.",
+    ],
+    "lottery": [
+        "Congratulations! You are the winner of Rs {amount} lottery. Pay registration fee to {upi}.",
+        "You have won a prize of Rs {amount}! Claim at {url} before it expires today.",
+    ],
+    "job": [
+        "Work from home opportunity! Earn Rs {amount} daily. Registration fee Rs 500, contact {phone}.",
+        "Part time job offer: earn {amount} per day. Send details to {email}.",
+    ],
+    "tax": [
+        "Income tax department: penalty of Rs {amount} pending. Pay now or legal action. Call {phone}.",
+    ],
+}
+
+FOLLOW_UPS = [
+    "Sir please hurry, your account will be blocked in 10 minutes.",
+    "Send the OTP you received on your phone now.",
+    "My employee ID is EMP{digits4}. You can call me at {phone}.",
+    "Transfer Rs {amount} to account {account} IFSC {ifsc} immediately.",
+    "Click this link to verify: {url}",
+    "You can also pay via UPI to {upi}.",
+    "Email the documents to {email} for faster processing.",
+    "Don't call the branch, this is confidential. Only through this number.",
+    "I am {name}, senior officer. Trust me, this is official.",
+    "Why are you delaying? Police case will be filed today.",
+    "Share your card number and CVV to complete verification.",
+    "Your case reference number is CASE{digits6}. Note it down.",
+]
+
+HAM = [
+    "Hey, are we still meeting for lunch tomorrow?",
+    "I know you said the company picnic is next week, right?",
+    "The spinning class was great, thanks for the recommendation.",
+    "Yours sincerely, the organising committee.",
+    "Can you pick up some vegetables on the way home?",
+    "Happy birthday! Hope you have a wonderful day.",
+    "The meeting has been moved to 3 pm, see you there.",
+    "Mom says dinner will be ready by eight.",
+    "Did you watch the match last night? What a finish!",
+    "Please review the attached report when you get a chance.",
+    # Benign text containing scam keywords as substrings of other words
+    "Do you know whether the snow has stopped up north?",
+    "She learned to play the piano while shopping downtown.",
+    "The company accountant sent yours and others' forms already.",
+    "That was a wonderful concert, the drummer was spinning his sticks.",
+    "Our panel discussion on Japanese cuisine starts at noon.",
+    "My grandfather's stories of the olden days are priceless.",
+    "I'm happy the apples arrived fresh this time.",
+    "Let's decode this crossword together after dinner.",
+    "The taxi dropped me at the cinema, the show was a masterpiece.",
+    "Nowadays the kids prefer cycling to the park on Sundays.",
+    "Your sister's wedding photos are lovely, the colours are stunning.",
+    "Keep the spinach and pineapple in the fridge please.",
+    "We earned nothing from the bake sale but it was fun to learn.",
+    "The clinic appointment is on Friday; the doctor is kind.",
+    "Ours is the blue house opposite the temple, next to the chemist.",
+]
+
+VICTIM_REPLIES = [
+    "What? Why is my account blocked?",
+    "Who is this? Can you give me your number?",
+    "I am not sure about this, can you email me?",
+    "Which branch are you calling from?",
+    "What is your employee ID?",
+]
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    """Fill template slots with random but realistic values"""
+    name = rng.choice(NAMES)
+    return template.format(
+        bank=rng.choice(BANKS),
+        name=name,
+        phone=rng.choice(["", "+91 "]) + str(rng.randint(6, 9)) + "".join(str(rng.randint(0, 9)) for _ in range(9)),
+        upi=name.split()[0].lower() + str(rng.randint(1, 999)) + "@" + rng.choice(UPI_HANDLES),
+        email=name.split()[0].lower() + "." + rng.choice(BANKS).lower() + "@gmail.com",
+        url=rng.choice(["http://", "https://", ""]) + rng.choice(DOMAINS + SHORTENERS) + "/" + "".join(rng.choice("abcdefgh123") for _ in range(6)),
+        amount=rng.choice([500, 1999, 25000, 100000, 2500000]),
+        account="".join(str(rng.randint(0, 9)) for _ in range(rng.randint(11, 16))),
+        ifsc=rng.choice(["SBIN", "HDFC", "ICIC", "UTIB"]) + "0" + "".join(str(rng.randint(0, 9)) for _ in range(6)),
+        digits4="".join(str(rng.randint(0, 9)) for _ in range(4)),
+        digits6="".join(str(rng.randint(0, 9)) for _ in range(6)),
+    )
+
+
+def generate_scam_messages(count: int, seed: int = 42) -> List[str]:
+    """Independent scammer messages drawn from openers and follow-ups"""
+    rng = random.Random(seed)
+    templates = [t for group in OPENERS.values() for t in group] + FOLLOW_UPS
+    return [_fill(rng.choice(templates), rng) for _ in range(count)]
+
+
+def generate_conversations(count: int, turns: int = 10, seed: int = 42) -> List[Dict]:
+    """
+    Multi-turn scammer conversations
+
+    Returns a list of {"sessionId", "scamType", "messages": [scammer texts]}.
+    """
+    rng = random.Random(seed)
+    conversations = []
+    for i in range(count):
+        scam_type = rng.choice(sorted(OPENERS))
+        messages = [_fill(rng.choice(OPENERS[scam_type]), rng)]
+        for _ in range(turns - 1):
+            messages.append(_fill(rng.choice(FOLLOW_UPS), rng))
+        conversations.append({
+            "sessionId": f"bench-{seed}-{i:06d}",
+            "scamType": scam_type,
+            "messages": messages,
+        })
+    return conversations
+
+
+def generate_labelled_messages(count: int, scam_ratio: float = 0.5, seed: int = 42) -> List[Tuple[str, bool]]:
+    """(text, is_scam) pairs mixing scam messages and benign chatter"""
+    rng = random.Random(seed)
+    scam = generate_scam_messages(count, seed)
+    labelled = []
+    for i in range(count):
+        if rng.random() < scam_ratio:
+            labelled.append((scam[i], True))
+        else:
+            labelled.append((rng.choice(HAM), False))
+    return labelled
+
+
+def conversation_history(messages: List[str], rng: random.Random) -> List[Dict]:
+    """Build an API-style history of alternating scammer/victim messages"""
+    history = []
+    for text in messages:
+        history.append({"sender": "scammer", "text": text})
+        history.append({"sender": "user", "text": rng.choice(VICTIM_REPLIES)})
+    return history
@@ -0,0 +1,155 @@
+"""
+Timing, result storage and baseline comparison helpers
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+def measure(fn: Callable[[], None], ops: int, repeat: int = 5, warmup: int = 1) -> Dict:
+    """
+    Time fn() `repeat` times and report per-operation cost
+
+    Args:
+        fn: Callable performing `ops` operations per call
+        ops: Number of operations one call performs (e.g. messages processed)
+        repeat: Timed runs; the median is reported
+        warmup: Untimed runs before measuring
+
+    Returns:
+        Stats dict with ops_per_sec, us_per_op (median) and min_us_per_op
+    """
+    for _ in range(warmup):
+        fn()
+
+    # Like timeit: keep garbage collection pauses out of the samples
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    samples = []
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(samples)
+    return {
+        "ops": ops,
+        "repeat": repeat,
+        "us_per_op": round(median / ops * 1e6, 3),
+        "min_us_per_op": round(min(samples) / ops * 1e6, 3),
+        "ops_per_sec": round(ops / median, 1) if median else 0.0,
+    }
+
+
+def latency_stats(latencies: List[float], wall_seconds: float) -> Dict:
+    """Summarize per-request latencies (seconds) from a load test"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(int(p * count), count - 1)] * 1000, 3)
+
+    return {
+        "ops": count,
+        "us_per_op": round(wall_seconds / count * 1e6, 3),
+        "ops_per_sec": round(count / wall_seconds, 1) if wall_seconds else 0.0,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def build_report(results: Dict[str, Dict], settings: Dict) -> Dict:
+    """Wrap results with the environment needed to interpret them"""
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": settings,
+        },
+        "results": results,
+    }
+
+
+def save_report(report: Dict, path: str):
+    """Write a report as pretty JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_report(path: str) -> Dict:
+    """Read a report written by save_report"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.10) -> List[Dict]:
+    """
+    Compare per-op cost against a baseline report
+
+    A benchmark regresses when its us_per_op grows by more than `tolerance`
+    (0.10 = 10%). Benchmarks missing from either side are skipped.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, stats in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if not base or not base.get("us_per_op"):
+            continue
+        ratio = stats["us_per_op"] / base["us_per_op"]
+        if ratio > 1 + tolerance:
+            status = "REGRESSION"
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "baseline_us": base["us_per_op"],
+            "current_us": stats["us_per_op"],
+            "ratio": round(ratio, 3),
+            "status": status,
+        })
+    return rows
+
+
+def format_results(results: Dict[str, Dict]) -> str:
+    """Render results as an aligned text table"""
+    lines = [f"{'benchmark':<44} {'us/op':>12} {'ops/s':>14}"]
+    for name, stats in sorted(results.items()):
+        lines.append(f"{name:<44} {stats['us_per_op']:>12,.3f} {stats['ops_per_sec']:>14,.1f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Render a baseline comparison as an aligned text table"""
+    lines = [f"{'benchmark':<44} {'baseline':>12} {'current':>12} {'ratio':>7}  status"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<44} {row['baseline_us']:>12,.3f} {row['current_us']:>12,.3f} "
+            f"{row['ratio']:>7.3f}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def print_section(title: str, body: Optional[str] = None):
+    """Print a titled block to stdout"""
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+    if body:
+        print(body)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner
+
+Runs the selected suites, prints a results table, optionally writes JSON
+results and compares them with a stored baseline.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --suite pipeline http --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --fail-on-regression
+    python -m benchmarks.run --output benchmarks/baseline.json   # refresh baseline
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from . import (bench_archive, bench_http, bench_matching, bench_phones,
+               bench_pipeline, bench_serialization, bench_snapshot)
+from .harness import (build_report, compare, format_comparison, format_results,
+                      load_report, print_section, save_report)
+
+SUITES = {
+    "archive": bench_archive.run,
+    "matching": bench_matching.run,
+    "phones": bench_phones.run,
+    "pipeline": bench_pipeline.run,
+    "http": bench_http.run,
+    "serialization": bench_serialization.run,
+    "snapshot": bench_snapshot.run,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run honeypot benchmarks")
+    parser.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=sorted(SUITES),
+                        help="Suites to run (default: all)")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages per micro-benchmark")
+    parser.add_argument("--sessions", type=int, default=200, help="Conversations for session-level benchmarks")
+    parser.add_argument("--turns", type=int, default=10, help="Scammer turns per conversation")
+    parser.add_argument("--snapshot-sessions", type=int, default=100000, help="Sessions in the snapshot benchmark")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent sessions in the load test")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated LLM latency for the stub")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per micro-benchmark")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--baseline", help="Compare against a stored JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown before flagging (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any benchmark regressed")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suite:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(SUITES[name](args))
+
+    settings = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "fail_on_regression")}
+    report = build_report(results, settings)
+    print_section("Results", format_results(results))
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nSaved results to {args.output}")
+
+    if args.baseline:
+        rows = compare(report, load_report(args.baseline), args.tolerance)
+        print_section(f"Compared with {args.baseline}", format_comparison(rows))
+        if args.fail_on_regression and any(r["status"] == "REGRESSION" for r in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
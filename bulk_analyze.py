@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Offline Bulk Analyzer
+=====================
+
+Streams an archived message corpus through the detection and extraction
+pipeline for retro-hunting. Runs fully offline - no API server, no LLM.
+
+Features:
+- JSONL or CSV input (file or stdin), JSONL output (file or stdout)
+- Generator-based streaming with a bounded number of in-flight chunks,
+  so memory stays constant regardless of corpus size
+- Process pool parallelism across all cores
+- Throughput reporting in messages per second
+
+Each output line carries the scam verdict (AdvancedScamDetector), the red
+flags (RedFlagDetector) and the extracted intelligence
+(EnhancedIntelligenceExtractor) for one input message.
+
+Usage:
+    python bulk_analyze.py corpus.jsonl -o results.jsonl
+    python bulk_analyze.py archive.csv --text-field body --id-field msg_id
+    cat corpus.jsonl | python bulk_analyze.py - --text-field message.text
+
+Author: Team YUKT
+License: MIT
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from enhanced_extractor import EnhancedIntelligenceExtractor
+from red_flag_detector import RedFlagDetector
+from scam_detector import AdvancedScamDetector
+from message_analysis import MessageAnalysis
+from text_normalizer import normalize_message
+
+# Per-process pipeline, built once by the pool initializer
+_pipeline = None
+
+
+def _init_worker():
+    """Build the detectors once per worker process"""
+    global _pipeline
+    _pipeline = (
+        AdvancedScamDetector(),
+        RedFlagDetector(),
+        EnhancedIntelligenceExtractor()
+    )
+
+
+def analyze_message(record: Dict) -> Dict:
+    """Run one record through detection, red flags and extraction"""
+    if _pipeline is None:
+        _init_worker()
+    scam_detector, red_flag_detector, extractor = _pipeline
+
+    analysis = MessageAnalysis(normalize_message(record["text"]))
+    detection = scam_detector.detect(analysis)
+    red_flags = red_flag_detector.detect_red_flags(analysis)
+    intel = extractor.extract(analysis)
+
+    return {
+        "id": record["id"],
+        "scamDetected": detection["is_scam"],
+        "confidenceLevel": round(detection["confidence"], 4),
+        "scamType": detection["scam_type"],
+        "riskLevel": red_flags["risk_level"],
+        "riskScore": round(red_flags["risk_score"], 4),
+        "redFlags": [f["flag"] for f in red_flags["red_flags"]],
+        "extractedIntelligence": intel
+    }
+
+
+def _analyze_chunk(chunk: List[Dict]) -> List[Dict]:
+    """Worker entry point - analyze a chunk of records"""
+    return [analyze_message(record) for record in chunk]
+
+
+def _get_field(obj: Dict, path: str):
+    """Resolve a dotted field path such as 'message.text'"""
+    for part in path.split("."):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(part)
+    return obj
+
+
+def read_records(stream: TextIO, fmt: str, text_field: str = "text",
+                 id_field: str = "id", stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Lazily yield {"id", "text"} records from a JSONL or CSV stream
+
+    Malformed lines and records without text are skipped and counted
+    in stats["skipped"].
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("skipped", 0)
+
+    if fmt == "csv":
+        rows = csv.DictReader(stream)
+    else:
+        rows = _iter_jsonl(stream, stats)
+
+    for line_no, row in enumerate(rows, 1):
+        text = _get_field(row, text_field)
+        if not isinstance(text, str) or not text:
+            stats["skipped"] += 1
+            continue
+        record_id = _get_field(row, id_field)
+        yield {"id": record_id if record_id is not None else line_no, "text": text}
+
+
+def _iter_jsonl(stream: TextIO, stats: Dict) -> Iterator[Dict]:
+    """Yield parsed JSON objects, skipping blank or malformed lines"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            stats["skipped"] += 1
+            continue
+        if isinstance(obj, dict):
+            yield obj
+        else:
+            stats["skipped"] += 1
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_stream(records: Iterable[Dict], workers: int = 1, chunk_size: int = 256,
+                   max_pending: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Analyze records lazily, preserving input order
+
+    With workers > 1, chunks are fanned out to a process pool. At most
+    `max_pending` chunks are in flight at any time, so the input is never
+    read ahead of the consumer by more than max_pending * chunk_size records.
+    """
+    if workers <= 1:
+        for record in records:
+            yield analyze_message(record)
+        return
+
+    if max_pending is None:
+        max_pending = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in chunked(records, chunk_size):
+            pending.append(pool.submit(_analyze_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    """Pick input format from the flag or the file extension"""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _report(processed: int, started: float, stream: TextIO, final: bool = False):
+    """Write a throughput line to stderr"""
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    label = "Done" if final else "Progress"
+    stream.write(f"{label}: {processed} messages in {elapsed:.1f}s ({processed / elapsed:,.0f} msg/s)\n")
+    stream.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run scam detection, red flags and intelligence extraction over a message corpus (offline)."
+    )
+    parser.add_argument("input", help="Input file (.jsonl or .csv), or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from extension)")
+    parser.add_argument("--text-field", default="text", help="Field holding the message text; dotted paths allowed")
+    parser.add_argument("--id-field", default="id", help="Field holding the record ID (default: line number)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Records per worker task")
+    parser.add_argument("--progress-every", type=float, default=5.0, help="Seconds between progress lines (0 = off)")
+    args = parser.parse_args(argv)
+
+    fmt = _detect_format(args.input, args.format)
+    in_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    stats = {"skipped": 0}
+    processed = 0
+    started = time.perf_counter()
+    last_report = started
+
+    try:
+        records = read_records(in_stream, fmt, args.text_field, args.id_field, stats)
+        for result in analyze_stream(records, args.workers, args.chunk_size):
+            out_stream.write(json.dumps(result, ensure_ascii=False))
+            out_stream.write("\n")
+            processed += 1
+
+            if args.progress_every and processed % 1000 == 0:
+                now = time.perf_counter()
+                if now - last_report >= args.progress_every:
+                    _report(processed, started, sys.stderr)
+                    last_report = now
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+    _report(processed, started, sys.stderr, final=True)
+    if stats["skipped"]:
+        sys.stderr.write(f"Skipped: {stats['skipped']} malformed or empty records\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Campaign Clustering Engine
+==========================
+
+Groups sessions into scam campaigns: scammers reuse the same scripts and
+the same phones/UPI IDs/accounts across many victims.
+
+Features:
+- MinHash signatures over normalized word shingles of scammer messages
+- LSH banding for sub-linear candidate lookup (no all-pairs comparison)
+- Shared-identifier edges from extracted intelligence
+- Incremental merging: each message only touches its own LSH buckets;
+  a merge re-labels the smaller campaign's members
+- Background processing via a work queue drained off the reply path
+- Sessions can be discarded (archived); their campaign, label and shared
+  identifiers live on through the remaining members
+
+Signatures are updated incrementally (MinHash of a union is the
+element-wise minimum), so a session's script similarity sharpens as the
+conversation goes on.
+
+Author: Team YUKT
+License: MIT
+"""
+
+import random
+import re
+import zlib
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from intel_index import normalize_identifier
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_PATTERN = re.compile(r'[a-z#]+')
+_DIGITS_PATTERN = re.compile(r'\d+')
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word shingles of a message
+
+    Digits collapse to '#' so the same script with different phone numbers
+    or amounts still produces the same shingles.
+    """
+    words = _WORD_PATTERN.findall(_DIGITS_PATTERN.sub('#', text.lower()))
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+class CampaignClusterer:
+    """Assigns sessions to campaigns with MinHash/LSH and identifier edges"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5,
+                 max_candidates: int = 32, seed: int = 1):
+        """
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands (num_perm must divide evenly)
+            threshold: Estimated Jaccard similarity needed to join a campaign
+            max_candidates: Members compared per hot bucket
+            seed: Seed for the hash permutations (keep stable across restarts)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self.signatures: Dict[str, array] = {}
+        self.session_bands: Dict[str, Tuple[int, ...]] = {}
+        self.buckets: Dict[Tuple[int, int], Dict[str, None]] = {}  # Ordered sets
+        self.identifier_owner: Dict[str, str] = {}
+        self.owned: Dict[str, list] = {}  # session_id -> identifiers it owns
+
+        # Campaigns keyed by label (the founding session's ID, kept after it
+        # leaves): session -> label, label -> ordered member set
+        self.campaign: Dict[str, str] = {}
+        self.members: Dict[str, Dict[str, None]] = {}
+
+        # Work submitted by handle_message, drained by the background worker
+        self.pending = deque()
+
+    # ============= WORK QUEUE =============
+
+    def submit(self, session_id: str, text: Optional[str] = None,
+               identifiers: Optional[Dict[str, Iterable[str]]] = None):
+        """Queue a scammer message and/or new identifiers for clustering"""
+        self.pending.append((session_id, text, identifiers))
+
+    def drain(self, max_items: int = 500) -> int:
+        """Process up to max_items queued updates; returns how many ran"""
+        processed = 0
+        while self.pending and processed < max_items:
+            session_id, text, identifiers = self.pending.popleft()
+            if text:
+                self.add_message(session_id, text)
+            if identifiers:
+                self.add_identifiers(session_id, identifiers)
+            processed += 1
+        return processed
+
+    # ============= CLUSTERING =============
+
+    def add_message(self, session_id: str, text: str):
+        """Fold a scammer message into the session's signature and link it
+        to similar sessions found through LSH buckets"""
+        hashes = shingles(text)
+        if not hashes:
+            return
+        self._ensure(session_id)
+
+        new_sig = array('L', (
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        ))
+        old_sig = self.signatures.get(session_id)
+        if old_sig is not None:
+            new_sig = array('L', map(min, old_sig, new_sig))
+            if new_sig == old_sig:
+                return
+
+        self.signatures[session_id] = new_sig
+        self._rebucket(session_id, new_sig)
+
+    def add_identifiers(self, session_id: str, identifiers: Dict[str, Iterable[str]]):
+        """Link sessions that share a phone, UPI ID, account, link or email"""
+        self._ensure(session_id)
+        for items in identifiers.values():
+            for item in items:
+                key = normalize_identifier(item)
+                owner = self.identifier_owner.get(key)
+                if owner is None:
+                    self.identifier_owner[key] = session_id
+                    self.owned.setdefault(session_id, []).append(key)
+                elif owner != session_id:
+                    self._union(owner, session_id)
+
+    def _rebucket(self, session_id: str, signature: array):
+        """Move a session to its new LSH buckets and compare with co-members"""
+        band_keys = tuple(
+            hash(tuple(signature[b * self.rows:(b + 1) * self.rows]))
+            for b in range(self.bands)
+        )
+
+        old_keys = self.session_bands.get(session_id, ())
+        for band, key in enumerate(old_keys):
+            if key != band_keys[band]:
+                members = self.buckets.get((band, key))
+                if members and session_id in members:
+                    del members[session_id]
+                    if not members:
+                        del self.buckets[(band, key)]
+
+        self.session_bands[session_id] = band_keys
+        root = self._find(session_id)
+        for band, key in enumerate(band_keys):
+            members = self.buckets.setdefault((band, key), {})
+            if session_id in members:
+                continue
+            # Hot buckets: a few members stand in for the whole campaign
+            for other in list(islice(members, self.max_candidates)):
+                if self._find(other) == root:
+                    continue
+                if self.similarity(session_id, other) >= self.threshold:
+                    self._union(session_id, other)
+                    root = self._find(session_id)
+            members[session_id] = None
+
+    def similarity(self, a: str, b: str) -> float:
+        """Estimated Jaccard similarity of two sessions' scripts"""
+        sig_a = self.signatures.get(a)
+        sig_b = self.signatures.get(b)
+        if sig_a is None or sig_b is None:
+            return 0.0
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    # ============= CAMPAIGN SETS =============
+
+    def _ensure(self, session_id: str):
+        if session_id not in self.campaign:
+            # A returning session rejoins the campaign it founded, if still alive
+            self.campaign[session_id] = session_id
+            self.members.setdefault(session_id, {})[session_id] = None
+
+    def _find(self, session_id: str) -> str:
+        return self.campaign[session_id]
+
+    def _union(self, a: str, b: str):
+        self._ensure(a)
+        self._ensure(b)
+        label_a, label_b = self.campaign[a], self.campaign[b]
+        if label_a == label_b:
+            return
+        # The larger campaign keeps its label; the smaller one's members move
+        if len(self.members[label_a]) < len(self.members[label_b]):
+            label_a, label_b = label_b, label_a
+        moved = self.members.pop(label_b)
+        for member in moved:
+            self.campaign[member] = label_a
+        self.members[label_a].update(moved)
+
+    def discard(self, session_id: str):
+        """Forget a session (archived): its signature, buckets and membership.
+        The campaign keeps its label while other members remain, and the
+        identifiers it owned pass to one of them."""
+        if any(item[0] == session_id for item in self.pending):
+            self.pending = deque(item for item in self.pending if item[0] != session_id)
+        for band, key in enumerate(self.session_bands.pop(session_id, ())):
+            members = self.buckets.get((band, key))
+            if members is not None:
+                members.pop(session_id, None)
+                if not members:
+                    del self.buckets[(band, key)]
+        self.signatures.pop(session_id, None)
+
+        label = self.campaign.pop(session_id, None)
+        if label is None:
+            return
+        members = self.members[label]
+        del members[session_id]
+        heir = next(iter(members), None)
+        if heir is None:
+            del self.members[label]
+        for key in self.owned.pop(session_id, ()):
+            if heir is None:
+                del self.identifier_owner[key]
+            else:
+                self.identifier_owner[key] = heir
+                self.owned.setdefault(heir, []).append(key)
+
+    # ============= QUERIES =============
+
+    def campaign_id(self, session_id: str) -> Optional[str]:
+        """Current campaign of a session (None if nothing was clustered yet)"""
+        label = self.campaign.get(session_id)
+        if label is None:
+            return None
+        return f"CMP-{zlib.crc32(label.encode()):08x}"
+
+    def campaign_size(self, session_id: str) -> int:
+        """Number of sessions in the session's campaign"""
+        label = self.campaign.get(session_id)
+        if label is None:
+            return 0
+        return len(self.members[label])
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Rolling Conversation Summaries
+==============================
+
+The LLM prompt only carries the last few messages. Everything older used to
+be dropped, so on long engagements the persona forgot who the scammer claimed
+to be, which identifiers had already been handed over and which questions
+had already been asked.
+
+Turns that scroll out of the recent window are folded into a compact,
+structured summary instead:
+- claims: who the scammer says they are and what they threatened/demanded
+- identifiers: phones, UPI IDs, accounts, links and emails revealed
+- questions: what the victim persona already asked
+
+Features:
+- Incremental: each message is folded in exactly once
+- Bounded: every list keeps its most recent entries, so the rendered
+  summary (and the prompt) stays the same size however long the session runs
+- Background processing via a work queue drained off the reply path;
+  repeated submissions for one session coalesce
+
+Author: Team YUKT
+License: MIT
+"""
+
+import re
+from typing import Callable, Dict, List, Optional
+
+from message_analysis import analyze_text, register_terms
+
+# Sentences ending in "?" (the victim's questions)
+_QUESTION_PATTERN = re.compile(r'[^.!?]*\?')
+# Only the cue ignores case: the name itself must be capitalized ("I am calling" is no name)
+_NAME_PATTERN = re.compile(r'(?i:my name is|i am|this is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)')
+_ROLE_PATTERN = re.compile(r'\b(manager|officer|executive|agent|representative|employee|inspector)\b', re.IGNORECASE)
+_ORG_PATTERN = re.compile(r'\b(hdfc|icici|sbi|axis|kotak|paytm|phonepe|google pay|rbi|police|cyber cell|income tax)\b', re.IGNORECASE)
+
+# Claim recorded when a scammer message contains any of the keywords
+CLAIM_CUES = {
+    "Threatened account block/suspension": ["blocked", "suspended", "freeze", "deactivate"],
+    "Threatened legal action": ["legal action", "arrest", "police case", "fir"],
+    "Pushed urgency": ["urgent", "immediately", "right now", "hurry"],
+    "Asked for OTP": ["otp", "verification code"],
+    "Asked for PIN/password/CVV": ["pin", "password", "cvv"],
+    "Asked for card/account details": ["card number", "account number", "aadhar", "pan"],
+    "Demanded payment": ["send money", "transfer", "pay", "deposit", "processing fee", "registration fee"],
+    "Offered prize/refund": ["prize", "lottery", "cashback", "refund", "won"],
+    "Sent a link": ["link", "click", "http", "www"],
+}
+
+IDENTIFIER_KEYS = ("phoneNumbers", "upiIds", "bankAccounts", "phishingLinks", "emailAddresses")
+
+
+def _push(items: List[str], item: str, limit: int):
+    """Append unseen item, keeping only the newest `limit` entries"""
+    if item in items:
+        return
+    items.append(item)
+    if len(items) > limit:
+        del items[0]
+
+
+class ConversationSummarizer:
+    """Folds messages older than the prompt window into a bounded summary"""
+
+    def __init__(self, extract: Optional[Callable[[str], Dict[str, List[str]]]] = None,
+                 window: int = 6, max_items: int = 6, max_question_chars: int = 80):
+        """
+        Args:
+            extract: Identifier extractor for one normalized message
+                (EnhancedIntelligenceExtractor.extract with normalized=True)
+            window: Recent messages the prompt still carries verbatim; only
+                older messages are summarized
+            max_items: Entries kept per list (questions, each identifier type)
+            max_question_chars: Longest question kept verbatim
+        """
+        self.extract = extract
+        self.window = window
+        self.max_items = max_items
+        self.max_question_chars = max_question_chars
+
+        # session_id -> {"scammer", "claims", "identifiers", "questions", "messagesSummarized"}
+        self.summaries: Dict[str, Dict] = {}
+        # session_id -> live message list; ordered set so resubmits coalesce
+        self.pending: Dict[str, List[Dict]] = {}
+
+        self.folded = 0
+
+        register_terms(term for terms in CLAIM_CUES.values() for term in terms)
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    # ============= WORK QUEUE =============
+
+    def submit(self, session_id: str, messages: List[Dict]):
+        """Queue a session whose message list grew (cheap, called per turn)"""
+        if len(messages) > self.window:
+            self.pending[session_id] = messages
+
+    def drain(self, max_items: int = 200) -> int:
+        """Fold pending sessions up to their current window; returns sessions updated"""
+        processed = 0
+        while self.pending and processed < max_items:
+            session_id = next(iter(self.pending))
+            messages = self.pending.pop(session_id)
+            self.update(session_id, messages)
+            processed += 1
+        return processed
+
+    # ============= SUMMARIZATION =============
+
+    def _new_summary(self) -> Dict:
+        return {
+            "scammer": {"name": None, "role": None, "organization": None},
+            "claims": [],
+            "identifiers": {key: [] for key in IDENTIFIER_KEYS},
+            "questions": [],
+            "messagesSummarized": 0
+        }
+
+    def update(self, session_id: str, messages: List[Dict]) -> Dict:
+        """Fold every not-yet-summarized message older than the window"""
+        summary = self.summaries.get(session_id)
+        if summary is None:
+            summary = self.summaries[session_id] = self._new_summary()
+        end = len(messages) - self.window
+        for message in messages[summary["messagesSummarized"]:max(end, 0)]:
+            self._fold(summary, message)
+            summary["messagesSummarized"] += 1
+            self.folded += 1
+        return summary
+
+    def _fold(self, summary: Dict, message: Dict):
+        text = message.get("text", "")
+        if not text:
+            return
+        limit = self.max_items
+
+        if message.get("sender") != "scammer":
+            for question in _QUESTION_PATTERN.findall(text):
+                question = question.strip()
+                if question:
+                    _push(summary["questions"], question[:self.max_question_chars], limit)
+            return
+
+        scammer = summary["scammer"]
+        name = _NAME_PATTERN.search(text)
+        if name and not scammer["name"]:
+            scammer["name"] = name.group(1)
+        role = _ROLE_PATTERN.search(text)
+        if role and not scammer["role"]:
+            scammer["role"] = role.group(1).lower()
+        org = _ORG_PATTERN.search(text)
+        if org and not scammer["organization"]:
+            scammer["organization"] = org.group(1).lower()
+
+        hits = analyze_text(text).hits
+        for claim, terms in CLAIM_CUES.items():
+            if any(term in hits for term in terms):
+                _push(summary["claims"], claim, len(CLAIM_CUES))
+
+        if self.extract:
+            for key, items in self.extract(text).items():
+                if key in summary["identifiers"]:
+                    for item in items:
+                        _push(summary["identifiers"][key], item, limit)
+
+    # ============= OUTPUT =============
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Structured summary of a session (None before anything was folded)"""
+        return self.summaries.get(session_id)
+
+    def render(self, session_id: str) -> str:
+        """Compact prompt text; empty until the session outgrows the window"""
+        summary = self.summaries.get(session_id)
+        if not summary or not summary["messagesSummarized"]:
+            return ""
+        lines = [f"(Earlier {summary['messagesSummarized']} messages, summarized)"]
+        scammer = summary["scammer"]
+        identity = ", ".join(f"{key}: {value}" for key, value in scammer.items() if value)
+        if identity:
+            lines.append(f"- Scammer claimed {identity}")
+        if summary["claims"]:
+            lines.append(f"- Scammer: {'; '.join(summary['claims'])}")
+        revealed = [
+            f"{key}: {', '.join(items)}"
+            for key, items in summary["identifiers"].items() if items
+        ]
+        if revealed:
+            lines.append(f"- Revealed {'; '.join(revealed)}")
+        if summary["questions"]:
+            lines.append(f"- You already asked: {' | '.join(summary['questions'])}")
+        return "\n".join(lines)
+
+    def discard(self, session_id: str):
+        """Forget a session"""
+        self.summaries.pop(session_id, None)
+        self.pending.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        """Summaries held, work queued and messages folded so far"""
+        return {
+            "sessions": len(self.summaries),
+            "pending": len(self.pending),
+            "messagesFolded": self.folded
+        }
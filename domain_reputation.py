@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Domain Reputation Index
+=======================
+
+URL canonicalization and an O(1) local domain-reputation lookup for
+extracted phishing links.
+
+Features:
+- Canonical URLs: lowercase host, no "www.", no default port, tracking
+  parameters (utm_*, fbclid, gclid, ...) and fragments removed
+- Reputation index built locally from known URL shorteners, generated
+  lookalike bank/payment domains and an optional blocklist file
+- Fixed-size open-addressing hash table in a memory-mapped file: one hash
+  and a few probes per lookup, no parsing at startup
+- Heuristic fallback for unlisted domains (brand names, risky TLDs, raw IPs)
+
+Index file layout:
+    header  b"DREP" | version u16 | slot count u32
+    slots   domain hash u64 | category u8 | score u8   (little-endian)
+
+Usage:
+    python domain_reputation.py build --blocklist blocklist.txt -o data/domain_reputation.idx
+    python domain_reputation.py lookup http://sbi-kyc-update.com/login
+
+Author: Team YUKT
+License: MIT
+"""
+
+import argparse
+import hashlib
+import ipaddress
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# ============= URL CANONICALIZATION =============
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "ref_src", "si", "spm"
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Canonical form of a URL, or None if it is not a usable web link
+
+    Bare domains get "http://"; trailing sentence punctuation is dropped.
+    """
+    url = url.strip().rstrip('.,;:!?)]}\'"')
+    if "://" not in url:
+        url = "http://" + url
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in _DEFAULT_PORTS or len(host) <= 3 or "." not in host:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = parts.path if parts.path != "/" else ""
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower().startswith("utm_") or k.lower() in TRACKING_PARAMS)
+    ])
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_host(url: str) -> str:
+    """Lowercase host of a (canonical) URL"""
+    try:
+        return (urlsplit(url if "://" in url else "http://" + url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+
+
+# ============= REPUTATION DATA =============
+
+# Categories stored in the index
+CATEGORY_UNKNOWN = 0
+CATEGORY_OFFICIAL = 1
+CATEGORY_SHORTENER = 2
+CATEGORY_LOOKALIKE = 3
+CATEGORY_BLOCKLISTED = 4
+CATEGORY_SUSPICIOUS = 5
+
+CATEGORY_NAMES = {
+    CATEGORY_UNKNOWN: "unknown",
+    CATEGORY_OFFICIAL: "official",
+    CATEGORY_SHORTENER: "shortener",
+    CATEGORY_LOOKALIKE: "lookalike",
+    CATEGORY_BLOCKLISTED: "blocklisted",
+    CATEGORY_SUSPICIOUS: "suspicious",
+}
+
+# Risk scores (0-100) per category
+SCORES = {
+    CATEGORY_UNKNOWN: 20,
+    CATEGORY_OFFICIAL: 0,
+    CATEGORY_SHORTENER: 60,
+    CATEGORY_LOOKALIKE: 90,
+    CATEGORY_BLOCKLISTED: 100,
+    CATEGORY_SUSPICIOUS: 50,
+}
+
+URL_SHORTENERS = [
+    "bit.ly", "tinyurl.com", "goo.gl", "t.co", "ow.ly", "is.gd", "buff.ly",
+    "cutt.ly", "rb.gy", "shorturl.at", "tiny.cc", "rebrand.ly", "s.id",
+    "v.gd", "t.ly", "bl.ink", "short.io", "lnkd.in"
+]
+
+# Brand token -> official domains
+OFFICIAL_DOMAINS = {
+    "sbi": ["sbi.co.in", "onlinesbi.sbi", "onlinesbi.com"],
+    "hdfc": ["hdfcbank.com"],
+    "icici": ["icicibank.com"],
+    "axis": ["axisbank.com"],
+    "kotak": ["kotak.com"],
+    "pnb": ["pnbindia.in"],
+    "paytm": ["paytm.com"],
+    "phonepe": ["phonepe.com"],
+    "rbi": ["rbi.org.in"],
+    "incometax": ["incometax.gov.in"],
+    "npci": ["npci.org.in"],
+}
+
+_LURE_WORDS = ["kyc", "verify", "update", "secure", "login", "support", "care",
+               "reward", "refund", "online", "help", "bank", "netbanking"]
+_LOOKALIKE_TLDS = ["com", "in", "co.in", "net", "org", "info", "xyz", "online", "site", "top"]
+_RISKY_TLDS = {"xyz", "top", "online", "site", "click", "live", "icu", "buzz", "cfd", "sbs", "rest"}
+_LABEL_SPLIT = re.compile(r'[.\-]')
+_HOMOGLYPHS = {"o": "0", "i": "1", "l": "1", "e": "3", "a": "4", "s": "5"}
+
+
+def _homoglyph_variants(token: str) -> List[str]:
+    """Single-character digit substitutions (sbi -> 5bi, sb1)"""
+    return [
+        token[:i] + _HOMOGLYPHS[ch] + token[i + 1:]
+        for i, ch in enumerate(token) if ch in _HOMOGLYPHS
+    ]
+
+
+def default_entries() -> Dict[str, Tuple[int, int]]:
+    """Built-in domain -> (category, score) entries"""
+    entries: Dict[str, Tuple[int, int]] = {}
+
+    for brand, domains in OFFICIAL_DOMAINS.items():
+        for token in [brand] + _homoglyph_variants(brand):
+            for word in _LURE_WORDS:
+                for name in (f"{token}-{word}", f"{word}-{token}", f"{token}{word}", f"{word}{token}"):
+                    for tld in _LOOKALIKE_TLDS:
+                        entries[f"{name}.{tld}"] = (CATEGORY_LOOKALIKE, SCORES[CATEGORY_LOOKALIKE])
+        for domain in domains:
+            stem, _, tld = domain.partition(".")
+            for variant in _homoglyph_variants(stem):
+                entries[f"{variant}.{tld}"] = (CATEGORY_LOOKALIKE, SCORES[CATEGORY_LOOKALIKE])
+
+    for domain in URL_SHORTENERS:
+        entries[domain] = (CATEGORY_SHORTENER, SCORES[CATEGORY_SHORTENER])
+
+    # Official domains last so no generated variant can shadow them
+    for domains in OFFICIAL_DOMAINS.values():
+        for domain in domains:
+            entries[domain] = (CATEGORY_OFFICIAL, SCORES[CATEGORY_OFFICIAL])
+    return entries
+
+
+def read_blocklist(path: str) -> Iterable[Tuple[str, int]]:
+    """Blocklist lines: "domain" or "domain score" (0-100); '#' starts a comment"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            host = url_host(fields[0]) or fields[0].lower()
+            if host.startswith("www."):
+                host = host[4:]
+            try:
+                score = min(max(int(fields[1]), 0), 100) if len(fields) > 1 else SCORES[CATEGORY_BLOCKLISTED]
+            except ValueError:
+                score = SCORES[CATEGORY_BLOCKLISTED]
+            yield host, score
+
+
+# ============= INDEX =============
+
+_MAGIC = b"DREP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_SLOT = struct.Struct("<QBB")
+
+
+def _domain_hash(domain: str) -> int:
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(domain.encode(), digest_size=8).digest(), "little") or 1
+
+
+def build_index(entries: Dict[str, Tuple[int, int]]) -> bytes:
+    """Serialize domain -> (category, score) into the index format"""
+    slots = 1 << max(4, (len(entries) * 2 - 1).bit_length())  # Load factor <= 0.5
+    mask = slots - 1
+    table = bytearray(_HEADER.size + slots * _SLOT.size)
+    _HEADER.pack_into(table, 0, _MAGIC, _VERSION, slots)
+
+    for domain, (category, score) in entries.items():
+        h = _domain_hash(domain)
+        i = h & mask
+        while True:
+            offset = _HEADER.size + i * _SLOT.size
+            existing = _SLOT.unpack_from(table, offset)[0]
+            if existing in (0, h):
+                _SLOT.pack_into(table, offset, h, category, score)
+                break
+            i = (i + 1) & mask
+    return bytes(table)
+
+
+class DomainReputationIndex:
+    """O(1) domain risk lookups over a (memory-mapped) hash table"""
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer: Index bytes (mmap or bytes) produced by build_index
+        """
+        magic, version, slots = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a domain reputation index")
+        self._buffer = buffer
+        self._mask = slots - 1
+
+    @classmethod
+    def open(cls, path: Optional[str] = None, blocklist_path: Optional[str] = None) -> "DomainReputationIndex":
+        """
+        Memory-map the index at `path`, (re)building it first if it is
+        missing or older than the blocklist. Without a path the index is
+        built in memory.
+        """
+        has_blocklist = bool(blocklist_path) and os.path.exists(blocklist_path)
+        if path and os.path.exists(path) and not (
+                has_blocklist and os.path.getmtime(blocklist_path) > os.path.getmtime(path)):
+            try:
+                return cls.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Rebuilding domain reputation index: {e}")
+
+        entries = default_entries()
+        if has_blocklist:
+            for domain, score in read_blocklist(blocklist_path):
+                entries[domain] = (CATEGORY_BLOCKLISTED, score)
+        data = build_index(entries)
+        logger.info(f"🌐 Built domain reputation index: {len(entries)} domains")
+
+        if not path:
+            return cls(data)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            return cls.load(path)
+        except OSError as e:
+            logger.error(f"❌ Could not write domain reputation index: {e}")
+            return cls(data)
+
+    @classmethod
+    def load(cls, path: str) -> "DomainReputationIndex":
+        """Memory-map an index file read-only"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _get(self, domain: str) -> Optional[Tuple[int, int]]:
+        h = _domain_hash(domain)
+        i = h & self._mask
+        while True:
+            stored, category, score = _SLOT.unpack_from(self._buffer, _HEADER.size + i * _SLOT.size)
+            if stored == h:
+                return category, score
+            if stored == 0:
+                return None
+            i = (i + 1) & self._mask
+
+    def lookup_domain(self, host: str) -> Tuple[int, int]:
+        """(category, score) for a host, checking parent domains too"""
+        if host.startswith("www."):
+            host = host[4:]
+        labels = host.split(".")
+        # Most specific first: a.b.sub.evil.com, ..., evil.com; every suffix
+        # down to two labels (subdomains are free to add), never the bare TLD
+        for start in range(len(labels) - 1):
+            hit = self._get(".".join(labels[start:]))
+            if hit is not None:
+                return hit
+
+        try:
+            ipaddress.ip_address(host)
+            return CATEGORY_SUSPICIOUS, 70
+        except ValueError:
+            pass
+        # Unlisted domain carrying a bank/payment brand name
+        parts = _LABEL_SPLIT.split(host)
+        if any(part.startswith(brand) or part.endswith(brand)
+               for part in parts for brand in OFFICIAL_DOMAINS):
+            return CATEGORY_LOOKALIKE, 75
+        if labels[-1] in _RISKY_TLDS:
+            return CATEGORY_SUSPICIOUS, SCORES[CATEGORY_SUSPICIOUS]
+        return CATEGORY_UNKNOWN, SCORES[CATEGORY_UNKNOWN]
+
+    def score(self, url: str) -> Dict:
+        """Reputation report for a URL: domain, category, riskScore (0-1)"""
+        host = url_host(url)
+        category, score = self.lookup_domain(host) if host else (CATEGORY_UNKNOWN, SCORES[CATEGORY_UNKNOWN])
+        return {
+            "url": url,
+            "domain": host,
+            "category": CATEGORY_NAMES.get(category, "unknown"),
+            "riskScore": score / 100.0
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or query the domain reputation index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Build the index file")
+    build.add_argument("--blocklist", help="Blocklist file (domain [score] per line)")
+    build.add_argument("-o", "--output", default=os.path.join("data", "domain_reputation.idx"))
+    lookup = sub.add_parser("lookup", help="Score URLs")
+    lookup.add_argument("urls", nargs="+")
+    lookup.add_argument("--index", default=os.path.join("data", "domain_reputation.idx"))
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if os.path.exists(args.output):
+            os.remove(args.output)
+        DomainReputationIndex.open(args.output, args.blocklist)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        index = DomainReputationIndex.open(args.index if os.path.exists(args.index) else None)
+        for url in args.urls:
+            canonical = canonicalize_url(url) or url
+            print(index.score(canonical))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
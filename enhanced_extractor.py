@@ -9,33 +9,118 @@ Features:
 - Phone number extraction and validation (Indian +91 format)
 - UPI ID extraction (all major providers)
 - Bank account number extraction (9-18 digits)
+- One numeric scan classifies phones, accounts, cards and reference IDs
+  together (context words, IFSC nearby, Luhn check, mobile prefixes)
 - Phishing link detection (including shortened URLs)
 - Email address extraction (RFC 5322 compliant)
 - Context-aware extraction from conversation history
-- Handles obfuscation ([at], [dot], etc.)
+- Handles obfuscation ([at], [dot], homoglyphs, spelled-out digits, etc.)
 
 Author: Team YUKT
 License: MIT
 """
 
 import re
-from typing import Dict, List, Set
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Union
 import phonenumbers
-from urllib.parse import urlparse
 import logging
 
+from domain_reputation import canonicalize_url
+from message_analysis import MessageAnalysis
+from numeric_spans import NumericSpan, scan_numeric_spans
+from text_normalizer import normalize_message
+
 logger = logging.getLogger(__name__)
 
+
+def _looks_like_indian_number(national: str, has_country_code: bool) -> bool:
+    """Pre-filter: 10-digit mobiles start with 6-9. With an explicit +91 the
+    number may also be a landline, so other leading digits go to phonenumbers."""
+    if len(national) != 10:
+        return False
+    if national[0] in '6789':
+        return True
+    return has_country_code and national[0] != '0'
+
+
+@lru_cache(maxsize=4096)
+def _to_e164(national: str) -> Optional[str]:
+    """Validate a 10-digit Indian number with phonenumbers, cached per number.
+    
+    Returns the E.164 form, or None if the number is not valid.
+    """
+    try:
+        phone_obj = phonenumbers.parse(national, "IN")
+    except phonenumbers.NumberParseException:
+        # If parsing fails, still keep it - it matched the phone pattern
+        return '+91' + national
+    
+    if phonenumbers.is_valid_number(phone_obj):
+        return phonenumbers.format_number(phone_obj, phonenumbers.PhoneNumberFormat.E164)
+    return None
+
 class EnhancedIntelligenceExtractor:
     """Advanced intelligence extraction with 99%+ accuracy"""
     
-    def __init__(self):
-        self.extracted_cache = {}  # Prevent re-extraction
+    def __init__(self, cache_size: int = 4096):
+        self.extracted_cache = {}  # Prevent re-extraction: normalized text -> intel
+        self.cache_size = cache_size
     
-    def extract(self, message: str, session_history: List[str] = None) -> Dict:
+    def extract(self, message: Union[str, MessageAnalysis], session_history: List[str] = None,
+                normalized: bool = False) -> Dict:
         """Extract ALL intelligence types with advanced pattern matching
-        Handles edge cases that basic regex misses"""
+        Handles edge cases that basic regex misses
+        
+        Pass normalized=True when the message and history already went
+        through normalize_message (the API does this once per message).
+        A MessageAnalysis is always normalized; its per-message result is
+        stored in analysis.candidates.
+        """
+        
+        if isinstance(message, MessageAnalysis):
+            if message.candidates is None:
+                message.candidates = self._extract_cached(message.text, message.spans)
+            intel = {key: list(items) for key, items in message.candidates.items()}
+            normalized = True
+        else:
+            cleaned_msg = message if normalized else self._preprocess_message(message)
+            intel = {key: list(items) for key, items in self._extract_cached(cleaned_msg).items()}
+        
+        # CONTEXTUAL EXTRACTION (from conversation history)
+        if session_history:
+            context_intel = self._extract_from_context(session_history, normalized)
+            for key in context_intel:
+                intel[key].extend(context_intel[key])
+        
+        # Remove duplicates while preserving order
+        for key in intel:
+            intel[key] = list(dict.fromkeys(intel[key]))  # Preserves order, removes duplicates
+        
+        return intel
+    
+    def _extract_cached(self, cleaned_msg: str, spans: Optional[List[NumericSpan]] = None) -> Dict:
+        """Single-message extraction, memoized by normalized text
         
+        History messages are re-examined on every turn; each one is only
+        actually scanned once. Callers must copy the lists before mutating.
+        """
+        intel = self.extracted_cache.get(cleaned_msg)
+        if intel is None:
+            if len(self.extracted_cache) >= self.cache_size:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self.extracted_cache[next(iter(self.extracted_cache))]
+            intel = self.extracted_cache[cleaned_msg] = self._extract_single(cleaned_msg, spans)
+        return intel
+    
+    def _extract_single(self, cleaned_msg: str, spans: Optional[List[NumericSpan]] = None) -> Dict:
+        """Run every extractor over one normalized message
+        
+        Phones, accounts and IDs all come from one numeric scan (spans),
+        reused from the MessageAnalysis when there is one.
+        """
+        if spans is None:
+            spans = scan_numeric_spans(cleaned_msg)
         intel = {
             "phoneNumbers": [],
             "upiIds": [],
@@ -44,11 +129,8 @@ class EnhancedIntelligenceExtractor:
             "emailAddresses": []
         }
         
-        # Clean message for better extraction
-        cleaned_msg = self._preprocess_message(message)
-        
         # ADVANCED PHONE EXTRACTION
-        phones = self._extract_phones_advanced(cleaned_msg)
+        phones = self._extract_phones_advanced(cleaned_msg, spans)
         intel["phoneNumbers"].extend(phones)
         
         # ADVANCED UPI EXTRACTION
@@ -60,7 +142,7 @@ class EnhancedIntelligenceExtractor:
         intel["emailAddresses"].extend(emails)
         
         # ADVANCED BANK ACCOUNT EXTRACTION
-        accounts = self._extract_bank_accounts_advanced(cleaned_msg)
+        accounts = self._extract_bank_accounts_advanced(cleaned_msg, spans)
         intel["bankAccounts"].extend(accounts)
         
         # ADVANCED URL EXTRACTION (includes shortened URLs)
@@ -69,19 +151,13 @@ class EnhancedIntelligenceExtractor:
         
         # GENERIC ID EXTRACTION (case IDs, reference numbers, employee IDs, order IDs)
         # This is CRITICAL for 99+ score - extracts ANY alphanumeric identifiers
-        ids = self._extract_generic_ids(cleaned_msg)
+        ids = self._extract_generic_ids(cleaned_msg, spans)
         if ids:
             # Store in phishingLinks as generic identifiers (or create new field)
             # For now, log them separately
             for id_val in ids:
                 logger.info(f"   🆔 Generic ID extracted: {id_val}")
         
-        # CONTEXTUAL EXTRACTION (from conversation history)
-        if session_history:
-            context_intel = self._extract_from_context(session_history)
-            for key in context_intel:
-                intel[key].extend(context_intel[key])
-        
         # Remove duplicates while preserving order
         for key in intel:
             intel[key] = list(dict.fromkeys(intel[key]))  # Preserves order, removes duplicates
@@ -90,59 +166,33 @@ class EnhancedIntelligenceExtractor:
     
     def _preprocess_message(self, message: str) -> str:
         """Clean and normalize message for better extraction"""
-        # Replace common obfuscation
-        message = message.replace('[at]', '@').replace('(at)', '@')
-        message = message.replace('[dot]', '.').replace('(dot)', '.')
-        message = message.replace('___', '_').replace('--', '-')
-        return message
+        # Homoglyphs, full-width/Indic digits, zero-width characters,
+        # [at]/(dot) and spelled-out digits
+        return normalize_message(message)
     
-    def _extract_phones_advanced(self, message: str) -> List[str]:
-        """Extract phone numbers with advanced pattern matching"""
-        phones = set()
-        
-        # Pattern 1: International format with optional spacing
-        # +91 98765 43210, +91-9876543210, +919876543210
-        pattern1 = r'\+91[\s\-]?\d{5}[\s\-]?\d{5}|\+91[\s\-]?\d{10}'
-        matches1 = re.findall(pattern1, message)
-        for match in matches1:
-            cleaned = re.sub(r'\D', '', match)
-            if len(cleaned) == 12 and cleaned.startswith('91'):  # +91 prefix
-                phones.add('+' + cleaned)
-        
-        # Pattern 2: Indian 10-digit (starts with 6-9)
-        # With various separators: 98765-43210, 98765 43210, 9876543210
-        pattern2 = r'\b[6-9]\d{4}[\s\-]?\d{5}\b'
-        matches2 = re.findall(pattern2, message)
-        for match in matches2:
-            cleaned = re.sub(r'\D', '', match)
-            if len(cleaned) == 10:
-                phones.add(cleaned)
-        
-        # Pattern 3: With parentheses (98765) 43210
-        pattern3 = r'\(?\d{5}\)?[\s\-]?\d{5}'
-        matches3 = re.findall(pattern3, message)
-        for match in matches3:
-            cleaned = re.sub(r'\D', '', match)
-            if len(cleaned) == 10 and cleaned[0] in '6789':
-                phones.add(cleaned)
-        
-        # Validate with phonenumbers library
+    def _extract_phones_advanced(self, message: str,
+                                 spans: Optional[List[NumericSpan]] = None) -> List[str]:
+        """Extract phone numbers from the numeric scan
+        
+        Every supported shape is joined by the scanner:
+        +91 98765 43210, +91-9876543210, +919876543210,
+        98765-43210, 98765 43210, 9876543210, (98765) 43210
+        """
+        if spans is None:
+            spans = scan_numeric_spans(message)
         validated_phones = []
-        for phone in phones:
-            try:
-                # Try parsing as Indian number
-                if not phone.startswith('+'):
-                    phone_obj = phonenumbers.parse(phone, "IN")
-                else:
-                    phone_obj = phonenumbers.parse(phone, None)
-                
-                if phonenumbers.is_valid_number(phone_obj):
-                    formatted = phonenumbers.format_number(phone_obj, phonenumbers.PhoneNumberFormat.E164)
-                    validated_phones.append(formatted)
-            except:
-                # If validation fails, still include if it matches pattern
-                if len(phone) >= 10:
-                    validated_phones.append(phone)
+        
+        for span in spans:
+            if span.kind != "phone":
+                continue
+            # Cheap shape check before the expensive phonenumbers validation
+            has_country_code = message.startswith("+", span.start)
+            if not _looks_like_indian_number(span.value, has_country_code):
+                continue
+            
+            formatted = _to_e164(span.value)
+            if formatted and formatted not in validated_phones:
+                validated_phones.append(formatted)
         
         return validated_phones
     
@@ -188,111 +238,69 @@ class EnhancedIntelligenceExtractor:
         
         return list(emails)
     
-    def _extract_bank_accounts_advanced(self, message: str) -> List[str]:
-        """Extract bank account numbers with advanced validation"""
-        accounts = set()
-        
-        # Pattern 1: Continuous digits (9-18 length)
-        pattern1 = r'\b\d{9,18}\b'
-        matches1 = re.findall(pattern1, message)
+    def _extract_bank_accounts_advanced(self, message: str,
+                                        spans: Optional[List[NumericSpan]] = None) -> List[str]:
+        """Extract bank account numbers from the numeric scan
         
-        for match in matches1:
-            # Exclude phone numbers
-            if len(match) >= 9 and len(match) <= 18:
-                # Not a phone number (doesn't start with 6-9 if 10 digits)
-                if not (len(match) == 10 and match[0] in '6789'):
-                    accounts.add(match)
-        
-        # Pattern 2: With spaces or dashes
-        # 1234 5678 9012 3456 or 1234-5678-9012-3456
-        pattern2 = r'\b\d{4}[\s\-]\d{4}[\s\-]\d{4}[\s\-]\d{4}\b'
-        matches2 = re.findall(pattern2, message)
-        for match in matches2:
-            cleaned = re.sub(r'\D', '', match)
-            if len(cleaned) >= 9:
-                accounts.add(cleaned)
-        
-        # Pattern 3: IFSC code nearby indicates bank account
-        # IFSC format: ABCD0123456
-        ifsc_pattern = r'\b[A-Z]{4}0[A-Z0-9]{6}\b'
-        if re.search(ifsc_pattern, message):
-            # More likely these numbers are account numbers
-            pattern3 = r'\b\d{9,}\b'
-            matches3 = re.findall(pattern3, message)
-            accounts.update(matches3)
-        
-        return list(accounts)
+        "A/C"/"account no" or an IFSC code next to a number makes it an
+        account even when it looks like a mobile number. Card numbers
+        (Luhn-valid) are reported here too; the output has no card field.
+        """
+        if spans is None:
+            spans = scan_numeric_spans(message)
+        return list(dict.fromkeys(
+            span.value for span in spans if span.kind in ("account", "card")
+        ))
     
     def _extract_urls_advanced(self, message: str) -> List[str]:
-        """Extract URLs including shortened links"""
-        urls = set()
+        """Extract URLs including shortened links, in canonical form
+        
+        Variants of one link (scheme added for bare domains, www., tracking
+        parameters, case) collapse to a single entry; an explicit https://
+        wins over the http:// added to bare matches.
+        """
+        candidates = []
         
         # Pattern 1: Standard HTTP/HTTPS
         pattern1 = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        matches1 = re.findall(pattern1, message, re.IGNORECASE)
-        urls.update(matches1)
+        candidates.extend(re.findall(pattern1, message, re.IGNORECASE))
         
         # Pattern 2: www. domains
         pattern2 = r'www\.[a-zA-Z0-9-]+\.[a-zA-Z]{2,}[^\s]*'
-        matches2 = re.findall(pattern2, message, re.IGNORECASE)
-        urls.update(['http://' + m for m in matches2])
+        candidates.extend(re.findall(pattern2, message, re.IGNORECASE))
         
         # Pattern 3: domain.com/path (common in scams) - must have at least 3 chars before TLD
-        pattern3 = r'\b[a-zA-Z0-9-]{3,}\.(com|net|org|in|co\.in|info|biz)/[^\s]*'
-        matches3 = re.findall(pattern3, message, re.IGNORECASE)
-        urls.update(['http://' + m for m in matches3])
+        pattern3 = r'\b[a-zA-Z0-9-]{3,}\.(?:com|net|org|in|co\.in|info|biz)/[^\s]*'
+        candidates.extend(re.findall(pattern3, message, re.IGNORECASE))
         
         # Pattern 4: Shortened URL services
         short_domains = ['bit.ly', 'tinyurl.com', 'goo.gl', 't.co', 'ow.ly', 'is.gd', 'buff.ly']
         for domain in short_domains:
-            pattern = rf'{domain}/[a-zA-Z0-9]+'
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            urls.update(['http://' + m for m in matches])
-        
-        # Validate and clean URLs
-        validated_urls = []
-        for url in urls:
-            try:
-                parsed = urlparse(url)
-                # Must have a valid netloc (domain) and be longer than just "http://com"
-                if parsed.netloc and len(parsed.netloc) > 3:
-                    validated_urls.append(url)
-            except:
-                pass  # Skip invalid URLs
-        
-        return validated_urls
+            pattern = rf'{re.escape(domain)}/[a-zA-Z0-9]+'
+            candidates.extend(re.findall(pattern, message, re.IGNORECASE))
+        
+        # Canonicalize and collapse variants (keyed without the scheme)
+        urls = {}
+        for candidate in candidates:
+            url = canonicalize_url(candidate)
+            if url:
+                urls.setdefault(url.split("://", 1)[1], url)
+        
+        return list(urls.values())
     
-    def _extract_generic_ids(self, message: str) -> List[str]:
+    def _extract_generic_ids(self, message: str,
+                             spans: Optional[List[NumericSpan]] = None) -> List[str]:
         """Extract generic IDs: case numbers, reference IDs, employee IDs, order IDs
         
         This is CRITICAL for 99+ score - catches ANY alphanumeric identifiers
-        that scammers might use to appear legitimate.
+        that scammers might use to appear legitimate. Numbers after "emp id",
+        "ref", "case no", "txn" etc. and letter+digit codes (EMP001) count.
         """
-        ids = set()
-        
-        # Pattern 1: Explicit ID mentions
-        # "case ID: ABC123", "reference number: 12345", "employee ID EMP001"
-        id_patterns = [
-            r'(?:case|reference|order|ticket|complaint|employee|emp|staff|transaction|txn|req)\s*(?:id|no|number|#)[\s:]*([A-Z0-9\-]+)',
-            r'(?:ID|No|Number|#)[\s:]*([A-Z]{2,}[0-9]{3,})',  # ID: ABC123
-            r'\b([A-Z]{3,}[0-9]{4,})\b',  # ABC1234
-            r'\b([0-9]{6,12})\b'  # 6-12 digit numbers (not phone/account)
-        ]
-        
-        for pattern in id_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = match[0] if match else ""
-                if match and len(match) >= 4:
-                    # Exclude phone numbers and bank accounts
-                    if not (len(match) == 10 and match[0] in '6789'):
-                        if not (len(match) >= 9 and len(match) <= 18 and match.isdigit()):
-                            ids.add(match.upper())
-        
-        return list(ids)
+        if spans is None:
+            spans = scan_numeric_spans(message)
+        return list(dict.fromkeys(span.value for span in spans if span.kind == "reference"))
     
-    def _extract_from_context(self, history: List[str]) -> Dict:
+    def _extract_from_context(self, history: List[str], normalized: bool = False) -> Dict:
         """Extract intelligence from conversation context"""
         context_intel = {
             "phoneNumbers": [],
@@ -306,8 +314,8 @@ class EnhancedIntelligenceExtractor:
         recent_messages = history[-5:] if len(history) > 5 else history
         
         for msg in recent_messages:
-            # Quick extraction from each message
-            temp_intel = self.extract(msg)
+            # Quick extraction from each message (cached per message text)
+            temp_intel = self._extract_cached(msg if normalized else self._preprocess_message(msg))
             for key in temp_intel:
                 context_intel[key].extend(temp_intel[key])
         
@@ -16,57 +16,103 @@ Author: Team YUKT
 License: MIT
 """
 
+import logging
 import random
 import re
-from typing import List, Dict, Optional, Set, Tuple
+from typing import Iterable, List, Dict, Optional, Set, Tuple, Union
 from groq import Groq
 import os
+import time
 from datetime import datetime
 
+from llm_budget import LLMBudget
+from message_analysis import MessageAnalysis, as_analysis, register_terms
+from reply_ranker import ReplyRanker
+from speculation import ReplySpeculator
+
+logger = logging.getLogger(__name__)
+
+# Patterns run on the normalized message (match results shared via MessageAnalysis)
+NAME_CLAIM_PATTERN = re.compile(r'(?:my name is|i am|this is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', re.IGNORECASE)
+ROLE_PATTERN = re.compile(r'(manager|officer|executive|agent|representative|employee)', re.IGNORECASE)
+ORG_PATTERN = re.compile(r'(hdfc|icici|sbi|axis|paytm|phonepe|google pay|bank)', re.IGNORECASE)
+
+# Messages the prompt carries verbatim; older ones arrive as a summary
+CONTEXT_WINDOW = 6
+
+# Live generation: candidates per LLM call (ranked locally) and tokens per candidate
+REPLY_CANDIDATES = 3
+CANDIDATE_MAX_TOKENS = 55
+
+# Speculative pre-generation: replies per call and their token cap
+SPECULATIVE_CANDIDATES = 3
+SPECULATION_MAX_TOKENS = 160
+NUMBERED_LINE_PATTERN = re.compile(r'^\s*\d+[.):-]\s*(.+?)\s*$', re.MULTILINE)
+
+
+def parse_numbered_replies(text: str) -> List[str]:
+    """'1. ...\n2. ...' -> list of replies (a single unnumbered reply stays whole)"""
+    replies = NUMBERED_LINE_PATTERN.findall(text)
+    if not replies and text.strip():
+        replies = [text.strip()]
+    return replies
+
+# Keywords checked on every scammer message
+SCAMMER_CUES = {
+    "name": ["my name is", "i am"],
+    "role": ["employee", "staff", "officer"],
+    "organization": ["bank", "company"],
+    "urgency": ["urgent", "immediately"],
+    "threat": ["blocked", "suspended"],
+    "prize": ["win", "prize", "lottery"],
+    "money": ["send", "transfer", "pay", "deposit"],
+    "otp": ["otp", "code", "verification code"],
+    "password": ["password", "pin", "cvv", "card number"],
+    "link": ["http", "www", "bit.ly"],
+}
+
 class UltimateHumanLikeGenerator:
     """
     Master-level scam baiting with zero repetition and strategic extraction
     """
     
-    def __init__(self):
+    def __init__(self, speculator: Optional[ReplySpeculator] = None,
+                 candidates: int = REPLY_CANDIDATES, budget: Optional[LLMBudget] = None):
+        """
+        Args:
+            speculator: Enables speculative next-reply pre-generation (opt-in)
+            candidates: Replies requested per LLM call; the ranker picks one
+            budget: Token budget deciding, per turn, LLM or pattern tier
+        """
         self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY")) if os.getenv("GROQ_API_KEY") else None
+        self.speculator = speculator
+        self.budget = budget
+        self.candidates = max(1, candidates)
+        self.ranker = ReplyRanker()
         
         # Per-session memory - tracks everything
         self.sessions = {}
         
-    def generate(self, session_id: str, message: str, message_count: int,
+        register_terms(term for terms in SCAMMER_CUES.values() for term in terms)
+        
+    def generate(self, session_id: str, message: Union[str, MessageAnalysis], message_count: int,
                  intelligence: Dict, conversation_history: List[Dict],
-                 scam_type: str = "unknown") -> str:
+                 scam_type: str = "unknown", summary: str = "", allow_llm: bool = True) -> str:
         """
         Generate unique, strategic, human-like response
         Never repeats. Always extracts. Feels completely real.
-        """
         
-        # Initialize session memory
-        if session_id not in self.sessions:
-            self.sessions[session_id] = {
-                "used_responses": set(),
-                "asked_questions": set(),
-                "mentioned_facts": set(),  # Things victim has "said" about themselves
-                "scammer_claims": [],      # What scammer has claimed
-                "extraction_priorities": self._get_extraction_priorities(scam_type),
-                "rapport_level": 0,        # 0-10, how much scammer trusts us
-                "emotional_state": "worried",  # worried → cautious → skeptical → defensive
-                "conversation_style": self._determine_persona(scam_type),
-                "last_topic": None,
-                "scammer_info": {          # What we know about scammer
-                    "name": None,
-                    "role": None,
-                    "organization": None,
-                    "phone": None,
-                    "email": None
-                }
-            }
+        summary: Rolling summary of messages older than CONTEXT_WINDOW
+        (ConversationSummarizer.render), keeps the prompt constant-size
+        allow_llm: False under load shedding - the pattern-based tier answers
+        """
         
-        state = self.sessions[session_id]
+        state = self._get_state(session_id, scam_type)
+        analysis = as_analysis(message)
+        message = analysis.text
         
         # Analyze scammer's latest message
-        self._analyze_scammer_message(message, intelligence, state, scam_type)
+        self._analyze_scammer_message(analysis, intelligence, state, scam_type)
         
         # Update emotional state based on conversation progress
         self._update_emotional_state(message_count, intelligence, state)
@@ -74,14 +120,29 @@ class UltimateHumanLikeGenerator:
         # Determine extraction strategy
         strategy = self._get_extraction_strategy(message_count, intelligence, state)
         
-        # Try advanced Groq generation first
-        if self.groq_client:
+        # A reply pre-generated while we waited, if it still fits this turn
+        if self.speculator:
+            response = self.speculator.claim(
+                session_id, strategy, message_count,
+                lambda candidates: self._choose_speculative(candidates, analysis, state)
+            )
+            if response:
+                self._track_questions(response, state)
+                state["used_responses"].add(self._normalize(response))
+                return response
+        
+        # Try advanced Groq generation first (if the budget says this turn is worth it)
+        reserved = None
+        if self.groq_client and allow_llm and self.budget:
+            reserved = self.budget.acquire(session_id, strategy)
+            allow_llm = reserved is not None
+        if self.groq_client and allow_llm:
             try:
                 response = self._generate_advanced_groq(
                     session_id, message, message_count, conversation_history,
-                    scam_type, state, strategy
+                    scam_type, state, strategy, summary, reserved
                 )
-                if response and self._is_high_quality(response, state):
+                if response:
                     state["used_responses"].add(self._normalize(response))
                     return response
             except Exception as e:
@@ -89,7 +150,7 @@ class UltimateHumanLikeGenerator:
         
         # Fallback to strategic pattern-based (still very good)
         response = self._generate_strategic_human_response(
-            message, message_count, intelligence, scam_type, state, strategy
+            analysis, message_count, intelligence, scam_type, state, strategy
         )
         
         # Ensure absolute uniqueness
@@ -98,40 +159,155 @@ class UltimateHumanLikeGenerator:
         
         return response
     
-    def _analyze_scammer_message(self, message: str, intelligence: Dict,
+    def _get_state(self, session_id: str, scam_type: str) -> Dict:
+        """Per-session memory, created on first contact"""
+        if session_id not in self.sessions:
+            self.sessions[session_id] = {
+                "used_responses": set(),
+                "asked_questions": set(),
+                "mentioned_facts": set(),  # Things victim has "said" about themselves
+                "scammer_claims": [],      # What scammer has claimed
+                "extraction_priorities": self._get_extraction_priorities(scam_type),
+                "rapport_level": 0,        # 0-10, how much scammer trusts us
+                "emotional_state": "worried",  # worried → cautious → skeptical → defensive
+                "conversation_style": self._determine_persona(scam_type),
+                "last_topic": None,
+                "scammer_info": {          # What we know about scammer
+                    "name": None,
+                    "role": None,
+                    "organization": None,
+                    "phone": None,
+                    "email": None
+                }
+            }
+        return self.sessions[session_id]
+    
+    def remember_replies(self, session_id: str, scam_type: str, replies: Iterable[str]):
+        """Mark replies already sent in this session as used (e.g. after a restore)"""
+        state = self._get_state(session_id, scam_type)
+        state["used_responses"].update(self._normalize(reply) for reply in replies)
+    
+    def use_precomputed(self, session_id: str, message: Union[str, MessageAnalysis], message_count: int,
+                        intelligence: Dict, candidates: List[str],
+                        scam_type: str = "unknown") -> Optional[str]:
+        """
+        Reply with a precomputed variant (known-script fast path)
+        
+        Keeps session memory in sync exactly as generate() would, but skips
+        strategy selection and the LLM. Returns None when every candidate was
+        already used in this session, so the caller can fall back to generate().
+        """
+        state = self._get_state(session_id, scam_type)
+        self._analyze_scammer_message(as_analysis(message), intelligence, state, scam_type)
+        self._update_emotional_state(message_count, intelligence, state)
+        
+        for candidate in candidates:
+            if self._normalize(candidate) not in state["used_responses"]:
+                state["used_responses"].add(self._normalize(candidate))
+                self._track_questions(candidate, state)
+                return candidate
+        return None
+    
+    def plan_speculation(self, session_id: str, message_count: int, intelligence: Dict,
+                         conversation_history: List[Dict], scam_type: str = "unknown",
+                         summary: str = "") -> Optional[Dict]:
+        """
+        Prepare a speculative LLM call for the next turn (runs on the event loop)
+        
+        Predicts the next strategy and snapshots the prompt now, so the
+        blocking call in run_speculation never touches live session state.
+        Returns None when speculation is off, the LLM is unavailable or the
+        budget is spent.
+        """
+        state = self.sessions.get(session_id)
+        if not self.speculator or not self.groq_client or state is None:
+            return None
+        
+        next_turn = message_count + 1
+        strategy = self._get_extraction_strategy(next_turn, intelligence, state)
+        prompt = self._build_prompt(None, conversation_history, scam_type, state, strategy,
+                                    summary, candidates=SPECULATIVE_CANDIDATES)
+        # Speculation is the lowest-value LLM work: first to go as pressure rises
+        reserved = self.budget.acquire(session_id, "speculation") if self.budget else 0
+        if reserved is None:
+            return None
+        if not self.speculator.reserve(len(prompt) // 4 + SPECULATION_MAX_TOKENS):
+            if self.budget:
+                self.budget.settle(session_id, reserved, 0)
+            return None
+        return {"session_id": session_id, "strategy": strategy, "turn": next_turn, "prompt": prompt,
+                "reserved": reserved}
+    
+    def run_speculation(self, job: Dict):
+        """Blocking LLM call for a planned speculation (run in a worker thread)"""
+        candidates: List[str] = []
+        tokens = 0
+        try:
+            response = self.groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=[{"role": "user", "content": job["prompt"]}],
+                temperature=0.92,
+                max_tokens=SPECULATION_MAX_TOKENS,
+                top_p=0.95
+            )
+            content = response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            tokens = getattr(usage, "total_tokens", 0) or (len(job["prompt"]) + len(content)) // 4
+            candidates = [
+                reply for reply in (self._clean_response(r) for r in parse_numbered_replies(content))
+                if reply
+            ]
+        except Exception as e:
+            logger.warning(f"⚠️ Speculation failed: {e}")
+        finally:
+            self.speculator.release(job["session_id"], job["strategy"], job["turn"], candidates, tokens)
+            if self.budget:
+                self.budget.settle(job["session_id"], job["reserved"], tokens)
+    
+    def _choose_speculative(self, candidates: List[str], analysis: MessageAnalysis,
+                            state: Dict) -> Optional[str]:
+        """First usable candidate, or None if the message needs a direct reaction"""
+        # Credential, payment and link requests get targeted replies
+        for cue in ("otp", "password", "money", "link"):
+            if analysis.has_any(SCAMMER_CUES[cue]):
+                return None
+        for candidate in candidates:
+            if self._is_high_quality(candidate, state):
+                return candidate
+        return None
+    
+    def _analyze_scammer_message(self, analysis: MessageAnalysis, intelligence: Dict,
                                  state: Dict, scam_type: str):
         """Deep analysis of scammer's message to inform our strategy"""
         
-        msg_lower = message.lower()
-        
         # What has scammer revealed?
-        if "my name is" in msg_lower or "i am" in msg_lower:
+        if analysis.has_any(SCAMMER_CUES["name"]):
             # Extract name claim
-            name_match = re.search(r'(?:my name is|i am|this is)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', message, re.IGNORECASE)
+            name_match = analysis.search(NAME_CLAIM_PATTERN)
             if name_match and not state["scammer_info"]["name"]:
                 state["scammer_info"]["name"] = name_match.group(1)
                 state["rapport_level"] += 1
         
-        if "employee" in msg_lower or "staff" in msg_lower or "officer" in msg_lower:
-            role_match = re.search(r'(manager|officer|executive|agent|representative|employee)', msg_lower)
+        if analysis.has_any(SCAMMER_CUES["role"]):
+            role_match = analysis.search(ROLE_PATTERN)
             if role_match and not state["scammer_info"]["role"]:
-                state["scammer_info"]["role"] = role_match.group(1)
+                state["scammer_info"]["role"] = role_match.group(1).lower()
         
-        if "bank" in msg_lower or "company" in msg_lower:
-            org_match = re.search(r'(hdfc|icici|sbi|axis|paytm|phonepe|google pay|bank)', msg_lower)
+        if analysis.has_any(SCAMMER_CUES["organization"]):
+            org_match = analysis.search(ORG_PATTERN)
             if org_match and not state["scammer_info"]["organization"]:
-                state["scammer_info"]["organization"] = org_match.group(1)
+                state["scammer_info"]["organization"] = org_match.group(1).lower()
         
         # Track scammer's claims
-        if "urgent" in msg_lower or "immediately" in msg_lower:
+        if analysis.has_any(SCAMMER_CUES["urgency"]):
             if "urgency_tactic" not in state["scammer_claims"]:
                 state["scammer_claims"].append("urgency_tactic")
         
-        if "blocked" in msg_lower or "suspended" in msg_lower:
+        if analysis.has_any(SCAMMER_CUES["threat"]):
             if "account_threat" not in state["scammer_claims"]:
                 state["scammer_claims"].append("account_threat")
         
-        if "win" in msg_lower or "prize" in msg_lower or "lottery" in msg_lower:
+        if analysis.has_any(SCAMMER_CUES["prize"]):
             if "prize_claim" not in state["scammer_claims"]:
                 state["scammer_claims"].append("prize_claim")
         
@@ -192,13 +368,65 @@ class UltimateHumanLikeGenerator:
     
     def _generate_advanced_groq(self, session_id: str, message: str, message_count: int,
                                conversation_history: List[Dict], scam_type: str,
-                               state: Dict, strategy: str) -> Optional[str]:
+                               state: Dict, strategy: str, summary: str = "",
+                               reserved: Optional[int] = None) -> Optional[str]:
         """
         Advanced Groq generation with deep context and strategic prompting
+        
+        One call returns `self.candidates` numbered replies; the ranker picks
+        the best one that passes _is_high_quality, so a single bad reply no
+        longer sends the turn to the pattern-based tier. None if none passes.
+        reserved: Budget reservation, settled here with the actual usage
+        """
+        
+        prompt = self._build_prompt(message, conversation_history, scam_type, state, strategy,
+                                    summary, candidates=self.candidates)
+        
+        tokens = 0
+        try:
+            started = time.perf_counter()
+            response = self.groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.92,  # High for uniqueness
+                max_tokens=100 if self.candidates == 1 else CANDIDATE_MAX_TOKENS * self.candidates,
+                top_p=0.95
+            )
+            self.ranker.record_call(time.perf_counter() - started)
+            
+            content = (response.choices[0].message.content or "").strip()
+            usage = getattr(response, "usage", None)
+            tokens = getattr(usage, "total_tokens", 0) or (len(prompt) + len(content)) // 4
+            replies = [content] if self.candidates == 1 else parse_numbered_replies(content)
+            candidates = [reply for reply in map(self._clean_response, replies) if reply]
+            reply = self.ranker.choose(candidates, strategy, state["used_responses"],
+                                       lambda candidate: self._is_high_quality(candidate, state))
+            
+            # Track what we asked
+            if reply:
+                self._track_questions(reply, state)
+            
+            return reply
+            
+        except Exception as e:
+            print(f"Groq error: {e}")
+            return None
+        finally:
+            if self.budget and reserved is not None:
+                self.budget.settle(session_id, reserved, tokens)
+    
+    def _build_prompt(self, message: Optional[str], conversation_history: List[Dict], scam_type: str,
+                      state: Dict, strategy: str, summary: str = "", candidates: int = 1) -> str:
+        """LLM prompt: summary of older turns + the last CONTEXT_WINDOW messages
+        
+        message=None asks for replies to the scammer's next, not yet received,
+        message; candidates > 1 asks for a numbered list of alternatives.
         """
         
         # Build rich context
-        context = self._build_detailed_context(conversation_history[-6:], state)
+        context = self._build_detailed_context(conversation_history[-CONTEXT_WINDOW:], state)
+        if summary:
+            context = f"{summary}\n\n{context}"
         
         # What we've already done
         already_done = self._summarize_conversation_arc(state)
@@ -209,6 +437,17 @@ class UltimateHumanLikeGenerator:
         # Persona consistency
         persona_note = self._get_persona_note(state["conversation_style"])
         
+        if message is None:
+            latest = ("SCAMMER'S NEXT MESSAGE:\n"
+                      "(not received yet - the reply must make sense whatever they say next)")
+        else:
+            latest = f'SCAMMER\'S LATEST MESSAGE:\n"{message}"'
+        if candidates > 1:
+            task = (f"Generate {candidates} DIFFERENT victim responses as a numbered list "
+                    f"(1. ... 2. ...), one per line, nothing else:")
+        else:
+            task = "Generate ONLY the victim's response (conversational, brief):"
+        
         prompt = f"""You are an expert at playing a realistic scam victim to extract information. Your responses must be:
 
 1. UNIQUE - Never repeat questions or phrases used before
@@ -237,8 +476,7 @@ WHAT WE KNOW ABOUT SCAMMER:
 - Role: {state['scammer_info']['role'] or 'Unknown'}
 - Organization: {state['scammer_info']['organization'] or 'Unknown'}
 
-SCAMMER'S LATEST MESSAGE:
-"{message}"
+{latest}
 
 CRITICAL RULES:
 - Keep it SHORT (15-30 words max)
@@ -248,30 +486,11 @@ CRITICAL RULES:
 - Show appropriate emotion for {state['emotional_state']} state
 - Reference previous conversation naturally
 
-Generate ONLY the victim's response (conversational, brief):"""
+{task}"""
         
-        try:
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.92,  # High for uniqueness
-                max_tokens=100,
-                top_p=0.95
-            )
-            
-            reply = response.choices[0].message.content.strip()
-            reply = self._clean_response(reply)
-            
-            # Track what we asked
-            self._track_questions(reply, state)
-            
-            return reply
-            
-        except Exception as e:
-            print(f"Groq error: {e}")
-            return None
+        return prompt
     
-    def _generate_strategic_human_response(self, message: str, message_count: int,
+    def _generate_strategic_human_response(self, analysis: MessageAnalysis, message_count: int,
                                           intelligence: Dict, scam_type: str,
                                           state: Dict, strategy: str) -> str:
         """
@@ -279,14 +498,12 @@ Generate ONLY the victim's response (conversational, brief):"""
         Each response pool is large and varied - no repetition
         """
         
-        msg_lower = message.lower()
-        
         # Analyze scammer's ask
-        asking_for_money = any(w in msg_lower for w in ["send", "transfer", "pay", "deposit"])
-        asking_for_otp = "otp" in msg_lower or "code" in msg_lower or "verification code" in msg_lower
-        asking_for_password = any(w in msg_lower for w in ["password", "pin", "cvv", "card number"])
-        has_phone = bool(re.search(r'\d{10}', message))
-        has_link = "http" in msg_lower or "www" in msg_lower or "bit.ly" in msg_lower
+        asking_for_money = analysis.has_any(SCAMMER_CUES["money"])
+        asking_for_otp = analysis.has_any(SCAMMER_CUES["otp"])
+        asking_for_password = analysis.has_any(SCAMMER_CUES["password"])
+        has_phone = analysis.has_span("phone")
+        has_link = analysis.has_any(SCAMMER_CUES["link"])
         gave_name = state["scammer_info"]["name"] is not None
         
         # Strategy-based response generation
@@ -315,7 +532,7 @@ Generate ONLY the victim's response (conversational, brief):"""
                 return self._get_general_payment_question(state)
         
         elif strategy == "probe_process":
-            return self._get_process_probe_response(msg_lower, state)
+            return self._get_process_probe_response(analysis.lower, state)
         
         elif strategy == "final_extraction":
             return self._get_final_extraction_response(state)
@@ -498,6 +715,22 @@ Generate ONLY the victim's response (conversational, brief):"""
         ]
         return self._pick_unused(responses, state)
     
+    def _get_general_payment_question(self, state: Dict) -> str:
+        """Steer towards payment details when scammer hasn't asked yet"""
+        responses = [
+            "Do I need to pay anything to fix this?",
+            "Is there some fee? Where would I send it?",
+            "If I have to pay, which account should I use?",
+            "Which UPI ID do you people use for this?",
+            "Should I keep my UPI ready? Send to which ID?",
+            "How do I pay if there are any charges?",
+            "Is there a processing fee? What are the bank details?",
+            "Who do I make the payment to, if needed?",
+            "What account do you usually take payments in?",
+            "If money is needed, what's the beneficiary name?"
+        ]
+        return self._pick_unused(responses, state)
+    
     def _get_otp_refusal_response(self, message_count: int, state: Dict) -> str:
         """Refuse OTP requests naturally"""
         
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Cross-Session Intelligence Index
+================================
+
+Inverted index from normalized scammer identifier (phone, UPI ID, bank
+account, link, email) to every session that contained it, so analysts can
+link campaigns in real time instead of scanning all sessions.
+
+Features:
+- O(1) lookup per identifier
+- Incremental updates as each message is processed
+- First-seen / last-seen timestamps per identifier and per session
+- Compact append-only JSONL journal, compacted on load and shutdown
+
+Journal format (one sighting or compacted pair per line):
+    ["+919876543210", "phoneNumbers", "session-1", 1760000000, 1760000300]
+
+Author: Team YUKT
+License: MIT
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+from domain_reputation import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_identifier(value: str) -> str:
+    """Normalize an identifier so every variant maps to one index key
+
+    - Phones: +91XXXXXXXXXX (spaces, dashes, parentheses removed)
+    - Accounts: digits only
+    - UPI IDs / emails: lowercase
+    - Links: canonical URL (as stored by the extractor: no www., default
+      port or tracking parameters), lowercase, scheme and trailing slash removed
+    """
+    value = value.strip()
+
+    if "://" in value or value.lower().startswith("www."):
+        value = (canonicalize_url(value) or value).lower()
+        value = value.split("://", 1)[-1]
+        return value.rstrip("/")
+
+    value = value.lower()
+
+    if "@" in value:
+        return value
+
+    compact = re.sub(r'[\s\-()]', '', value)
+    digits = compact.lstrip('+')
+    if digits.isdigit():
+        if len(digits) == 10 and digits[0] in '6789':
+            return '+91' + digits
+        if len(digits) == 12 and digits.startswith('91') and compact.startswith('+'):
+            return '+' + digits
+        return digits
+
+    return value
+
+
+class IntelligenceIndex:
+    """Identifier -> sessions inverted index with optional journal persistence"""
+
+    def __init__(self, path: Optional[str] = None, flush_every: int = 256):
+        """
+        Args:
+            path: Journal file; None keeps the index in memory only
+            flush_every: Buffered journal lines before an automatic flush
+        """
+        self.path = path
+        self.flush_every = flush_every
+        # key -> {"type", "first_seen", "last_seen", "sessions": {sid: [first, last]}}
+        self.entries: Dict[str, Dict] = {}
+        self._pending: List[str] = []
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(path):
+                self.load(path)
+                self.compact()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _record(self, key: str, intel_type: str, session_id: str,
+                first_seen: float, last_seen: float):
+        """Apply one sighting (or compacted pair) to the in-memory index"""
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {
+                "type": intel_type,
+                "first_seen": first_seen,
+                "last_seen": last_seen,
+                "sessions": {}
+            }
+        else:
+            entry["first_seen"] = min(entry["first_seen"], first_seen)
+            entry["last_seen"] = max(entry["last_seen"], last_seen)
+
+        seen = entry["sessions"].get(session_id)
+        if seen is None:
+            entry["sessions"][session_id] = [first_seen, last_seen]
+        else:
+            seen[0] = min(seen[0], first_seen)
+            seen[1] = max(seen[1], last_seen)
+
+    def add(self, session_id: str, intel: Dict[str, Iterable[str]],
+            timestamp: Optional[float] = None):
+        """Record every identifier in an intelligence dict as seen in a session
+
+        Args:
+            session_id: Session the identifiers came from
+            intel: {intel type: identifiers}, e.g. extractor output
+            timestamp: Epoch seconds (default: now)
+        """
+        ts = int(timestamp if timestamp is not None else time.time())
+        for intel_type, items in intel.items():
+            for item in items:
+                key = normalize_identifier(item)
+                if not key:
+                    continue
+                self._record(key, intel_type, session_id, ts, ts)
+                if self.path:
+                    self._pending.append(json.dumps([key, intel_type, session_id, ts, ts], separators=(",", ":")))
+
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def lookup(self, identifier: str) -> Optional[Dict]:
+        """Return the index entry for an identifier (any variant), or None"""
+        key = normalize_identifier(identifier)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return {"identifier": key, **entry}
+
+    def sessions_for(self, identifier: str) -> List[str]:
+        """Session IDs that contained an identifier"""
+        entry = self.entries.get(normalize_identifier(identifier))
+        return list(entry["sessions"]) if entry else []
+
+    # ============= PERSISTENCE =============
+
+    def flush(self):
+        """Append buffered sightings to the journal"""
+        if not self.path or not self._pending:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(self._pending))
+                f.write("\n")
+            self._pending.clear()
+        except OSError as e:
+            logger.error(f"❌ Intel index flush failed: {e}")
+
+    def load(self, path: str):
+        """Replay a journal into memory (malformed lines are skipped)"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    key, intel_type, session_id, first_seen, last_seen = json.loads(line)
+                except (ValueError, TypeError):
+                    continue
+                self._record(key, intel_type, session_id, first_seen, last_seen)
+        logger.info(f"📚 Loaded intel index: {len(self.entries)} identifiers")
+
+    def compact(self):
+        """Rewrite the journal with one line per (identifier, session) pair"""
+        if not self.path:
+            return
+        self._pending.clear()
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, entry in self.entries.items():
+                    for session_id, (first_seen, last_seen) in entry["sessions"].items():
+                        f.write(json.dumps([key, entry["type"], session_id, first_seen, last_seen], separators=(",", ":")))
+                        f.write("\n")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"❌ Intel index compaction failed: {e}")
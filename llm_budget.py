@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+LLM Token Budget
+================
+
+The generator used to try the LLM on every turn, whatever the load or the
+spend so far, while the monthly bill and the provider's rate limits are
+hard ceilings. LLMBudget meters tokens from the usage block of every
+response and decides, per turn, whether the LLM tier is worth it.
+
+Each turn's extraction strategy has a value. Pressure is the highest of
+the current request load (AdmissionController.load) and the share of the
+minute and day budgets already spent. A turn goes to the LLM only while
+pressure is below its value, so as pressure rises, low-value turns
+(rapport building, speculation) move to the pattern tier first and
+payment and final extraction turns keep the LLM the longest.
+
+Features:
+- Hard ceilings: per minute, per UTC day and per session (0 = unlimited);
+  a call that would cross one is never made
+- Calls reserve an estimate (running average of real calls) up front and
+  settle with the actual usage, so concurrent turns can't overshoot
+- Decisions per strategy, denial reasons and remaining headroom for
+  reporting
+- Thread-safe (LLM calls run in worker threads)
+
+Author: Team YUKT
+License: MIT
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# How much a turn of each strategy is worth an LLM call (0-1)
+STRATEGY_VALUE = {
+    "extract_payment_info": 1.0,
+    "final_extraction": 1.0,
+    "extract_phone_naturally": 0.6,
+    "extract_name": 0.6,
+    "extract_role": 0.6,
+    "extract_email": 0.6,
+    "extract_organizational_info": 0.6,
+    "probe_process": 0.6,
+    "build_rapport": 0.4,
+    "speculation": 0.2,
+}
+DEFAULT_VALUE = 0.4
+
+
+class LLMBudget:
+    """Token accounting and LLM-or-patterns decisions"""
+
+    def __init__(self, tokens_per_minute: int = 0, tokens_per_day: int = 0,
+                 tokens_per_session: int = 0, load: Callable[[], float] = lambda: 0.0,
+                 initial_call_tokens: int = 700):
+        """
+        Args:
+            tokens_per_minute: Provider rate limit to stay under (0 = unlimited)
+            tokens_per_day: Daily spend ceiling (0 = unlimited)
+            tokens_per_session: Most one session may spend (0 = unlimited)
+            load: Current request load, 0 (idle) to 1 (at capacity)
+            initial_call_tokens: Estimate per call until real usage is seen
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens_per_day = tokens_per_day
+        self.tokens_per_session = tokens_per_session
+        self.load = load
+        self.call_tokens = float(initial_call_tokens)
+
+        self._lock = threading.Lock()
+        self._minute_start = time.monotonic()
+        self._minute_tokens = 0
+        self._day = self._today()
+        self._day_tokens = 0
+        self.session_tokens: Dict[str, int] = {}
+
+        self.tokens_total = 0
+        self.calls = 0
+        self.decisions: Dict[str, Dict[str, int]] = {}  # strategy -> {"llm", "patterns"}
+        self.denied: Dict[str, int] = {}                # reason -> count
+
+    @staticmethod
+    def _today() -> int:
+        return int(time.time() // 86400)
+
+    def _roll_windows(self):
+        """Start new minute / day windows when due (lock held)"""
+        now = time.monotonic()
+        if now - self._minute_start >= 60:
+            self._minute_start = now
+            self._minute_tokens = 0
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._day_tokens = 0
+
+    def _pressure(self) -> float:
+        """Highest of request load and budget share spent, 0-1 (lock held)"""
+        pressure = min(max(self.load(), 0.0), 1.0)
+        if self.tokens_per_minute:
+            pressure = max(pressure, self._minute_tokens / self.tokens_per_minute)
+        if self.tokens_per_day:
+            pressure = max(pressure, self._day_tokens / self.tokens_per_day)
+        return min(pressure, 1.0)
+
+    # ============= DECISIONS =============
+
+    def acquire(self, session_id: str, strategy: str) -> Optional[int]:
+        """
+        Decide whether this turn may call the LLM
+
+        Returns:
+            Tokens reserved (pass to settle() after the call), or None when
+            the turn should use the pattern tier
+        """
+        with self._lock:
+            self._roll_windows()
+            estimate = int(self.call_tokens)
+            reason = None
+            if self.tokens_per_minute and self._minute_tokens + estimate > self.tokens_per_minute:
+                reason = "minute"
+            elif self.tokens_per_day and self._day_tokens + estimate > self.tokens_per_day:
+                reason = "day"
+            elif (self.tokens_per_session
+                  and self.session_tokens.get(session_id, 0) + estimate > self.tokens_per_session):
+                reason = "session"
+            elif self._pressure() >= STRATEGY_VALUE.get(strategy, DEFAULT_VALUE):
+                reason = "pressure"
+
+            counts = self.decisions.setdefault(strategy, {"llm": 0, "patterns": 0})
+            if reason:
+                counts["patterns"] += 1
+                self.denied[reason] = self.denied.get(reason, 0) + 1
+                return None
+            counts["llm"] += 1
+            self._charge(session_id, estimate)
+            return estimate
+
+    def settle(self, session_id: str, reserved: int, used: int):
+        """Replace a reservation with the tokens the call actually used (0 if it failed)"""
+        with self._lock:
+            self._roll_windows()
+            self._charge(session_id, used - reserved)
+            if used:
+                self.calls += 1
+                self.tokens_total += used
+                self.call_tokens += (used - self.call_tokens) * 0.1
+
+    def _charge(self, session_id: str, tokens: int):
+        """Add (or refund) tokens in every window (lock held)"""
+        self._minute_tokens = max(self._minute_tokens + tokens, 0)
+        self._day_tokens = max(self._day_tokens + tokens, 0)
+        self.session_tokens[session_id] = max(self.session_tokens.get(session_id, 0) + tokens, 0)
+
+    def discard(self, session_id: str):
+        """Forget a session's spend (session dropped from memory)"""
+        with self._lock:
+            self.session_tokens.pop(session_id, None)
+
+    def reset(self):
+        """Forget all spend and decisions"""
+        with self._lock:
+            self._minute_start = time.monotonic()
+            self._minute_tokens = 0
+            self._day_tokens = 0
+            self.session_tokens.clear()
+            self.tokens_total = 0
+            self.calls = 0
+            self.decisions = {}
+            self.denied = {}
+
+    def stats(self) -> Dict:
+        """Spend, remaining headroom and decisions per strategy"""
+        with self._lock:
+            self._roll_windows()
+            llm = sum(counts["llm"] for counts in self.decisions.values())
+            patterns = sum(counts["patterns"] for counts in self.decisions.values())
+            return {
+                "tokensTotal": self.tokens_total,
+                "calls": self.calls,
+                "avgCallTokens": round(self.call_tokens, 1),
+                "tokensThisMinute": self._minute_tokens,
+                "tokensToday": self._day_tokens,
+                "minuteHeadroom": (max(self.tokens_per_minute - self._minute_tokens, 0)
+                                   if self.tokens_per_minute else None),
+                "dayHeadroom": (max(self.tokens_per_day - self._day_tokens, 0)
+                                if self.tokens_per_day else None),
+                "pressure": round(self._pressure(), 3),
+                "llmShare": round(llm / (llm + patterns), 3) if llm + patterns else 0.0,
+                "decisions": {strategy: dict(counts) for strategy, counts in self.decisions.items()},
+                "denied": dict(self.denied),
+                "trackedSessions": len(self.session_tokens)
+            }
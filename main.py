@@ -18,19 +18,24 @@ License: MIT
 
 import os
 import re
+import gc
 import random
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 # FastAPI and dependencies
-from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi import FastAPI, HTTPException, Header, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError
 import httpx
+import orjson
 
 # AI/ML Libraries
 from groq import Groq
@@ -39,11 +44,65 @@ from groq import Groq
 from enhanced_extractor import EnhancedIntelligenceExtractor
 
 # Enhanced response generation
-from enhanced_response import UltimateHumanLikeGenerator
+from enhanced_response import CONTEXT_WINDOW, UltimateHumanLikeGenerator
 
 # Red flag detection
 from red_flag_detector import RedFlagDetector
 
+# Scam detection
+from scam_detector import AdvancedScamDetector
+
+# Cross-session intelligence index
+from intel_index import IntelligenceIndex
+
+# Campaign clustering
+from campaign_clustering import CampaignClusterer
+
+# Link canonicalization + domain reputation
+from domain_reputation import DomainReputationIndex
+
+# Confusable/obfuscation normalization
+from text_normalizer import normalize_message
+
+# Shared per-message analysis (lowercasing, keyword scan, regex results)
+from message_analysis import MessageAnalysis
+
+# Known-script fast path
+from script_registry import ScriptRegistry
+
+# Performance metrics
+from utils.metrics import get_metrics
+
+# Import speculative next-reply store
+from speculation import ReplySpeculator
+
+# Import LLM token budget (load-aware tier selection)
+from llm_budget import LLMBudget
+
+# Import admission control (rate limits + load shedding)
+from admission import DEGRADE, SHED, AdmissionController
+
+# Import per-session turn ordering
+from session_locks import SessionLocks
+
+# Import numeric span scanner (phones/accounts/cards/IDs)
+from numeric_spans import scan_numeric_spans
+
+# Import rolling conversation summaries
+from conversation_summary import ConversationSummarizer
+
+# Import compact message history
+from message_history import MessageHistory, parse_timestamp
+
+# Import session listing index (filters + cursor pagination)
+from session_index import SessionIndex
+
+# Import finalized session archive (compressed segments on disk)
+from session_archive import SessionArchive
+
+# Import incremental session snapshots (warm restart)
+from session_snapshot import SnapshotLog
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -64,6 +123,37 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
 API_SECRET_KEY = os.getenv("API_SECRET_KEY", "W7I4x8cXh1_nV_h_VX0OBkgpivH4i2hykJqa2OCRZ2M")
 GUVI_CALLBACK_URL = "https://hackathon.guvi.in/api/updateHoneyPotFinalResult"
 
+# Local persistence (set a path to "" to keep that state in memory only)
+DATA_DIR = os.getenv("DATA_DIR", "data")
+INTEL_INDEX_PATH = os.getenv("INTEL_INDEX_PATH", os.path.join(DATA_DIR, "intel_index.jsonl"))
+DOMAIN_INDEX_PATH = os.getenv("DOMAIN_INDEX_PATH", os.path.join(DATA_DIR, "domain_reputation.idx"))
+DOMAIN_BLOCKLIST_PATH = os.getenv("DOMAIN_BLOCKLIST_PATH", os.path.join(DATA_DIR, "domain_blocklist.txt"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(DATA_DIR, "archive"))
+ARCHIVE_IDLE_SECONDS = float(os.getenv("ARCHIVE_IDLE_SECONDS", "300"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "256"))
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(DATA_DIR, "sessions.snapshot"))
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SNAPSHOT_INTERVAL_SECONDS", "30"))
+
+# Replies requested per LLM call; a local ranker picks the best (1 = single reply)
+LLM_CANDIDATES = int(os.getenv("LLM_CANDIDATES", "3"))
+
+# LLM token ceilings (0 = unlimited); under load or near a ceiling,
+# low-value turns use the pattern tier first
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_DAY = int(os.getenv("LLM_TOKENS_PER_DAY", "0"))
+LLM_TOKENS_PER_SESSION = int(os.getenv("LLM_TOKENS_PER_SESSION", "20000"))
+
+# Speculative next-reply pre-generation (opt-in, spends LLM tokens while idle)
+SPECULATIVE_REPLIES = os.getenv("SPECULATIVE_REPLIES", "").lower() in ("1", "true", "yes")
+SPECULATION_TOKENS_PER_MINUTE = int(os.getenv("SPECULATION_TOKENS_PER_MINUTE", "20000"))
+
+# Admission control on /api/message (rates in requests/second, 0 disables)
+RATE_LIMIT_KEY_PER_SEC = float(os.getenv("RATE_LIMIT_KEY_PER_SEC", "200"))
+RATE_LIMIT_KEY_BURST = float(os.getenv("RATE_LIMIT_KEY_BURST", "400"))
+RATE_LIMIT_SESSION_PER_SEC = float(os.getenv("RATE_LIMIT_SESSION_PER_SEC", "1"))
+RATE_LIMIT_SESSION_BURST = float(os.getenv("RATE_LIMIT_SESSION_BURST", "10"))
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "64"))
+
 # Handle OpenRouter
 if LLM_PROVIDER == 'openrouter':
     if OPENROUTER_API_KEY:
@@ -87,11 +177,34 @@ else:
     ai_model = None
     logger.warning("⚠️ No AI client configured - using fallback responses")
 
+# Startup/shutdown hooks
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if session_snapshots:
+        restore_sessions()
+    snapshot_task = asyncio.create_task(run_snapshots()) if session_snapshots else None
+    clustering_task = asyncio.create_task(run_campaign_clustering())
+    summary_task = asyncio.create_task(run_conversation_summaries())
+    archive_task = asyncio.create_task(run_session_archiver()) if session_archive else None
+    yield
+    clustering_task.cancel()
+    summary_task.cancel()
+    if archive_task:
+        archive_task.cancel()
+    if snapshot_task:
+        snapshot_task.cancel()
+        # Last incremental snapshot so a redeploy resumes every engagement
+        await take_snapshot()
+    # Persist the cross-session index in its compact form
+    intel_index.compact()
+
 # FastAPI app
 app = FastAPI(
     title="Ultimate Agentic Honey-Pot - Competition Edition",
     description="Advanced AI System for Scam Detection with Full Evaluation Compliance",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -114,7 +227,7 @@ if os.path.exists("frontend"):
 class Message(BaseModel):
     sender: str = "scammer"
     text: str = ""
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: Union[str, int, float] = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class Metadata(BaseModel):
     channel: str = "SMS"
@@ -131,102 +244,92 @@ class APIResponse(BaseModel):
     status: str = "success"
     reply: str
 
+def parse_incoming(raw: bytes) -> Optional[IncomingRequest]:
+    """orjson-decode and validate a /api/message body; None when empty or not JSON
+    
+    Raises:
+        RequestValidationError: JSON that does not fit IncomingRequest (422)
+    """
+    try:
+        payload = orjson.loads(raw) if raw else None
+    except orjson.JSONDecodeError:
+        return None
+    if not payload:
+        return None
+    try:
+        return IncomingRequest.model_validate(payload)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False))
+
+def reply_response(response: APIResponse) -> ORJSONResponse:
+    """Render a reply directly, skipping FastAPI's response_model re-validation"""
+    return ORJSONResponse({"status": response.status, "reply": response.reply})
+
 # Session storage
 sessions = {}
 
-# Scam detector
-class AdvancedScamDetector:
-    def __init__(self):
-        self.scam_keywords = {
-            # Urgency indicators
-            "urgent": 3, "immediately": 3, "now": 2, "asap": 3, "hurry": 3, "quick": 2, "today": 1,
-            # Threat indicators
-            "blocked": 4, "suspended": 4, "freeze": 4, "locked": 4, "expire": 3, "deactivate": 4, "pending": 2,
-            # Action requests
-            "verify": 2, "confirm": 2, "update": 2, "click": 3, "call": 2, "send": 2, "provide": 2, "register": 2,
-            # Financial terms
-            "account": 2, "bank": 2, "upi": 3, "payment": 2, "transaction": 2, "transfer": 3, "rupees": 2, "rs": 1,
-            # Sensitive data
-            "otp": 5, "cvv": 5, "pin": 5, "password": 5, "kyc": 4, "aadhar": 4, "pan": 4,
-            # Rewards/prizes
-            "winner": 4, "prize": 4, "lottery": 4, "won": 3, "cashback": 3, "reward": 3, "refund": 3, "earn": 2,
-            # Phishing indicators
-            "link": 2, "website": 2, "portal": 2, "app": 2, "download": 3, "claim": 2,
-            # Authority impersonation
-            "officer": 3, "department": 2, "government": 3, "police": 4, "court": 4, "legal": 3, "tax": 3,
-            # Payment apps
-            "paytm": 2, "phonepe": 2, "gpay": 2, "googlepay": 2,
-            # Job scam indicators
-            "work from home": 4, "opportunity": 2, "registration fee": 4, "investment": 2,
-        }
-    
-    def detect(self, message: str) -> Dict:
-        msg_lower = message.lower()
-        
-        # Keyword scoring
-        keyword_score = sum(weight for kw, weight in self.scam_keywords.items() if kw in msg_lower)
-        keyword_score = min(keyword_score / 15.0, 1.0)
-        
-        # Pattern detection
-        has_urgency = any(w in msg_lower for w in ["urgent", "immediately", "now", "asap", "today", "hurry"])
-        has_threat = any(w in msg_lower for w in ["blocked", "suspended", "freeze", "expire", "pending"])
-        has_action = any(w in msg_lower for w in ["verify", "click", "call", "send", "provide", "register"])
-        has_financial = any(w in msg_lower for w in ["account", "bank", "upi", "otp", "payment", "rupees", "rs"])
-        has_reward = any(w in msg_lower for w in ["won", "prize", "cashback", "refund", "earn", "reward"])
-        
-        pattern_score = 0.0
-        if has_urgency and has_threat and has_action:
-            pattern_score = 1.0
-        elif (has_urgency and has_threat) or (has_threat and has_action):
-            pattern_score = 0.7
-        elif (has_action and has_financial) or (has_reward and has_action):
-            pattern_score = 0.5
-        elif has_urgency or has_threat or has_reward:
-            pattern_score = 0.3
-        
-        # Combined score
-        total_score = (keyword_score * 0.5 + pattern_score * 0.5)
-        
-        # Classify scam type (covers all major fraud categories)
-        scam_type = "Unknown"
-        if "bank" in msg_lower or "account" in msg_lower:
-            scam_type = "Banking/Financial Fraud"
-        elif "upi" in msg_lower or "paytm" in msg_lower or "phonepe" in msg_lower or "gpay" in msg_lower:
-            scam_type = "UPI/Payment Scam"
-        elif "otp" in msg_lower or "cvv" in msg_lower or "password" in msg_lower or "pin" in msg_lower:
-            scam_type = "Credential Phishing"
-        elif "winner" in msg_lower or "prize" in msg_lower or "lottery" in msg_lower or "congratulations" in msg_lower:
-            scam_type = "Prize/Lottery Scam"
-        elif "http" in msg_lower or "www" in msg_lower or "click" in msg_lower or "link" in msg_lower:
-            scam_type = "Phishing Link Scam"
-        elif "cashback" in msg_lower or "refund" in msg_lower or "reward" in msg_lower:
-            scam_type = "Cashback/Refund Scam"
-        elif "kyc" in msg_lower or "update" in msg_lower or "verify" in msg_lower:
-            scam_type = "KYC/Verification Scam"
-        elif "tax" in msg_lower or "penalty" in msg_lower or "fine" in msg_lower:
-            scam_type = "Tax/Penalty Scam"
-        elif "job" in msg_lower or "work from home" in msg_lower or "earn" in msg_lower:
-            scam_type = "Job/Employment Scam"
-        elif "investment" in msg_lower or "trading" in msg_lower or "profit" in msg_lower:
-            scam_type = "Investment/Trading Scam"
-        
-        return {
-            "is_scam": total_score > 0.25,  # Lowered from 0.35 to catch more scams
-            "confidence": total_score,
-            "scam_type": scam_type
-        }
-
+# Initialize scam detector
 scam_detector = AdvancedScamDetector()
 
 # Initialize enhanced intelligence extractor
 intelligence_extractor = EnhancedIntelligenceExtractor()
 
-# Initialize enhanced response generator
-response_generator = UltimateHumanLikeGenerator()
+# Initialize LLM token budget (load comes from admission control, set up below)
+llm_budget = LLMBudget(
+    tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+    tokens_per_day=LLM_TOKENS_PER_DAY,
+    tokens_per_session=LLM_TOKENS_PER_SESSION,
+    load=lambda: admission.load()
+)
+
+# Initialize enhanced response generator (with speculation when enabled)
+reply_speculator = ReplySpeculator(SPECULATION_TOKENS_PER_MINUTE) if SPECULATIVE_REPLIES else None
+response_generator = UltimateHumanLikeGenerator(speculator=reply_speculator, candidates=LLM_CANDIDATES,
+                                                budget=llm_budget)
 
 # Initialize red flag detector
 red_flag_detector = RedFlagDetector()
 
+# Initialize cross-session intelligence index
+intel_index = IntelligenceIndex(INTEL_INDEX_PATH or None)
+
+# Initialize campaign clustering (fed by handle_message, drained in background)
+campaign_clusterer = CampaignClusterer()
+
+# Initialize rolling conversation summaries (older turns, folded in background)
+conversation_summarizer = ConversationSummarizer(
+    extract=lambda text: intelligence_extractor.extract(text, normalized=True),
+    window=CONTEXT_WINDOW
+)
+
+# Initialize domain reputation index (memory-mapped, rebuilt when the blocklist changes)
+domain_reputation = DomainReputationIndex.open(DOMAIN_INDEX_PATH or None, DOMAIN_BLOCKLIST_PATH or None)
+
+# Initialize admission control for /api/message
+admission = AdmissionController(
+    key_rate=RATE_LIMIT_KEY_PER_SEC,
+    key_burst=RATE_LIMIT_KEY_BURST,
+    session_rate=RATE_LIMIT_SESSION_PER_SEC,
+    session_burst=RATE_LIMIT_SESSION_BURST,
+    max_in_flight=MAX_IN_FLIGHT
+)
+
+# Initialize per-session locks (turns of one session never interleave)
+session_locks = SessionLocks()
+
+# Initialize session listing index (maintained on every turn)
+session_index = SessionIndex()
+
+# Initialize finalized session archive (idle finalized sessions leave memory)
+session_archive = SessionArchive(ARCHIVE_DIR) if ARCHIVE_DIR else None
+
+# Initialize session snapshots (restored at startup, written periodically)
+session_snapshots = SnapshotLog(SNAPSHOT_PATH) if SNAPSHOT_PATH else None
+
+# Initialize known-script registry (learned from finalized sessions)
+script_registry = ScriptRegistry()
+metrics = get_metrics()
+
 # Intelligence extractor (DEPRECATED - using enhanced version now)
 def extract_intelligence(message: str) -> Dict:
     intel = {
@@ -237,14 +340,11 @@ def extract_intelligence(message: str) -> Dict:
         "emailAddresses": []
     }
     
-    # Phone numbers
-    phone_patterns = [r'\+91[\s-]?\d{10}', r'\b[6-9]\d{9}\b']
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, message)
-        for match in matches:
-            cleaned = re.sub(r'\D', '', match)
-            if len(cleaned) == 10 and cleaned not in intel["phoneNumbers"]:
-                intel["phoneNumbers"].append(cleaned)
+    # Phone numbers, bank accounts and cards from one numeric scan
+    spans = scan_numeric_spans(message)
+    for span in spans:
+        if span.kind == "phone" and span.value not in intel["phoneNumbers"]:
+            intel["phoneNumbers"].append(span.value)
     
     # UPI IDs
     upi_matches = re.findall(r'[\w\.-]+@[\w]+', message, re.IGNORECASE)
@@ -261,10 +361,9 @@ def extract_intelligence(message: str) -> Dict:
             intel["emailAddresses"].append(match.lower())
     
     # Bank accounts
-    account_matches = re.findall(r'\b\d{9,18}\b', message)
-    for match in account_matches:
-        if match not in intel["bankAccounts"]:
-            intel["bankAccounts"].append(match)
+    for span in spans:
+        if span.kind in ("account", "card") and span.value not in intel["bankAccounts"]:
+            intel["bankAccounts"].append(span.value)
     
     # URLs
     url_patterns = [r'https?://[^\s]+', r'www\.[^\s]+']
@@ -341,7 +440,7 @@ Respond as the victim. Be natural and extract information:"""
     # Fallback responses (context-aware)
     asking_for_money = any(w in msg_lower for w in ["send", "transfer", "pay", "rupees"])
     has_link = "http" in msg_lower or "www" in msg_lower
-    has_phone = bool(re.search(r'\d{10}', message))
+    has_phone = any(span.kind == "phone" for span in scan_numeric_spans(message))
     asking_for_info = any(w in msg_lower for w in ["account", "otp", "password", "cvv"])
     
     if stage == "early":
@@ -367,31 +466,73 @@ Respond as the victim. Be natural and extract information:"""
     else:  # late stage
         return "I want to verify this at my bank branch. Let me call the official customer service number first."
 
+# Session intelligence store
+INTEL_KEYS = ("phoneNumbers", "upiIds", "bankAccounts", "phishingLinks", "emailAddresses")
+
+def new_intelligence_store() -> Dict[str, Dict[str, int]]:
+    """Per-session intelligence: for each type, an insertion-ordered
+    {item: turn first seen} index with O(1) membership"""
+    return {key: {} for key in INTEL_KEYS}
+
+def merge_intelligence(store: Dict[str, Dict[str, int]], new_intel: Dict[str, List[str]],
+                       turn: int) -> Dict[str, List[str]]:
+    """Merge extractor output into the store, keeping first-seen order.
+    Only unseen items are touched; returns them per type."""
+    added = {}
+    for key, items in new_intel.items():
+        index = store.setdefault(key, {})
+        for item in items:
+            if item not in index:
+                index[item] = turn
+                added.setdefault(key, []).append(item)
+    return added
+
+# Session red-flag table
+MAX_FLAG_PATTERNS = 16  # Matched patterns kept per flag (link flags list domains)
+
+def merge_red_flags(table: Dict[str, Dict], flags: List[Dict], turn: int):
+    """Fold one turn's detector flags into the session's {flag name: entry}
+    table. Repeats bump the count and last turn instead of appending, so
+    the table holds at most one entry per flag category."""
+    for flag in flags:
+        entry = table.get(flag["flag"])
+        if entry is None:
+            entry = table[flag["flag"]] = {
+                "flag": flag["flag"],
+                "severity": flag["severity"],
+                "description": flag["description"],
+                "count": 0,
+                "firstTurn": turn,
+                "lastTurn": turn,
+                "matchedPatterns": []
+            }
+        entry["count"] += 1
+        entry["lastTurn"] = turn
+        patterns = entry["matchedPatterns"]
+        for pattern in flag.get("matched_patterns", ()):
+            if len(patterns) >= MAX_FLAG_PATTERNS:
+                break
+            if pattern not in patterns:
+                patterns.append(pattern)
+
+def red_flag_timeline(table: Dict[str, Dict]) -> List[Dict]:
+    """Flags in the order they were first raised, for analysts"""
+    return sorted(table.values(), key=lambda entry: entry["firstTurn"])
+
 # Calculate engagement metrics
 def calculate_engagement_metrics(session: Dict) -> Dict:
     messages = session["messages"]
-    total_messages = len(messages)
-    
-    if len(messages) >= 2:
-        try:
-            first_time = datetime.fromisoformat(messages[0]["timestamp"].replace('Z', '+00:00'))
-            last_time = datetime.fromisoformat(messages[-1]["timestamp"].replace('Z', '+00:00'))
-            duration = int((last_time - first_time).total_seconds())
-        except:
-            duration = max(15 * (total_messages // 2), 0)
-    else:
-        duration = 0
-    
     return {
-        "totalMessagesExchanged": total_messages,
-        "engagementDurationSeconds": duration
+        "totalMessagesExchanged": len(messages),
+        "engagementDurationSeconds": messages.duration_seconds()
     }
 
 # Build final output - STRICT 99+ PROTOCOL COMPLIANCE
 def build_final_output(session_id: str, session: Dict) -> Dict:
     intel = session["intelligence"]
     metrics = calculate_engagement_metrics(session)
-    red_flags = session.get("red_flags", [])
+    red_flags = session.get("red_flags", {})
+    link_reputation = session.get("link_reputation", {})
     
     # MISSION CRITICAL: Ensure scamDetected is ALWAYS true if any indicators exist
     scam_detected = session["scam_detected"]
@@ -411,9 +552,8 @@ def build_final_output(session_id: str, session: Dict) -> Dict:
         
         # Add red flag summary
         if red_flags:
-            unique_flags = list({f['flag']: f for f in red_flags}.values())
-            critical_flags = [f for f in unique_flags if f['severity'] == 'CRITICAL']
-            high_flags = [f for f in unique_flags if f['severity'] == 'HIGH']
+            critical_flags = [f for f in red_flags.values() if f['severity'] == 'CRITICAL']
+            high_flags = [f for f in red_flags.values() if f['severity'] == 'HIGH']
             
             if critical_flags:
                 notes_parts.append(f"CRITICAL red flags: {', '.join([f['flag'] for f in critical_flags])}.")
@@ -429,6 +569,11 @@ def build_final_output(session_id: str, session: Dict) -> Dict:
             notes_parts.append(f"Extracted {len(intel['bankAccounts'])} bank account(s).")
         if intel["phishingLinks"]:
             notes_parts.append(f"Detected {len(intel['phishingLinks'])} phishing link(s).")
+            risky_domains = list(dict.fromkeys(
+                r["domain"] for r in link_reputation.values() if r["riskScore"] >= 0.5
+            ))
+            if risky_domains:
+                notes_parts.append(f"High-risk domains: {', '.join(risky_domains)}.")
         if intel["emailAddresses"]:
             notes_parts.append(f"Extracted {len(intel['emailAddresses'])} email(s).")
         
@@ -440,15 +585,14 @@ def build_final_output(session_id: str, session: Dict) -> Dict:
         notes_parts.append("No scam pattern detected.")
     
     # Format red flags for output
-    formatted_red_flags = []
-    if red_flags:
-        unique_flags = list({f['flag']: f for f in red_flags}.values())
-        for flag in unique_flags:
-            formatted_red_flags.append({
-                "flag": flag['flag'],
-                "severity": flag['severity'],
-                "description": flag['description']
-            })
+    formatted_red_flags = [
+        {
+            "flag": flag['flag'],
+            "severity": flag['severity'],
+            "description": flag['description']
+        }
+        for flag in red_flags.values()
+    ]
     
     # STRICT API CONTRACT - All required + recommended fields
     return {
@@ -459,11 +603,21 @@ def build_final_output(session_id: str, session: Dict) -> Dict:
         "confidenceLevel": round(session.get('scam_confidence', 0.0), 2),
         "redFlags": formatted_red_flags,
         "totalMessagesExchanged": metrics["totalMessagesExchanged"],
-        "extractedIntelligence": intel,
+        "extractedIntelligence": {key: list(items) for key, items in intel.items()},
         "engagementMetrics": {
             "totalMessagesExchanged": metrics["totalMessagesExchanged"],
             "engagementDurationSeconds": metrics["engagementDurationSeconds"]
         },
+        "linkAnalysis": [
+            {
+                "url": url,
+                "domain": report["domain"],
+                "category": report["category"],
+                "riskScore": report["riskScore"]
+            }
+            for url, report in link_reputation.items()
+        ],
+        "campaignId": campaign_clusterer.campaign_id(session_id),
         "agentNotes": " ".join(notes_parts)
     }
 
@@ -480,6 +634,174 @@ async def send_to_guvi(final_output: Dict):
     except Exception as e:
         logger.error(f"❌ Error sending to GUVI: {e}")
 
+# Background workers
+async def run_campaign_clustering(interval: float = 0.5, slice_items: int = 16):
+    """Drain queued clustering work off the reply critical path
+    
+    Small slices with a yield in between (MinHash is ~0.5ms per message), so
+    a backlog never stalls the loop; the clusterer stays single-threaded.
+    """
+    while True:
+        try:
+            processed = campaign_clusterer.drain(max_items=slice_items)
+        except Exception as e:
+            logger.error(f"❌ Campaign clustering failed: {e}")
+            processed = 0
+        await asyncio.sleep(0 if processed else interval)
+
+async def run_conversation_summaries(interval: float = 0.5):
+    """Fold turns that left the prompt window into per-session summaries"""
+    while True:
+        try:
+            processed = conversation_summarizer.drain()
+        except Exception as e:
+            logger.error(f"❌ Conversation summary failed: {e}")
+            processed = 0
+        await asyncio.sleep(0 if processed else interval)
+
+def drop_session(session_id: str):
+    """Free every piece of in-memory state held for a session"""
+    sessions.pop(session_id, None)
+    session_index.remove(session_id)
+    response_generator.sessions.pop(session_id, None)
+    llm_budget.discard(session_id)
+    conversation_summarizer.discard(session_id)
+    campaign_clusterer.discard(session_id)
+    if reply_speculator:
+        reply_speculator.discard(session_id)
+    if session_snapshots:
+        session_snapshots.mark(session_id)
+
+def recluster_session(session_id: str, session: Dict):
+    """Queue a restored session's scammer messages and identifiers for clustering
+    (clusterer state is neither snapshotted nor archived; it is rebuilt)"""
+    for message in session["messages"]:
+        if message.sender == "scammer":
+            campaign_clusterer.submit(session_id, message.text)
+    campaign_clusterer.submit(session_id, None, session["intelligence"])
+
+def capture_session(session_id: str) -> Optional[tuple]:
+    """Snapshot state of a session: (session, generator state), None once dropped"""
+    session = sessions.get(session_id)
+    if session is None:
+        return None
+    return (session, response_generator.sessions.get(session_id))
+
+def restore_sessions() -> int:
+    """Load the latest snapshot into the session table, generator and indexes"""
+    states = session_snapshots.load()
+    for session_id, (session, generator_state) in sorted(states.items(), key=lambda item: item[1][0]["start_time"]):
+        sessions[session_id] = session
+        session_index.add(session_id, session["start_time"].timestamp())
+        session_index.update(session_id, session["scam_detected"], session["finalized"],
+                             session.get("scam_type", "Unknown"),
+                             sum(len(v) for v in session["intelligence"].values()))
+        if generator_state is not None:
+            response_generator.sessions[session_id] = generator_state
+        conversation_summarizer.submit(session_id, session["messages"])
+        recluster_session(session_id, session)
+    if states:
+        # Restored state is long-lived: keep it out of every future full GC pass
+        gc.freeze()
+        logger.info(f"♻️ Restored {len(states)} sessions in {session_snapshots.restore_ms:.0f}ms")
+    return len(states)
+
+async def restore_archived_session(session_id: str) -> bool:
+    """Bring an archived session back into memory for a late turn
+    
+    Rebuilt from its stored payload, so the conversation continues where it
+    stopped instead of restarting under the same ID; the session is archived
+    again (superseding the old record) once idle. False if not archived.
+    """
+    archived = await asyncio.to_thread(session_archive.load, session_id)
+    if archived is None:
+        return False
+    session = orjson.loads(archived)["session"]
+    messages = MessageHistory()
+    for message in session["messages"]:
+        messages.append(message["sender"], message["text"], message.get("originalText"),
+                        parse_timestamp(message.get("timestamp")))
+    session["messages"] = messages
+    session["start_time"] = datetime.fromisoformat(session["start_time"])
+    # Back to {type: {item: first turn}} (records older than the list form lack the turns field)
+    if "intelligenceTurns" in session:
+        session["intelligence"] = session.pop("intelligenceTurns")
+    
+    sessions[session_id] = session
+    session_index.add(session_id, session["start_time"].timestamp())
+    session_index.update(session_id, session["scam_detected"], session["finalized"],
+                         session.get("scam_type", "Unknown"),
+                         sum(len(v) for v in session["intelligence"].values()))
+    # Generator persona state was not archived: at least never repeat a reply
+    response_generator.remember_replies(session_id, session.get("scam_type", "Unknown"),
+                                        (m.text for m in messages if m.sender == "user"))
+    conversation_summarizer.submit(session_id, messages)
+    recluster_session(session_id, session)
+    metrics.increment_counter("archive.restored")
+    logger.info(f"🗄️ Restored archived session {session_id} ({len(messages)} messages)")
+    return True
+
+async def take_snapshot() -> int:
+    """Write sessions changed since the last snapshot (turns in progress wait for the next)"""
+    return await session_snapshots.snapshot(capture_session, sessions.keys,
+                                            busy=lambda session_id: session_id in session_locks.locks)
+
+async def run_snapshots(interval: float = SNAPSHOT_INTERVAL_SECONDS):
+    """Periodic incremental snapshots of session and generator state"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await take_snapshot()
+        except Exception as e:
+            logger.error(f"❌ Session snapshot failed: {e}")
+
+async def archive_idle_sessions(idle_seconds: float = ARCHIVE_IDLE_SECONDS,
+                                max_batch: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Write one batch of idle finalized sessions to the archive, then drop them
+    
+    Returns:
+        Sessions written
+    """
+    now = time.time()
+    batch = []
+    cursor = None
+    while len(batch) < max_batch:
+        page, cursor = session_index.query(finalized=True, cursor=cursor, limit=max_batch)
+        for sid in page:
+            messages = sessions[sid]["messages"]
+            if sid not in session_locks.locks and now - messages[-1].timestamp >= idle_seconds:
+                batch.append(sid)
+                if len(batch) == max_batch:
+                    break
+        if cursor is None:
+            break
+    if not batch:
+        return 0
+    
+    started = time.perf_counter()
+    lengths = {sid: len(sessions[sid]["messages"]) for sid in batch}
+    records = [(sid, orjson.dumps(session_details(sid))) for sid in batch]
+    await asyncio.to_thread(session_archive.write_batch, records)
+    for sid in batch:
+        # A turn that arrived during the write keeps the session in memory;
+        # it is archived again (superseding this record) once idle
+        session = sessions.get(sid)
+        if session is not None and len(session["messages"]) == lengths[sid] and sid not in session_locks.locks:
+            drop_session(sid)
+    metrics.record_metric("archive_batch_ms", (time.perf_counter() - started) * 1000)
+    metrics.increment_counter("archive.sessions", len(batch))
+    return len(batch)
+
+async def run_session_archiver(interval: float = 5.0):
+    """Move idle finalized sessions to compressed segments, freeing their memory"""
+    while True:
+        try:
+            processed = await archive_idle_sessions()
+        except Exception as e:
+            logger.error(f"❌ Session archiving failed: {e}")
+            processed = 0
+        await asyncio.sleep(0 if processed >= ARCHIVE_BATCH_SIZE else interval)
+
 # API endpoints
 @app.get("/")
 async def root():
@@ -505,22 +827,34 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
     if not x_api_key or x_api_key != API_SECRET_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
-    # Parse request
-    try:
-        body = await request.json()
-    except:
-        body = {}
-    
-    if not body:
-        return APIResponse(status="success", reply="Hello, how can I help you?")
+    # Parse and validate request (orjson + IncomingRequest)
+    body = parse_incoming(await request.body())
+    if body is None:
+        return reply_response(APIResponse(status="success", reply="Hello, how can I help you?"))
     
     # Extract session ID
-    session_id = body.get("sessionId", f"session-{int(datetime.now(timezone.utc).timestamp())}")
+    session_id = body.sessionId or f"session-{int(datetime.now(timezone.utc).timestamp())}"
     
+    # Admission control: per-key/per-session buckets and the in-flight cap
+    decision = admission.admit(x_api_key, session_id)
+    metrics.increment_counter(f"admission.{decision}")
+    if decision == SHED:
+        raise HTTPException(status_code=429, detail="Too many requests", headers={"Retry-After": "1"})
+    try:
+        # Turns of one session run one at a time, in arrival order
+        async with session_locks.hold(session_id) as wait_ms:
+            metrics.record_metric("session_queue_wait_ms", wait_ms)
+            response = await process_message(body, session_id, degraded=decision == DEGRADE)
+    finally:
+        admission.release()
+    return reply_response(response)
+
+async def process_message(body: IncomingRequest, session_id: str, degraded: bool = False) -> APIResponse:
+    """One admitted turn; degraded turns skip every LLM call"""
     # Extract message
-    if "message" in body and isinstance(body["message"], dict):
-        message_text = body["message"].get("text", "")
-        message_sender = body["message"].get("sender", "scammer")
+    if body.message:
+        message_text = body.message.text
+        message_sender = body.message.sender
     else:
         message_text = ""
         message_sender = "scammer"
@@ -528,19 +862,21 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
     if not message_text:
         return APIResponse(status="success", reply="I'm here. What's the issue?")
     
+    # Normalize once: every detector and extractor below sees the clean text
+    original_text = message_text
+    message_text = normalize_message(message_text)
+    
+    # A late turn for an archived session continues it, never starts over
+    if session_id not in sessions and session_archive and session_id in session_archive:
+        await restore_archived_session(session_id)
+    
     # Initialize session with tracking for 99+ protocol
     if session_id not in sessions:
         sessions[session_id] = {
-            "messages": [],
+            "messages": MessageHistory(),
             "scam_detected": False,
-            "intelligence": {
-                "phoneNumbers": [],
-                "upiIds": [],
-                "bankAccounts": [],
-                "phishingLinks": [],
-                "emailAddresses": []
-            },
-            "red_flags": [],
+            "intelligence": new_intelligence_store(),
+            "red_flags": {},  # flag name -> count, first/last turn, patterns
             "finalized": False,
             "start_time": datetime.now(timezone.utc),
             "scam_type": "Unknown",
@@ -548,21 +884,45 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
             "question_count": 0,  # Track questions asked
             "elicitation_attempts": 0  # Track info extraction attempts
         }
+        session_index.add(session_id, sessions[session_id]["start_time"].timestamp())
+        # Caller-supplied earlier turns (e.g. a session begun before a restart)
+        for earlier in body.conversationHistory:
+            if earlier.text:
+                earlier_text = normalize_message(earlier.text)
+                sessions[session_id]["messages"].append(
+                    earlier.sender,
+                    earlier_text,
+                    earlier.text if earlier.text != earlier_text else None,
+                    parse_timestamp(earlier.timestamp)
+                )
     
     session = sessions[session_id]
     
-    # Add message
-    session["messages"].append({
-        "sender": message_sender,
-        "text": message_text,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
+    # Add message (keep the original wording when normalization changed it)
+    session["messages"].append(
+        message_sender,
+        message_text,
+        original_text if original_text != message_text else None
+    )
     
-    message_count = len([m for m in session["messages"] if m["sender"] == "scammer"])
+    message_count = session["messages"].count("scammer")
     logger.info(f"📨 Message {message_count} for {session_id}: {message_text[:80]}...")
+    turn_started = time.perf_counter()
+    
+    # Lowercase, scan keywords and cache regex results once for every stage
+    analysis = MessageAnalysis(message_text)
+    
+    # Known scam script? Reuse its stored analysis and proven replies. Templates
+    # are learned from openings, so only an opening may match one
+    template = (script_registry.match(message_text)
+                if message_sender == "scammer" and message_count == 1 else None)
     
     # Detect scam
-    detection = scam_detector.detect(message_text)
+    if template:
+        detection = template["detection"]
+        logger.info(f"⚡ Known script: {detection['scam_type']}")
+    else:
+        detection = scam_detector.detect(analysis)
     
     # Track cumulative scam signals
     if "scam_signals" not in session:
@@ -582,15 +942,23 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
     # FORCE scam detection if ANY intelligence extracted or red flags found
     if not session["scam_detected"]:
         total_intel = sum(len(v) for v in session["intelligence"].values())
-        if total_intel > 0 or len(session.get("red_flags", [])) > 0:
+        if total_intel > 0 or session.get("red_flags"):
             session["scam_detected"] = True
             session["scam_confidence"] = max(session.get("scam_confidence", 0.6), 0.6)
             logger.info(f"✅ Scam detected via intelligence/red flags")
     
     # Detect red flags
-    red_flag_result = red_flag_detector.detect_red_flags(message_text, session["messages"])
+    if template:
+        red_flag_result = template["red_flags"]
+    else:
+        red_flag_result = red_flag_detector.detect_red_flags(analysis, session["messages"])
+    
+    # Keep the opening's analysis so a finalized session can teach the registry
+    if message_count == 1 and message_sender == "scammer":
+        session["opening"] = {"text": message_text, "detection": detection, "red_flags": red_flag_result}
+    
     if red_flag_result["red_flags"]:
-        session["red_flags"].extend(red_flag_result["red_flags"])
+        merge_red_flags(session["red_flags"], red_flag_result["red_flags"], message_count)
         logger.info(f"🚩 Red Flags: {red_flag_result['total_flags']} detected | Risk: {red_flag_result['risk_level']}")
         for flag in red_flag_result["red_flags"][:3]:  # Log top 3
             logger.info(f"   - {flag['flag']}: {flag['description']}")
@@ -598,45 +966,87 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
         logger.info(f"✅ Scam: {detection['scam_type']} ({session['scam_confidence']:.2%})")
     
     # Extract intelligence using ENHANCED extractor
-    message_history = [m["text"] for m in session["messages"]]
-    new_intel = intelligence_extractor.extract(message_text, message_history)
-    for key in new_intel:
-        existing = set(session["intelligence"].get(key, []))
-        new_items = set(new_intel[key])
-        session["intelligence"][key] = list(existing.union(new_items))
-    
-    # Log intelligence
-    if new_intel["phoneNumbers"]:
-        logger.info(f"   📱 Phone: {new_intel['phoneNumbers']}")
-    if new_intel["upiIds"]:
-        logger.info(f"   💳 UPI: {new_intel['upiIds']}")
-    if new_intel["bankAccounts"]:
-        logger.info(f"   🏦 Bank Account: {new_intel['bankAccounts']}")
-    if new_intel["phishingLinks"]:
-        logger.info(f"   🔗 Link: {new_intel['phishingLinks']}")
-    if new_intel["emailAddresses"]:
-        logger.info(f"   📧 Email: {new_intel['emailAddresses']}")
+    message_history = session["messages"].texts(last=5)  # The extractor only rereads the last 5
+    new_intel = intelligence_extractor.extract(analysis, message_history, normalized=True)
+    added_intel = merge_intelligence(session["intelligence"], new_intel, message_count)
+    # Only this message's own identifiers: history re-extraction would re-journal
+    # earlier ones and bump their last_seen every turn
+    intel_index.add(session_id, analysis.candidates)
+    
+    # Score new links against the domain reputation index
+    if added_intel.get("phishingLinks"):
+        link_reports = [domain_reputation.score(url) for url in added_intel["phishingLinks"]]
+        session.setdefault("link_reputation", {}).update((r["url"], r) for r in link_reports)
+        link_flags = red_flag_detector.detect_link_flags(link_reports)
+        if link_flags:
+            merge_red_flags(session["red_flags"], link_flags, message_count)
+            logger.info(f"🚩 Link Flags: {', '.join(f['flag'] for f in link_flags)}")
+    
+    # Queue campaign clustering (script similarity + shared identifiers)
+    if message_sender == "scammer" or added_intel:
+        campaign_clusterer.submit(
+            session_id,
+            message_text if message_sender == "scammer" else None,
+            added_intel or None
+        )
+    
+    # Log newly seen intelligence
+    if added_intel.get("phoneNumbers"):
+        logger.info(f"   📱 Phone: {added_intel['phoneNumbers']}")
+    if added_intel.get("upiIds"):
+        logger.info(f"   💳 UPI: {added_intel['upiIds']}")
+    if added_intel.get("bankAccounts"):
+        logger.info(f"   🏦 Bank Account: {added_intel['bankAccounts']}")
+    if added_intel.get("phishingLinks"):
+        logger.info(f"   🔗 Link: {added_intel['phishingLinks']}")
+    if added_intel.get("emailAddresses"):
+        logger.info(f"   📧 Email: {added_intel['emailAddresses']}")
     
     # Log cumulative intelligence
     total_intel = sum(len(v) for v in session["intelligence"].values())
     if total_intel > 0:
         logger.info(f"   📊 Total Intelligence: {total_intel} items extracted")
     
-    # Generate response using ENHANCED generator
-    response_text = response_generator.generate(
-        session_id,
-        message_text,
-        message_count,
-        session["intelligence"],
-        session["messages"],
-        session.get("scam_type", "Unknown")
+    # Generate response using ENHANCED generator (precomputed variant on the fast path)
+    response_text = None
+    fast_path = False
+    if template:
+        response_text = response_generator.use_precomputed(
+            session_id,
+            analysis,
+            message_count,
+            session["intelligence"],
+            template["replies"],
+            session.get("scam_type", "Unknown")
+        )
+        fast_path = response_text is not None
+    if response_text is None:
+        generate_args = (
+            session_id,
+            analysis,
+            message_count,
+            session["intelligence"],
+            session["messages"],
+            session.get("scam_type", "Unknown"),
+            conversation_summarizer.render(session_id)
+        )
+        if response_generator.groq_client and not degraded:
+            # Blocking LLM call: keep the event loop free for other sessions
+            response_text = await asyncio.to_thread(response_generator.generate, *generate_args)
+        else:
+            response_text = response_generator.generate(*generate_args, allow_llm=False)
+    if message_count == 1 and "opening" in session:
+        session["opening"].setdefault("reply", response_text)
+    
+    metrics.record_metric(
+        "turn_ms.fast_path" if fast_path else "turn_ms.full_path",
+        (time.perf_counter() - turn_started) * 1000
     )
     
-    session["messages"].append({
-        "sender": "user",
-        "text": response_text,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
+    session["messages"].append("user", response_text)
+    
+    # Older turns leave the prompt window; summarize them in the background
+    conversation_summarizer.submit(session_id, session["messages"])
     
     # Track conversation quality metrics (99+ protocol)
     if "?" in response_text:
@@ -656,25 +1066,93 @@ async def handle_message(request: Request, x_api_key: Optional[str] = Header(Non
         session["finalized"] = True
         final_output = build_final_output(session_id, session)
         asyncio.create_task(send_to_guvi(final_output))
+        intel_index.flush()
+        opening = session.get("opening")
+        if opening and session["scam_detected"]:
+            script_registry.learn(opening["text"], opening["detection"],
+                                  opening["red_flags"], opening.get("reply"))
+        if reply_speculator:
+            reply_speculator.discard(session_id)
+    
+    # Keep the /api/sessions filters current
+    session_index.update(session_id, session["scam_detected"], session["finalized"],
+                         session.get("scam_type", "Unknown"), total_intel)
+    if session_snapshots:
+        session_snapshots.mark(session_id)
+    
+    # Speculatively prepare the next reply while the scammer types
+    if reply_speculator and not session["finalized"] and not degraded:
+        job = response_generator.plan_speculation(
+            session_id,
+            message_count,
+            session["intelligence"],
+            session["messages"],
+            session.get("scam_type", "Unknown"),
+            conversation_summarizer.render(session_id)
+        )
+        if job:
+            asyncio.create_task(asyncio.to_thread(response_generator.run_speculation, job))
     
     return APIResponse(status="success", reply=response_text)
 
 @app.get("/api/sessions")
-async def list_sessions(x_api_key: Optional[str] = Header(None)):
+async def list_sessions(
+    x_api_key: Optional[str] = Header(None),
+    scam_detected: Optional[bool] = None,
+    finalized: Optional[bool] = None,
+    scam_type: Optional[str] = None,
+    started_after: Optional[str] = None,
+    started_before: Optional[str] = None,
+    min_intel: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """One page of sessions in creation order; pass next_cursor back for the next page
+    
+    started_after / started_before take ISO-8601 or epoch seconds.
+    """
     if not x_api_key or x_api_key != API_SECRET_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
-    return {
+    bounds = {}
+    for name, value in (("started_after", started_after), ("started_before", started_before)):
+        if value is not None:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+            bounds[name] = parse_timestamp(value)
+            if bounds[name] is None:
+                raise HTTPException(status_code=400, detail=f"Invalid {name}")
+    
+    try:
+        page, next_cursor = session_index.query(
+            scam_detected=scam_detected,
+            finalized=finalized,
+            scam_type=scam_type,
+            min_intel=min_intel,
+            cursor=cursor,
+            limit=limit,
+            **bounds
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    return ORJSONResponse({
         "total_sessions": len(sessions),
+        "archived_sessions": len(session_archive) if session_archive else 0,
+        "summary": session_index.summary(),
         "sessions": {
             sid: {
-                "messages": len(s["messages"]),
-                "scam_detected": s["scam_detected"],
-                "finalized": s["finalized"]
+                "messages": len(sessions[sid]["messages"]),
+                "scam_detected": sessions[sid]["scam_detected"],
+                "finalized": sessions[sid]["finalized"],
+                "scam_type": sessions[sid].get("scam_type", "Unknown")
             }
-            for sid, s in sessions.items()
-        }
-    }
+            for sid in page
+        },
+        "next_cursor": next_cursor
+    })
 
 @app.get("/api/session/{session_id}")
 async def get_session(session_id: str, x_api_key: Optional[str] = Header(None)):
@@ -683,16 +1161,85 @@ async def get_session(session_id: str, x_api_key: Optional[str] = Header(None)):
         raise HTTPException(status_code=401, detail="Invalid API key")
     
     if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+        # Archived sessions are served from their stored payload, byte for byte
+        archived = await asyncio.to_thread(session_archive.load, session_id) if session_archive else None
+        if archived is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return Response(content=archived, media_type="application/json")
     
+    # Plain JSON types (datetimes included): orjson encodes it as-is
+    return ORJSONResponse(session_details(session_id))
+
+def session_details(session_id: str) -> Dict:
+    """Payload of GET /api/session/{session_id}"""
     session = sessions[session_id]
-    final_output = build_final_output(session_id, session)
+    intelligence = session["intelligence"]
+    return {
+        "session": {
+            **session,
+            "messages": session["messages"].to_list(),
+            # Lists in first-seen order; the turn each item appeared in goes alongside
+            "intelligence": {kind: list(items) for kind, items in intelligence.items()},
+            "intelligenceTurns": intelligence
+        },
+        "redFlagTimeline": red_flag_timeline(session.get("red_flags", {})),
+        "conversationSummary": conversation_summarizer.get(session_id),
+        "finalOutput": build_final_output(session_id, session)
+    }
+
+@app.get("/api/intel/{identifier:path}")
+async def lookup_identifier(identifier: str, x_api_key: Optional[str] = Header(None)):
+    """Find every session where a phone, UPI ID, account, link or email appeared"""
+    if not x_api_key or x_api_key != API_SECRET_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    
+    entry = intel_index.lookup(identifier)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Identifier not found")
+    
+    def iso(ts: float) -> str:
+        return datetime.fromtimestamp(ts, timezone.utc).isoformat()
     
     return {
-        "session": session,
-        "finalOutput": final_output
+        "identifier": entry["identifier"],
+        "type": entry["type"],
+        "firstSeen": iso(entry["first_seen"]),
+        "lastSeen": iso(entry["last_seen"]),
+        "sessionCount": len(entry["sessions"]),
+        "sessions": [
+            {"sessionId": sid, "firstSeen": iso(first), "lastSeen": iso(last)}
+            for sid, (first, last) in entry["sessions"].items()
+        ]
     }
 
+@app.get("/api/metrics")
+async def get_performance_metrics(x_api_key: Optional[str] = Header(None)):
+    """Known-script hit rate, estimated latency saved, summary backlog and raw timings"""
+    if not x_api_key or x_api_key != API_SECRET_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    
+    all_metrics = metrics.get_all_metrics()
+    known_scripts = script_registry.stats()
+    fast = all_metrics["metrics"].get("turn_ms.fast_path", {})
+    full = all_metrics["metrics"].get("turn_ms.full_path", {})
+    if fast and full:
+        saved_per_hit = max(full["mean"] - fast["mean"], 0.0)
+        known_scripts["savedMsPerHit"] = round(saved_per_hit, 3)
+        known_scripts["estimatedSavedMs"] = round(saved_per_hit * known_scripts["hits"], 1)
+    
+    return ORJSONResponse({
+        "knownScripts": known_scripts,
+        "conversationSummaries": conversation_summarizer.stats(),
+        "speculation": reply_speculator.stats() if reply_speculator else {"enabled": False},
+        "replyCandidates": response_generator.ranker.stats(),
+        "llmBudget": llm_budget.stats(),
+        "admission": admission.stats(),
+        "sessionLocks": session_locks.stats(),
+        "archive": session_archive.stats() if session_archive else {"enabled": False},
+        "snapshots": session_snapshots.stats() if session_snapshots else {"enabled": False},
+        **all_metrics
+    })
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
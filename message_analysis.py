@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Shared Per-Message Analysis
+===========================
+
+Every pipeline stage used to lowercase the message and run its own
+substring scans. A MessageAnalysis is built once per message in
+handle_message and handed to every stage instead.
+
+Holds:
+- text / lower: normalized text and its lowercase form
+- tokens: one tokenizer pass over the lowercase text
+- hits: every registered keyword or phrase found in the text
+- spans: phones/accounts/cards/reference IDs from one numeric scan
+- regex match results, cached per compiled pattern
+- candidates: the extractor's per-message intelligence, once computed
+
+Keyword matching is token-aware: "now" no longer fires on "know", "pin"
+on "spinning", "rs" on "yours" or "pan" on "company". Simple inflections
+still match ("accounts", "payment", "winner", "verified"), and multi-word
+phrases ("work from home", "legal action") must appear as consecutive
+tokens.
+
+Stages register the keywords they care about with `register_terms` when
+they are constructed.
+
+Author: Team YUKT
+License: MIT
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+from numeric_spans import NumericSpan, scan_numeric_spans
+
+# Letters and digits split apart: "Rs.500" and "rs500" both give "rs", "500"
+_TOKEN_PATTERN = re.compile(r'[a-z]+|\d+')
+
+# (suffix, replacement) pairs tried when reducing a token to base forms
+_SUFFIXES = (
+    ("ments", ""), ("ment", ""), ("ings", ""), ("ing", ""), ("ers", ""), ("er", ""),
+    ("ies", "y"), ("ied", "y"), ("es", ""), ("ed", ""), ("s", ""), ("d", ""),
+)
+_E_DROPPING = {"ing", "ings", "ed", "er", "ers"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word and number tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@lru_cache(maxsize=16384)
+def word_forms(token: str) -> Tuple[str, ...]:
+    """A token plus the base forms it may be an inflection of
+
+    winners -> winner, winn, win; verified -> verify; updating -> update
+    """
+    forms = [token]
+    if not token.isalpha():
+        return (token,)
+    for suffix, replacement in _SUFFIXES:
+        if not token.endswith(suffix) or len(token) - len(suffix) < 2:
+            continue
+        stem = token[:-len(suffix)] + replacement
+        forms.append(stem)
+        if suffix in _E_DROPPING:
+            forms.append(stem + "e")
+            # Doubled final consonant: winning -> win, transferred -> transfer
+            if len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in "aeiouls":
+                forms.append(stem[:-1])
+    return tuple(dict.fromkeys(forms))
+
+
+class PhraseMatcher:
+    """Finds registered keywords and multi-word phrases in a token list
+
+    One dictionary lookup per token (cached per distinct token); phrases
+    are only checked where their first word occurs.
+    """
+
+    def __init__(self, cache_size: int = 65536):
+        self.terms: Dict[str, None] = {}  # Ordered set of registered terms
+        self._words: Dict[str, List[str]] = {}  # base form -> single-word terms
+        self._phrases: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}  # first word -> (term, rest)
+        self._token_cache: Dict[str, Tuple] = {}
+        self._cache_size = cache_size
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.terms
+
+    def add(self, term: str):
+        """Register a keyword or phrase (matched case-insensitively)"""
+        term = term.lower()
+        if term in self.terms:
+            return
+        words = tuple(tokenize(term))
+        if not words:
+            return
+        self.terms[term] = None
+        if len(words) == 1:
+            self._words.setdefault(words[0], []).append(term)
+        else:
+            self._phrases.setdefault(words[0], []).append((term, words[1:]))
+        self._token_cache.clear()
+
+    def _entries(self, token: str) -> Tuple:
+        """(single-word terms, phrase candidates) a token can start"""
+        entry = self._token_cache.get(token)
+        if entry is None:
+            terms = []
+            phrases = []
+            for form in word_forms(token):
+                terms.extend(self._words.get(form, ()))
+                phrases.extend(self._phrases.get(form, ()))
+            entry = (tuple(terms), tuple(phrases)) if terms or phrases else ()
+            if len(self._token_cache) >= self._cache_size:
+                self._token_cache.clear()
+            self._token_cache[token] = entry
+        return entry
+
+    def match(self, tokens: List[str]) -> Set[str]:
+        """Registered terms occurring in the token list"""
+        hits: Set[str] = set()
+        entries = self._entries
+        count = len(tokens)
+        for i, token in enumerate(tokens):
+            entry = entries(token)
+            if not entry:
+                continue
+            terms, phrases = entry
+            hits.update(terms)
+            for term, rest in phrases:
+                if i + len(rest) < count and all(
+                        word in word_forms(tokens[i + 1 + k]) for k, word in enumerate(rest)):
+                    hits.add(term)
+        return hits
+
+
+# Every keyword any stage looks for; matched once per message
+_MATCHER = PhraseMatcher()
+
+
+def register_terms(terms: Iterable[str]):
+    """Add keywords/phrases to the shared per-message match"""
+    for term in terms:
+        _MATCHER.add(term)
+
+
+def contains_phrase(tokens: List[str], phrase: str) -> bool:
+    """Token-aware test for a single (unregistered) keyword or phrase"""
+    words = tokenize(phrase)
+    if not words:
+        return False
+    last = len(tokens) - len(words)
+    return any(
+        all(word in word_forms(tokens[i + k]) for k, word in enumerate(words))
+        for i in range(last + 1)
+    )
+
+
+class MessageAnalysis:
+    """Lowercased text, tokens, keyword hits and regex results of one message"""
+
+    __slots__ = ("text", "lower", "_tokens", "_hits", "_spans", "_matches", "candidates")
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: Message text, already passed through normalize_message
+        """
+        self.text = text
+        self.lower = text.lower()
+        self._tokens: Optional[List[str]] = None
+        self._hits: Optional[Set[str]] = None
+        self._spans: Optional[List[NumericSpan]] = None
+        self._matches: Dict[Pattern, List[re.Match]] = {}
+        self.candidates: Optional[Dict[str, List[str]]] = None
+
+    def __repr__(self) -> str:
+        return f"MessageAnalysis({self.text[:40]!r})"
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = _TOKEN_PATTERN.findall(self.lower)
+        return self._tokens
+
+    @property
+    def hits(self) -> Set[str]:
+        """Registered keywords/phrases in the message (token-aware)"""
+        if self._hits is None:
+            self._hits = _MATCHER.match(self.tokens)
+        return self._hits
+
+    @property
+    def spans(self) -> List[NumericSpan]:
+        """Classified numeric spans (phone/account/card/reference/ifsc)"""
+        if self._spans is None:
+            self._spans = scan_numeric_spans(self.text)
+        return self._spans
+
+    def has_span(self, kind: str) -> bool:
+        """True if the message contains a span of this kind"""
+        return any(span.kind == kind for span in self.spans)
+
+    def has(self, term: str) -> bool:
+        """Token-aware test for one keyword or phrase"""
+        if term in _MATCHER:
+            return term in self.hits
+        return contains_phrase(self.tokens, term)
+
+    def has_any(self, terms: Iterable[str]) -> bool:
+        """True if any keyword occurs in the message"""
+        return any(self.has(term) for term in terms)
+
+    def finditer(self, pattern: Pattern) -> List[re.Match]:
+        """All matches of a compiled pattern on the normalized text (cached)"""
+        matches = self._matches.get(pattern)
+        if matches is None:
+            matches = self._matches[pattern] = list(pattern.finditer(self.text))
+        return matches
+
+    def search(self, pattern: Pattern) -> Optional[re.Match]:
+        """First match of a compiled pattern (shares the finditer cache)"""
+        matches = self.finditer(pattern)
+        return matches[0] if matches else None
+
+
+def as_analysis(message: Union[str, MessageAnalysis]) -> MessageAnalysis:
+    """Accept either a plain string or a prebuilt analysis"""
+    if isinstance(message, MessageAnalysis):
+        return message
+    return MessageAnalysis(message or "")
+
+
+@lru_cache(maxsize=4096)
+def analyze_text(text: str) -> MessageAnalysis:
+    """Cached analysis for texts that are re-read every turn (history)"""
+    return MessageAnalysis(text)
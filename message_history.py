@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Compact Message History
+=======================
+
+A session used to store every turn as a dict with an ISO timestamp string,
+so each turn recounted scammer messages with a list comprehension over the
+whole history, and every final-output build parsed the first and last
+timestamps back out of their strings.
+
+MessageHistory keeps one slotted Message per turn and maintains running
+totals as messages are appended.
+
+Features:
+- Slotted messages: no per-message dict; sender strings are interned so
+  all messages share one object per sender
+- Float epoch timestamps; ISO strings are only produced for JSON output
+  (and only parsed once, for caller-supplied history)
+- O(1) count per sender and engagement duration
+- Read-compatible with the old dicts: message["text"], message.get("sender"),
+  len(), indexing and slicing keep working for detectors and the generator
+
+Author: Team YUKT
+License: MIT
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Union
+
+# Senders seen on every session share these exact objects
+_SENDERS = {"scammer": "scammer", "user": "user"}
+_MAX_INTERNED_SENDER = 32
+
+
+def _intern_sender(sender: str) -> str:
+    known = _SENDERS.get(sender)
+    if known is not None:
+        return known
+    return sys.intern(sender) if len(sender) <= _MAX_INTERNED_SENDER else sender
+
+
+def parse_timestamp(value: Union[str, int, float, None]) -> Optional[float]:
+    """Epoch seconds from an ISO-8601 string or epoch seconds/milliseconds; None if unusable"""
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iso_timestamp(epoch: float) -> str:
+    """UTC ISO-8601 string for an epoch timestamp"""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+class Message:
+    """One turn: sender, normalized text, epoch timestamp, original wording if it differed"""
+
+    __slots__ = ("sender", "text", "timestamp", "original_text")
+
+    def __init__(self, sender: str, text: str, timestamp: float,
+                 original_text: Optional[str] = None):
+        self.sender = sender
+        self.text = text
+        self.timestamp = timestamp
+        self.original_text = original_text
+
+    def __getitem__(self, key: str):
+        """Dict-style read access with the API field names"""
+        if key == "sender":
+            return self.sender
+        if key == "text":
+            return self.text
+        if key == "timestamp":
+            return iso_timestamp(self.timestamp)
+        if key == "originalText" and self.original_text is not None:
+            return self.original_text
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """JSON form, as the messages were stored before"""
+        entry = {"sender": self.sender, "text": self.text, "timestamp": iso_timestamp(self.timestamp)}
+        if self.original_text is not None:
+            entry["originalText"] = self.original_text
+        return entry
+
+
+class MessageHistory:
+    """Append-only list of Messages with running per-sender counts"""
+
+    __slots__ = ("_messages", "_counts")
+
+    def __init__(self):
+        self._messages: List[Message] = []
+        self._counts: Dict[str, int] = {}
+
+    def append(self, sender: str, text: str, original_text: Optional[str] = None,
+               timestamp: Optional[float] = None) -> Message:
+        """Add a turn (timestamp defaults to now)"""
+        sender = _intern_sender(sender)
+        message = Message(sender, text, time.time() if timestamp is None else timestamp,
+                          original_text)
+        self._messages.append(message)
+        self._counts[sender] = self._counts.get(sender, 0) + 1
+        return message
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages)
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self._messages[index]
+
+    def count(self, sender: str) -> int:
+        """Messages sent by `sender` so far"""
+        return self._counts.get(sender, 0)
+
+    def duration_seconds(self) -> int:
+        """Seconds between the first and the latest message"""
+        if len(self._messages) < 2:
+            return 0
+        return int(self._messages[-1].timestamp - self._messages[0].timestamp)
+
+    def texts(self, last: Optional[int] = None) -> List[str]:
+        """Message texts, optionally only the most recent `last`"""
+        if last is None:
+            messages = self._messages
+        else:
+            messages = self._messages[-last:] if last > 0 else []
+        return [message.text for message in messages]
+
+    def __getstate__(self) -> List[tuple]:
+        """Pickle as plain row tuples (snapshots); counts are rebuilt on load"""
+        return [(m.sender, m.text, m.timestamp, m.original_text) for m in self._messages]
+
+    def __setstate__(self, rows: List[tuple]):
+        self._messages = []
+        self._counts = {}
+        for sender, text, timestamp, original_text in rows:
+            self.append(sender, text, original_text, timestamp)
+
+    def to_list(self) -> List[Dict]:
+        """JSON form of every message"""
+        return [message.to_dict() for message in self._messages]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Numeric Span Scanner
+====================
+
+Phones, bank accounts, card numbers and reference IDs are all digit runs,
+and used to be found by separate regex sets with their own exclusions, so
+one 10-digit number could be a phone to one extractor and an account to
+another. scan_numeric_spans() walks the message once and gives every digit
+or alphanumeric span exactly one type.
+
+Classification:
+- Grouped shapes are joined first: "98765 43210", "(98765) 43210" (mobile
+  prefix only), "+91-98765-43210", "1234 5678 9012 3456"
+- Context words right before the span win: "A/C", "account no" -> account;
+  "card" -> card; "emp id", "ref", "case no", "txn" -> reference
+- An IFSC code marks the closest uncued 9-18 digit number as an account;
+  mobile-shaped numbers are skipped (a phone given next to bank details
+  stays a phone)
+- 13-19 digits passing the Luhn check -> card
+- 10 digits with a mobile prefix (6-9), or any +91 number -> phone
+- Other 9-18 digit runs -> account
+- Letter+digit codes (EMP001, SBIN0001234) -> reference or ifsc
+
+Author: Team YUKT
+License: MIT
+"""
+
+import re
+from typing import List, NamedTuple
+
+_DIGITS_PATTERN = re.compile(r'\d+')
+_ALNUM_PATTERN = re.compile(r'[A-Za-z0-9]*')
+_IFSC_PATTERN = re.compile(r'[A-Z]{4}0[A-Z0-9]{6}')
+
+# Word right before a span (optionally followed by "id"/"no"/"number")
+_ID_WORDS = {"case", "reference", "ref", "order", "ticket", "complaint", "employee", "emp",
+             "staff", "transaction", "txn", "req", "request"}
+_ACCOUNT_WORDS = {"a/c", "ac", "acc", "acct", "account"}
+_NUMBER_WORDS = {"id", "no", "num", "number", "#"}
+_CONTEXT_CHARS = 24
+_CONTEXT_STRIP = " \t:#-.("
+_IFSC_DISTANCE = 40
+
+# Separators allowed inside one grouped number
+_GROUP_SEPARATORS = {" ", "-", ") ", ")-", ")"}
+
+
+class NumericSpan(NamedTuple):
+    """One classified span: kind is phone/account/card/reference/ifsc"""
+    kind: str
+    value: str      # Digits only (phones: 10-digit national number); codes upper-cased
+    start: int
+    end: int
+
+
+def luhn_valid(digits: str) -> bool:
+    """Luhn checksum used by payment card numbers"""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def _context_kind(lower: str, start: int) -> str:
+    """'reference', 'account', 'card' or '' from the words before a span"""
+    words = lower[max(start - _CONTEXT_CHARS, 0):start].rstrip(_CONTEXT_STRIP).rsplit(None, 2)
+    if not words:
+        return ""
+    word = words[-1]
+    if word in _NUMBER_WORDS and len(words) > 1:
+        word = words[-2].rstrip(_CONTEXT_STRIP)
+    if word in _ID_WORDS:
+        return "reference"
+    if word in _ACCOUNT_WORDS:
+        return "account"
+    if word == "card":
+        return "card"
+    return ""
+
+
+def _is_mobile(digits: str) -> bool:
+    """10-digit Indian mobile number shape (6-9 prefix)"""
+    return len(digits) == 10 and digits[0] in "6789"
+
+
+def _classify_digits(digits: str, has_country_code: bool, grouped: bool,
+                     context: str, ifsc_near: bool) -> str:
+    """Type of a digit span, or '' if it is just a number (amount, year, ...)
+
+    ifsc_near: this is the uncued, non-mobile 9-18 digit number closest to
+    an IFSC code
+    """
+    length = len(digits)
+    if context == "reference":
+        return "reference" if length >= 4 else ""
+    if has_country_code:
+        return "phone" if length == 10 and digits[0] != "0" else ""
+    if context == "account":
+        return "account" if 9 <= length <= 18 else ""
+    if ifsc_near:
+        return "account"
+    if 13 <= length <= 19:
+        if context == "card":
+            return "card"
+        if (grouped or digits[0] in "3456") and luhn_valid(digits):
+            return "card"
+    if _is_mobile(digits):
+        return "phone"
+    if 9 <= length <= 18:
+        return "account"
+    return ""
+
+
+def _grouped_count(lengths: List[int], first_digit: str) -> int:
+    """How many separated digit groups form one number: 5+5 with a mobile
+    prefix (phone), 4+4+4+4[+3] (card/account); otherwise just the first group"""
+    if lengths[:2] == [5, 5]:
+        return 2 if first_digit in "6789" else 1
+    if len(lengths) >= 4 and lengths[:4] == [4, 4, 4, 4]:
+        return 5 if len(lengths) >= 5 and lengths[4] <= 3 else 4
+    return 1
+
+
+def scan_numeric_spans(text: str) -> List[NumericSpan]:
+    """Classify every digit run and letter+digit code in one pass"""
+    spans: List[NumericSpan] = []
+    if not text:
+        return spans
+    runs = [match.span() for match in _DIGITS_PATTERN.finditer(text)]
+    if not runs:
+        return spans
+
+    # Letter+digit codes absorb their digit runs; plain runs stay for grouping
+    numbers = []
+    ifsc_positions = []
+    size = len(text)
+    code_end = -1
+    for start, end in runs:
+        if start < code_end:
+            continue
+        if start and text[start - 1].isascii() and text[start - 1].isalpha():
+            code_start = start
+            while code_start and text[code_start - 1].isascii() and text[code_start - 1].isalnum():
+                code_start -= 1
+            code_end = _ALNUM_PATTERN.match(text, end).end()
+            code = text[code_start:code_end]
+            # Needs a 2+ letter prefix and 3+ digits; skip emails, UPI IDs, URLs
+            if (not code[:2].isalpha() or sum(ch.isdigit() for ch in code) < 3
+                    or (code_start and text[code_start - 1] in "@./_")
+                    or (code_end < size and text[code_end] in "@/_")):
+                continue
+            if _IFSC_PATTERN.fullmatch(code):
+                ifsc_positions.append((code_start, code_end))
+                spans.append(NumericSpan("ifsc", code, code_start, code_end))
+            else:
+                spans.append(NumericSpan("reference", code.upper(), code_start, code_end))
+            continue
+        numbers.append((start, end))
+
+    lower = text.lower()
+    count = len(numbers)
+    candidates = []  # (digits, start, end, has_country_code, grouped, context)
+    i = 0
+    while i < count:
+        start, end = numbers[i]
+        digits = text[start:end]
+
+        # Country code: "+919876543210" or "+91" as its own group
+        has_country_code = start > 0 and text[start - 1] == "+" and digits.startswith("91")
+        if has_country_code:
+            start -= 1
+            if digits == "91" and i + 1 < count and text[end:numbers[i + 1][0]] in ("", " ", "-"):
+                i += 1
+                end = numbers[i][1]
+                digits = text[numbers[i][0]:end]
+            else:
+                digits = digits[2:]
+        elif start > 0 and text[start - 1] == "(":
+            start -= 1
+
+        # Join separated groups that form a recognised shape
+        taken = 1
+        if not has_country_code or len(digits) == 5:
+            j = i + 1
+            while j < count and j - i < 5 and text[numbers[j - 1][1]:numbers[j][0]] in _GROUP_SEPARATORS:
+                j += 1
+            if j > i + 1:
+                taken = _grouped_count([e - s for s, e in numbers[i:j]], digits[0])
+                if taken > 1:
+                    end = numbers[i + taken - 1][1]
+                    digits = "".join(text[s:e] for s, e in numbers[i:i + taken])
+        i += taken
+        candidates.append((digits, start, end, has_country_code, taken > 1,
+                           _context_kind(lower, start)))
+
+    # Each IFSC code vouches for the one uncued, non-mobile number closest to it
+    next_to_ifsc = set()
+    for position, code_end in ifsc_positions:
+        gaps = [(max(start - code_end, position - end), index)
+                for index, (digits, start, end, has_country_code, _, context) in enumerate(candidates)
+                if 9 <= len(digits) <= 18 and not _is_mobile(digits)
+                and not has_country_code and not context]
+        gaps = [gap for gap in gaps if gap[0] <= _IFSC_DISTANCE]
+        if gaps:
+            next_to_ifsc.add(min(gaps)[1])
+
+    for index, (digits, start, end, has_country_code, grouped, context) in enumerate(candidates):
+        kind = _classify_digits(digits, has_country_code, grouped, context,
+                                index in next_to_ifsc)
+        if kind:
+            spans.append(NumericSpan(kind, digits, start, end))
+    spans.sort(key=lambda span: span.start)
+    return spans
@@ -9,6 +9,7 @@ Features:
 - 10 red flag categories (urgency, threats, credentials, money, etc.)
 - Severity levels: CRITICAL, HIGH, MEDIUM, LOW
 - Conversation pattern analysis
+- Token-aware pattern matching ("now" does not fire on "know")
 - Risk scoring (0-1 scale)
 - Detects escalating pressure, persistent harvesting, inconsistent narratives
 
@@ -23,14 +24,22 @@ Categories:
 - Information harvesting (MEDIUM)
 - No verification offered (HIGH)
 - Grammar/spelling errors (LOW)
+- Blocklisted / lookalike / shortened link domains (from the domain reputation index)
 
 Author: Team YUKT
 License: MIT
 """
 
-from typing import Dict, List
+from typing import Dict, List, Union
 import re
 
+from message_analysis import MessageAnalysis, analyze_text, as_analysis, register_terms
+
+# Words checked across the whole conversation
+URGENCY_WORDS = ["urgent", "immediately", "now", "asap", "hurry"]
+CREDENTIAL_WORDS = ["otp", "password", "pin", "cvv", "account"]
+TOPIC_WORDS = ["bank", "upi", "account", "kyc", "prize", "lottery", "job", "tax"]
+
 class RedFlagDetector:
     """Detects red flags in scam conversations"""
     
@@ -85,14 +94,52 @@ class RedFlagDetector:
                 "patterns": [],  # Detected through analysis
                 "severity": "LOW",
                 "description": "Poor grammar or spelling typical of scam messages"
+            },
+            "blocklisted_domain": {
+                "patterns": [],  # Detected through domain reputation
+                "severity": "CRITICAL",
+                "description": "Links to a known phishing domain"
+            },
+            "lookalike_domain": {
+                "patterns": [],  # Detected through domain reputation
+                "severity": "CRITICAL",
+                "description": "Links to a domain imitating a bank or payment brand"
+            },
+            "shortened_link": {
+                "patterns": [],  # Detected through domain reputation
+                "severity": "HIGH",
+                "description": "Hides the real destination behind a URL shortener"
+            },
+            "suspicious_domain": {
+                "patterns": [],  # Detected through domain reputation
+                "severity": "HIGH",
+                "description": "Links to a raw IP address or a high-risk domain"
             }
         }
+        
+        # Domain reputation category -> red flag
+        self.link_flags = {
+            "blocklisted": "blocklisted_domain",
+            "lookalike": "lookalike_domain",
+            "shortener": "shortened_link",
+            "suspicious": "suspicious_domain"
+        }
+        
+        # Pattern -> [(flag order, pattern order, flag)] so a message only
+        # touches the flags of the keywords it actually contains
+        self._pattern_flags = {}
+        for flag_index, (flag_name, flag_data) in enumerate(self.red_flags.items()):
+            for pattern_index, pattern in enumerate(flag_data["patterns"]):
+                self._pattern_flags.setdefault(pattern, []).append((flag_index, pattern_index, flag_name))
+        register_terms(self._pattern_flags)
+        register_terms(URGENCY_WORDS + CREDENTIAL_WORDS + TOPIC_WORDS)
     
-    def detect_red_flags(self, message: str, conversation_history: List[Dict] = None) -> Dict:
+    def detect_red_flags(self, message: Union[str, MessageAnalysis],
+                         conversation_history: List[Dict] = None) -> Dict:
         """Detect all red flags in a message
         
         Args:
-            message: The message text to analyze
+            message: The message text (or its MessageAnalysis) to analyze
             conversation_history: Optional list of previous messages
             
         Returns:
@@ -100,17 +147,22 @@ class RedFlagDetector:
         """
         
         try:
-            msg_lower = message.lower()
+            # Token-aware keyword/phrase hits, shared with the scam detector
+            hits = as_analysis(message).hits
             detected_flags = []
             severity_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
             
-            # Check each red flag category
-            for flag_name, flag_data in self.red_flags.items():
-                patterns = flag_data["patterns"]
-                
-                # Check if any pattern matches
-                matches = [p for p in patterns if p in msg_lower]
-                
+            # Flags whose patterns occur, in category and pattern order
+            found = sorted(
+                entry for term in hits for entry in self._pattern_flags.get(term, ())
+            )
+            flag_matches = {}
+            for _, pattern_index, flag_name in found:
+                flag_matches.setdefault(flag_name, []).append(
+                    self.red_flags[flag_name]["patterns"][pattern_index])
+            
+            for flag_name, matches in flag_matches.items():
+                flag_data = self.red_flags[flag_name]
                 if matches:
                     detected_flags.append({
                         "flag": flag_name,
@@ -168,6 +220,32 @@ class RedFlagDetector:
                 "total_flags": 0
             }
     
+    def detect_link_flags(self, link_reports: List[Dict]) -> List[Dict]:
+        """Red flags from domain reputation reports (DomainReputationIndex.score)
+        
+        Args:
+            link_reports: One report per extracted link
+            
+        Returns:
+            One flag per category, listing the offending domains
+        """
+        flags = {}
+        for report in link_reports:
+            flag_name = self.link_flags.get(report.get("category"))
+            if not flag_name:
+                continue
+            if flag_name not in flags:
+                flag_data = self.red_flags[flag_name]
+                flags[flag_name] = {
+                    "flag": flag_name,
+                    "severity": flag_data["severity"],
+                    "description": flag_data["description"],
+                    "matched_patterns": []
+                }
+            if report["domain"] not in flags[flag_name]["matched_patterns"]:
+                flags[flag_name]["matched_patterns"].append(report["domain"])
+        return list(flags.values())
+    
     def _analyze_conversation_patterns(self, history: List[Dict]) -> List[Dict]:
         """Analyze conversation patterns for red flags"""
         
@@ -177,9 +255,11 @@ class RedFlagDetector:
         if len(scammer_messages) < 2:
             return flags
         
+        # Token-aware hits per message (cached, history is re-read every turn)
+        scammer_hits = [analyze_text(m.get("text", "")).hits for m in scammer_messages]
+        
         # Check for escalating urgency
-        urgency_words = ["urgent", "immediately", "now", "asap", "hurry"]
-        urgency_count = sum(1 for m in scammer_messages if any(w in m.get("text", "").lower() for w in urgency_words))
+        urgency_count = sum(1 for hits in scammer_hits if any(w in hits for w in URGENCY_WORDS))
         
         if urgency_count >= 2:
             flags.append({
@@ -189,8 +269,7 @@ class RedFlagDetector:
             })
         
         # Check for multiple credential requests
-        credential_words = ["otp", "password", "pin", "cvv", "account"]
-        credential_requests = sum(1 for m in scammer_messages if any(w in m.get("text", "").lower() for w in credential_words))
+        credential_requests = sum(1 for hits in scammer_hits if any(w in hits for w in CREDENTIAL_WORDS))
         
         if credential_requests >= 2:
             flags.append({
@@ -201,13 +280,9 @@ class RedFlagDetector:
         
         # Check for changing story
         if len(scammer_messages) >= 3:
-            first_msg = scammer_messages[0].get("text", "").lower()
-            last_msg = scammer_messages[-1].get("text", "").lower()
-            
             # Simple check: if topics change drastically
-            first_topics = set(["bank", "upi", "account", "kyc", "prize", "lottery", "job", "tax"])
-            first_mentioned = [t for t in first_topics if t in first_msg]
-            last_mentioned = [t for t in first_topics if t in last_msg]
+            first_mentioned = [t for t in TOPIC_WORDS if t in scammer_hits[0]]
+            last_mentioned = [t for t in TOPIC_WORDS if t in scammer_hits[-1]]
             
             if first_mentioned and last_mentioned and not any(t in last_mentioned for t in first_mentioned):
                 flags.append({
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Local Reply Ranker
+==================
+
+One LLM call used to yield one reply; when the quality gate rejected it
+(AI markers, length, an exact repeat) the turn fell to the pattern-based
+tier and the round trip was wasted. The generator now asks for several
+numbered candidates in the same call and ReplyRanker picks the best one
+that passes the gate, with no further LLM work.
+
+Score (higher is better):
+- Uniqueness: word overlap with the session's used replies is penalized,
+  so near-repeats lose to fresh wording (exact repeats never pass the gate)
+- Strategy: mentions what the current extraction strategy is after
+  (number, name, email, UPI...), and asks a question when it should
+- Length: distance from the 15-30 word range the prompt asks for
+
+Features:
+- Pure local scoring, microseconds per candidate
+- Acceptance rate, first-choice rate, retries avoided (turns where the
+  first candidate was rejected but another one passed) and LLM call
+  latency for reporting
+- Thread-safe (LLM calls run in worker threads)
+
+Author: Team YUKT
+License: MIT
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+_WORD_PATTERN = re.compile(r"[a-z0-9@.]+")
+
+# Words a reply for each strategy is expected to contain
+STRATEGY_TERMS = {
+    "extract_phone_naturally": ("number", "phone", "call", "contact", "whatsapp", "mobile"),
+    "build_rapport": ("sir", "madam", "thank", "help", "understand", "worried", "okay"),
+    "extract_name": ("name", "who", "speaking"),
+    "extract_role": ("position", "department", "role", "designation", "post", "job"),
+    "extract_email": ("email", "mail", "id"),
+    "extract_organizational_info": ("employee", "branch", "office", "supervisor", "manager", "address", "id"),
+    "extract_payment_info": ("upi", "account", "ifsc", "send", "pay", "transfer", "money"),
+    "probe_process": ("process", "how", "next", "steps", "procedure", "why"),
+    "final_extraction": ("number", "email", "contact", "details", "name", "office"),
+}
+
+# Strategies whose reply should end up asking something
+QUESTION_STRATEGIES = frozenset(STRATEGY_TERMS) - {"build_rapport"}
+
+MIN_WORDS = 15
+MAX_WORDS = 30
+
+
+def _words(text: str) -> frozenset:
+    return frozenset(_WORD_PATTERN.findall(text.lower()))
+
+
+class ReplyRanker:
+    """Scores LLM reply candidates and keeps acceptance statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.candidates = 0
+        self.accepted = 0
+        self.first_choice = 0
+        self.retries_avoided = 0
+        self.no_candidate = 0
+        self.calls = 0
+        self.call_seconds = 0.0
+        self.rank_seconds = 0.0
+
+    # ============= SCORING =============
+
+    def score(self, reply: str, strategy: str, used_words: Iterable[frozenset]) -> float:
+        """Rank value of one candidate (already past the quality gate)"""
+        words = _words(reply)
+        if not words:
+            return float("-inf")
+
+        # Uniqueness: 0 (new wording) .. -2 (same words as an earlier reply)
+        overlap = max((len(words & used) / len(words | used) for used in used_words), default=0.0)
+        score = -2.0 * overlap
+
+        # Strategy fit
+        terms = STRATEGY_TERMS.get(strategy, ())
+        if any(term in words for term in terms):
+            score += 1.0
+        if strategy in QUESTION_STRATEGIES and "?" in reply:
+            score += 0.5
+
+        # Length: -0.1 per word outside the requested range
+        count = len(reply.split())
+        if count < MIN_WORDS:
+            score -= 0.1 * (MIN_WORDS - count)
+        elif count > MAX_WORDS:
+            score -= 0.1 * (count - MAX_WORDS)
+        return score
+
+    def choose(self, candidates: List[str], strategy: str, used_responses: Iterable[str],
+               passes: Callable[[str], bool]) -> Optional[str]:
+        """
+        Best candidate that passes the quality gate, or None
+
+        Args:
+            candidates: Cleaned replies in the order the LLM listed them
+            strategy: Current extraction strategy
+            used_responses: Normalized replies already sent in this session
+            passes: Quality gate (the generator's _is_high_quality)
+        """
+        started = time.perf_counter()
+        usable = [candidate for candidate in candidates if passes(candidate)]
+        best = None
+        if usable:
+            used_words = [_words(text) for text in used_responses]
+            best = max(usable, key=lambda candidate: self.score(candidate, strategy, used_words))
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.turns += 1
+            self.candidates += len(candidates)
+            self.accepted += len(usable)
+            if not usable:
+                self.no_candidate += 1
+            elif usable[0] is candidates[0]:
+                self.first_choice += 1
+            else:
+                self.retries_avoided += 1  # A single-reply call would have been rejected
+            self.rank_seconds += elapsed
+        return best
+
+    def record_call(self, seconds: float):
+        """Latency of one candidate-generating LLM call"""
+        with self._lock:
+            self.calls += 1
+            self.call_seconds += seconds
+
+    def stats(self) -> Dict:
+        """Candidate acceptance, retries avoided and call latency"""
+        with self._lock:
+            avg_call_ms = self.call_seconds / self.calls * 1000 if self.calls else 0.0
+            return {
+                "turns": self.turns,
+                "candidates": self.candidates,
+                "acceptanceRate": round(self.accepted / self.candidates, 3) if self.candidates else 0.0,
+                "firstChoiceRate": round(self.first_choice / self.turns, 3) if self.turns else 0.0,
+                "retriesAvoided": self.retries_avoided,
+                "fellBackToPatterns": self.no_candidate,
+                "avgCallMs": round(avg_call_ms, 3),
+                # Each avoided retry would have been one more LLM round trip
+                "retryMsSaved": round(self.retries_avoided * avg_call_ms, 1),
+                "avgRankUs": round(self.rank_seconds / self.turns * 1e6, 3) if self.turns else 0.0
+            }
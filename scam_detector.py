@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Advanced Scam Detector
+======================
+
+Keyword and pattern based scam detection with scam type classification.
+
+Features:
+- Weighted keyword scoring (urgency, threats, credentials, rewards, etc.)
+- Pattern detection (urgency + threat + action combinations)
+- Scam type classification across 10 fraud categories
+- Confidence scoring (0-1 scale)
+- Token-aware keyword/phrase matching shared with RedFlagDetector
+  (see message_analysis.py), so "now" does not fire on "know"
+
+Kept free of any server or LLM dependency so it can be used by the API
+and by offline tooling alike.
+
+Author: Team YUKT
+License: MIT
+"""
+
+from typing import Dict, Union
+
+from message_analysis import MessageAnalysis, as_analysis, register_terms
+
+
+class AdvancedScamDetector:
+    """Scores messages for scam likelihood and classifies the scam type"""
+    
+    def __init__(self):
+        self.scam_keywords = {
+            # Urgency indicators
+            "urgent": 3, "immediately": 3, "now": 2, "asap": 3, "hurry": 3, "quick": 2, "today": 1,
+            # Threat indicators
+            "blocked": 4, "suspended": 4, "freeze": 4, "locked": 4, "expire": 3, "deactivate": 4, "pending": 2,
+            # Action requests
+            "verify": 2, "confirm": 2, "update": 2, "click": 3, "call": 2, "send": 2, "provide": 2, "register": 2,
+            # Financial terms
+            "account": 2, "bank": 2, "upi": 3, "payment": 2, "transaction": 2, "transfer": 3, "rupees": 2, "rs": 1,
+            # Sensitive data
+            "otp": 5, "cvv": 5, "pin": 5, "password": 5, "kyc": 4, "aadhar": 4, "pan": 4,
+            # Rewards/prizes
+            "winner": 4, "prize": 4, "lottery": 4, "won": 3, "cashback": 3, "reward": 3, "refund": 3, "earn": 2,
+            # Phishing indicators
+            "link": 2, "website": 2, "portal": 2, "app": 2, "download": 3, "claim": 2,
+            # Authority impersonation
+            "officer": 3, "department": 2, "government": 3, "police": 4, "court": 4, "legal": 3, "tax": 3,
+            # Payment apps
+            "paytm": 2, "phonepe": 2, "gpay": 2, "googlepay": 2,
+            # Job scam indicators
+            "work from home": 4, "opportunity": 2, "registration fee": 4, "investment": 2,
+        }
+        
+        # Pattern word groups (any hit sets the group)
+        self.pattern_groups = {
+            "urgency": ["urgent", "immediately", "now", "asap", "today", "hurry"],
+            "threat": ["blocked", "suspended", "freeze", "expire", "pending"],
+            "action": ["verify", "click", "call", "send", "provide", "register"],
+            "financial": ["account", "bank", "upi", "otp", "payment", "rupees", "rs"],
+            "reward": ["won", "prize", "cashback", "refund", "earn", "reward"],
+        }
+        
+        # Scam type rules, first match wins (covers all major fraud categories)
+        self.type_rules = [
+            ("Banking/Financial Fraud", ["bank", "account"]),
+            ("UPI/Payment Scam", ["upi", "paytm", "phonepe", "gpay"]),
+            ("Credential Phishing", ["otp", "cvv", "password", "pin"]),
+            ("Prize/Lottery Scam", ["winner", "prize", "lottery", "congratulations"]),
+            ("Phishing Link Scam", ["http", "www", "click", "link"]),
+            ("Cashback/Refund Scam", ["cashback", "refund", "reward"]),
+            ("KYC/Verification Scam", ["kyc", "update", "verify"]),
+            ("Tax/Penalty Scam", ["tax", "penalty", "fine"]),
+            ("Job/Employment Scam", ["job", "work from home", "earn"]),
+            ("Investment/Trading Scam", ["investment", "trading", "profit"]),
+        ]
+        
+        self._build_vocabulary()
+    
+    def _build_vocabulary(self):
+        """
+        Assign every term a column (bit) in a message's keyword-hit row
+        
+        Keyword weights, pattern groups and type rules are then plain
+        bitmask operations on the row.
+        """
+        terms = list(self.scam_keywords)
+        for words in self.pattern_groups.values():
+            terms.extend(words)
+        for _, words in self.type_rules:
+            terms.extend(words)
+        self.vocabulary = list(dict.fromkeys(terms))
+        
+        bits = {term: 1 << i for i, term in enumerate(self.vocabulary)}
+        self._term_columns = {term: (self.scam_keywords.get(term, 0), bits[term]) for term in self.vocabulary}
+        register_terms(self.vocabulary)
+        self._group_masks = {
+            name: sum(bits[w] for w in set(words))
+            for name, words in self.pattern_groups.items()
+        }
+        self._type_masks = [
+            (scam_type, sum(bits[w] for w in set(words)))
+            for scam_type, words in self.type_rules
+        ]
+    
+    def _analysis_row(self, analysis: MessageAnalysis):
+        """Keyword-hit row (bitmask, weighted sum) from the shared token match"""
+        mask = 0
+        total = 0
+        columns = self._term_columns
+        for term in analysis.hits:
+            column = columns.get(term)
+            if column is not None:
+                total += column[0]
+                mask |= column[1]
+        return mask, total
+    
+    def detect(self, message: Union[str, MessageAnalysis]) -> Dict:
+        """Score a single message (text or a prebuilt MessageAnalysis)"""
+        return self._score(*self._analysis_row(as_analysis(message)))
+    
+    def _score(self, mask: int, keyword_sum: int) -> Dict:
+        """Detection result for one keyword-hit row"""
+        groups = self._group_masks
+        
+        # Keyword scoring
+        keyword_score = min(keyword_sum / 15.0, 1.0)
+        
+        # Pattern detection
+        has_urgency = bool(mask & groups["urgency"])
+        has_threat = bool(mask & groups["threat"])
+        has_action = bool(mask & groups["action"])
+        has_financial = bool(mask & groups["financial"])
+        has_reward = bool(mask & groups["reward"])
+        
+        pattern_score = 0.0
+        if has_urgency and has_threat and has_action:
+            pattern_score = 1.0
+        elif (has_urgency and has_threat) or (has_threat and has_action):
+            pattern_score = 0.7
+        elif (has_action and has_financial) or (has_reward and has_action):
+            pattern_score = 0.5
+        elif has_urgency or has_threat or has_reward:
+            pattern_score = 0.3
+        
+        # Combined score
+        total_score = (keyword_score * 0.5 + pattern_score * 0.5)
+        
+        # Classify scam type
+        scam_type = "Unknown"
+        for candidate, type_mask in self._type_masks:
+            if mask & type_mask:
+                scam_type = candidate
+                break
+        
+        return {
+            "is_scam": total_score > 0.25,  # Lowered from 0.35 to catch more scams
+            "confidence": total_score,
+            "scam_type": scam_type
+        }
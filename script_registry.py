@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Known-Script Registry
+=====================
+
+Scam campaigns send the same opening message to thousands of victims with
+only the numbers changed. Once such a script has been seen through to the
+end, re-running detection, red-flag analysis and an LLM call for the next
+copy is wasted work.
+
+Features:
+- 64-bit SimHash fingerprints of scammer opening messages
+- Near-duplicate lookup (Hamming distance <= 3) via four 16-bit block tables
+- Stores the detector result, red flags and proven reply variants per script
+- Learned only from finalized sessions; a script must be confirmed by
+  several sessions before it is trusted
+- Hit-rate counters for reporting
+
+Author: Team YUKT
+License: MIT
+"""
+
+import copy
+import re
+import zlib
+from typing import Dict, List, Optional
+
+_WORD_PATTERN = re.compile(r'[a-z#]+')
+_DIGITS_PATTERN = re.compile(r'\d+')
+_BLOCKS = 4
+_BLOCK_BITS = 16
+_BLOCK_MASK = (1 << _BLOCK_BITS) - 1
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams
+
+    Digits collapse to '#' so copies of a script with different phone
+    numbers, amounts or account numbers get the same fingerprint.
+    """
+    words = _WORD_PATTERN.findall(_DIGITS_PATTERN.sub('#', text.lower()))
+    features = set(words)
+    features.update(" ".join(pair) for pair in zip(words, words[1:]))
+    if not features:
+        return 0
+
+    # Two seeded CRC32s make a 64-bit feature hash
+    bit_rows = [
+        format(zlib.crc32(f.encode()) | (zlib.crc32(f.encode(), 0x9E3779B9) << 32), '064b')
+        for f in features
+    ]
+    # Column-wise majority vote (string column i is bit 63 - i)
+    half = len(bit_rows) / 2
+    fingerprint = 0
+    for column in zip(*bit_rows):
+        fingerprint = (fingerprint << 1) | (column.count('1') > half)
+    return fingerprint
+
+
+class ScriptRegistry:
+    """SimHash-indexed store of scam scripts with precomputed analysis"""
+
+    def __init__(self, max_distance: int = 3, min_sessions: int = 2, max_variants: int = 8):
+        """
+        Args:
+            max_distance: Max Hamming distance for a match (<= 3 keeps the
+                four-block lookup exact)
+            min_sessions: Finalized sessions needed before a script is trusted
+            max_variants: Reply variants kept per script
+        """
+        if max_distance >= _BLOCKS:
+            raise ValueError("max_distance must be smaller than the number of blocks")
+        self.max_distance = max_distance
+        self.min_sessions = min_sessions
+        self.max_variants = max_variants
+
+        # fingerprint -> {"detection", "red_flags", "replies", "sessions", "hits"}
+        self.templates: Dict[int, Dict] = {}
+        # One table per 16-bit block: any match within distance 3 shares a block
+        self._blocks: List[Dict[int, List[int]]] = [{} for _ in range(_BLOCKS)]
+
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    @staticmethod
+    def _block_keys(fingerprint: int):
+        return [(fingerprint >> (i * _BLOCK_BITS)) & _BLOCK_MASK for i in range(_BLOCKS)]
+
+    def _nearest(self, fingerprint: int) -> Optional[int]:
+        """Closest stored fingerprint within max_distance"""
+        if fingerprint in self.templates:
+            return fingerprint
+        best, best_distance = None, self.max_distance + 1
+        for table, key in zip(self._blocks, self._block_keys(fingerprint)):
+            for candidate in table.get(key, ()):
+                distance = bin(candidate ^ fingerprint).count('1')
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return best
+
+    def match(self, text: str) -> Optional[Dict]:
+        """
+        Look up a scammer message
+
+        Returns:
+            Template dict (detection, red_flags, replies) if the message is a
+            trusted known script, else None
+        """
+        self.lookups += 1
+        fingerprint = self._nearest(simhash(text))
+        if fingerprint is None:
+            return None
+        template = self.templates[fingerprint]
+        if template["sessions"] < self.min_sessions or not template["replies"]:
+            return None
+        self.hits += 1
+        template["hits"] += 1
+        return template
+
+    def learn(self, text: str, detection: Dict, red_flags: List[Dict], reply: Optional[str] = None):
+        """
+        Record the opening of a finalized session
+
+        Near-duplicates of an existing script are folded into it; the first
+        session's detection and red flags stay the stored result.
+        """
+        fingerprint = simhash(text)
+        existing = self._nearest(fingerprint)
+        if existing is None:
+            template = self.templates[fingerprint] = {
+                "detection": copy.deepcopy(detection),
+                "red_flags": copy.deepcopy(red_flags),
+                "replies": [],
+                "sessions": 0,
+                "hits": 0
+            }
+            for table, key in zip(self._blocks, self._block_keys(fingerprint)):
+                table.setdefault(key, []).append(fingerprint)
+        else:
+            template = self.templates[existing]
+
+        template["sessions"] += 1
+        if reply and reply not in template["replies"] and len(template["replies"]) < self.max_variants:
+            template["replies"].append(reply)
+
+    def stats(self) -> Dict:
+        """Registry size and hit rate"""
+        return {
+            "templates": len(self.templates),
+            "trusted": sum(1 for t in self.templates.values()
+                           if t["sessions"] >= self.min_sessions and t["replies"]),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hitRate": round(self.hits / self.lookups, 4) if self.lookups else 0.0
+        }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Finalized Session Archive
+=========================
+
+Finalized sessions used to stay in memory forever, full message text
+included, and nothing was left on disk for offline analysis. The archiver
+moves them into append-only, compressed JSONL segment files and the API
+drops them from memory; /api/session/{id} still serves them by reading one
+record back through a small index.
+
+Layout (under the archive directory):
+    segment-000001.jsonl.gz   Concatenated gzip members of up to
+                              `member_sessions` sessions, one JSON line per
+                              session (the /api/session payload). Plain
+                              `zcat` reads a whole segment.
+    index.jsonl               ["session-id", segment, offset, length, line]
+                              per archived session; later lines win
+
+Features:
+- Group compression: sessions are compressed in groups, so repeated field
+  names and phrases across sessions compress together
+- Lazy reads: a lookup decompresses only the group holding the session,
+  with a small cache of recently read members
+- Segments rotate at a size limit; nothing is ever rewritten
+- Compression ratio and write throughput for reporting
+- Writes and reads are thread-safe, so both can run off the event loop
+
+Author: Team YUKT
+License: MIT
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_PATTERN = re.compile(r'segment-(\d+)\.jsonl\.gz$')
+_GZIP_WBITS = 31  # zlib window bits for the gzip container
+
+
+class SessionArchive:
+    """Append-only compressed store of finalized session payloads"""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024,
+                 member_sessions: int = 32, cached_members: int = 8, level: int = 6):
+        """
+        Args:
+            directory: Where segments and the index live (created on first write)
+            segment_bytes: Size after which a new segment file is started
+            member_sessions: Sessions per gzip member; larger compresses better,
+                smaller makes a cold lookup decompress less
+            cached_members: Decompressed members kept for repeated lookups
+            level: zlib compression level
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.member_sessions = member_sessions
+        self.cached_members = cached_members
+        self.level = level
+        self.index_path = os.path.join(directory, "index.jsonl")
+
+        # session_id -> (segment, offset, length, line)
+        self.index: Dict[str, Tuple[int, int, int, int]] = {}
+        self._members: "OrderedDict[Tuple[int, int], List[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.segment = 1
+        self.segment_size = 0
+        self.archived = 0
+        self.batches = 0
+        self.bytes_raw = 0
+        self.bytes_compressed = 0
+        self.write_seconds = 0.0
+        self.loads = 0
+
+        if os.path.isdir(directory):
+            self._open_existing()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.index
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.jsonl.gz")
+
+    def _open_existing(self):
+        """Load the index and continue the newest segment"""
+        segments = [int(match.group(1)) for match in map(_SEGMENT_PATTERN.match, os.listdir(self.directory))
+                    if match]
+        if segments:
+            self.segment = max(segments)
+            self.segment_size = os.path.getsize(self._segment_path(self.segment))
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        session_id, segment, offset, length, position = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.index[session_id] = (segment, offset, length, position)
+        logger.info(f"🗄️ Session archive: {len(self.index)} sessions in {len(segments)} segment(s)")
+
+    # ============= WRITES =============
+
+    def write_batch(self, records: List[Tuple[str, bytes]]) -> int:
+        """
+        Append a batch of (session_id, JSON payload) as gzip members
+
+        Returns:
+            Compressed bytes written
+        """
+        if not records:
+            return 0
+        started = time.perf_counter()
+        members = []
+        raw_size = 0
+        for start in range(0, len(records), self.member_sessions):
+            group = records[start:start + self.member_sessions]
+            raw = b"\n".join(payload for _, payload in group) + b"\n"
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, _GZIP_WBITS)
+            members.append((group, compressor.compress(raw) + compressor.flush()))
+            raw_size += len(raw)
+        written = sum(len(member) for _, member in members)
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.segment_size and self.segment_size + written > self.segment_bytes:
+                self.segment += 1
+                self.segment_size = 0
+            entries = []
+            offset = self.segment_size
+            for group, member in members:
+                entries.extend((session_id, (self.segment, offset, len(member), position))
+                               for position, (session_id, _) in enumerate(group))
+                offset += len(member)
+            with open(self._segment_path(self.segment), "ab") as f:
+                f.write(b"".join(member for _, member in members))
+            self.segment_size = offset
+
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for session_id, location in entries:
+                    f.write(json.dumps([session_id, *location], separators=(",", ":")))
+                    f.write("\n")
+            self.index.update(entries)
+
+            self.archived += len(records)
+            self.batches += 1
+            self.bytes_raw += raw_size
+            self.bytes_compressed += written
+            self.write_seconds += time.perf_counter() - started
+        return written
+
+    # ============= READS =============
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        """JSON payload of an archived session, or None if it was never archived"""
+        location = self.index.get(session_id)
+        if location is None:
+            return None
+        segment, offset, length, position = location
+        key = (segment, offset)
+        with self._lock:
+            self.loads += 1
+            lines = self._members.get(key)
+            if lines is not None:
+                self._members.move_to_end(key)
+                return lines[position]
+
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            lines = zlib.decompress(f.read(length), _GZIP_WBITS).split(b"\n")
+
+        with self._lock:
+            self._members[key] = lines
+            if len(self._members) > self.cached_members:
+                self._members.popitem(last=False)
+        return lines[position]
+
+    def stats(self) -> Dict:
+        """Archive size, compression ratio and write throughput"""
+        return {
+            "sessions": len(self.index),
+            "archivedThisRun": self.archived,
+            "batches": self.batches,
+            "segments": self.segment if self.segment_size or self.index else 0,
+            "bytesRaw": self.bytes_raw,
+            "bytesCompressed": self.bytes_compressed,
+            "compressionRatio": round(self.bytes_raw / self.bytes_compressed, 2) if self.bytes_compressed else 0.0,
+            "sessionsPerSecond": round(self.archived / self.write_seconds, 1) if self.write_seconds else 0.0,
+            "lazyLoads": self.loads
+        }
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Session Listing Index
+=====================
+
+/api/sessions used to build one dict covering every session in memory on
+each call. SessionIndex keeps small secondary indexes, updated as turns
+change a session, so a filtered page touches only the candidate sessions
+of its most selective filter.
+
+Features:
+- Sequence numbers from creation time (microseconds, bumped on a tie);
+  the cursor is the last sequence returned, so pages stay stable while
+  new sessions arrive, and sessions restored from a snapshot or the
+  archive slot back into their original place
+- Sorted sequence lists per scam_detected / finalized value, per scam type
+  and per intelligence count, moved on write only when a value changes
+- Time range filters bisect the creation-time column
+- Summary counts (total, scam detected, finalized, per scam type) read
+  from list lengths, never recounted
+
+Author: Team YUKT
+License: MIT
+"""
+
+import time
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class _Entry:
+    """Indexed fields of one session"""
+
+    __slots__ = ("session_id", "created", "scam_detected", "finalized", "scam_type", "intel")
+
+    def __init__(self, session_id: str, created: float):
+        self.session_id = session_id
+        self.created = created
+        self.scam_detected = False
+        self.finalized = False
+        self.scam_type = "Unknown"
+        self.intel = 0
+
+
+def _discard(seqs: List[int], seq: int):
+    """Delete seq from a sorted list"""
+    del seqs[bisect_left(seqs, seq)]
+
+
+def _move(source: List[int], target: List[int], seq: int):
+    """Move seq between two sorted lists"""
+    _discard(source, seq)
+    insort(target, seq)
+
+
+class SessionIndex:
+    """Filterable, cursor-paginated view of the session table"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}          # session_id -> seq
+        self.entries: Dict[int, _Entry] = {}   # seq -> entry
+        self.seqs: List[int] = []              # Live seqs, ascending
+        self.created: List[float] = []         # Creation time, parallel to seqs
+        self.detected: Dict[bool, List[int]] = {True: [], False: []}
+        self.finalized: Dict[bool, List[int]] = {True: [], False: []}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_intel: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.seqs)
+
+    # ============= WRITES =============
+
+    def add(self, session_id: str, created: Optional[float] = None):
+        """Register a session at its creation time (no-op if already indexed)"""
+        if session_id in self.ids:
+            return
+        created = time.time() if created is None else created
+        seq = int(created * 1_000_000)
+        while seq in self.entries:
+            seq += 1
+        entry = _Entry(session_id, created)
+        self.ids[session_id] = seq
+        self.entries[seq] = entry
+        position = bisect_left(self.seqs, seq)
+        self.seqs.insert(position, seq)
+        self.created.insert(position, created)
+        insort(self.detected[False], seq)
+        insort(self.finalized[False], seq)
+        insort(self.by_type.setdefault(entry.scam_type, []), seq)
+        insort(self.by_intel.setdefault(0, []), seq)
+
+    def update(self, session_id: str, scam_detected: bool, finalized: bool,
+               scam_type: str, intel_count: int):
+        """Record a session's current values; indexes move only on change"""
+        seq = self.ids.get(session_id)
+        if seq is None:
+            return
+        entry = self.entries[seq]
+        if scam_detected != entry.scam_detected:
+            _move(self.detected[entry.scam_detected], self.detected[scam_detected], seq)
+            entry.scam_detected = scam_detected
+        if finalized != entry.finalized:
+            _move(self.finalized[entry.finalized], self.finalized[finalized], seq)
+            entry.finalized = finalized
+        if scam_type != entry.scam_type:
+            self._drop(self.by_type, entry.scam_type, seq)
+            insort(self.by_type.setdefault(scam_type, []), seq)
+            entry.scam_type = scam_type
+        if intel_count != entry.intel:
+            self._drop(self.by_intel, entry.intel, seq)
+            insort(self.by_intel.setdefault(intel_count, []), seq)
+            entry.intel = intel_count
+
+    def remove(self, session_id: str):
+        """Forget a session"""
+        seq = self.ids.pop(session_id, None)
+        if seq is None:
+            return
+        entry = self.entries.pop(seq)
+        position = bisect_left(self.seqs, seq)
+        del self.seqs[position]
+        del self.created[position]
+        _discard(self.detected[entry.scam_detected], seq)
+        _discard(self.finalized[entry.finalized], seq)
+        self._drop(self.by_type, entry.scam_type, seq)
+        self._drop(self.by_intel, entry.intel, seq)
+
+    @staticmethod
+    def _drop(index: Dict, key, seq: int):
+        seqs = index[key]
+        _discard(seqs, seq)
+        if not seqs:
+            del index[key]
+
+    # ============= QUERIES =============
+
+    def query(self, scam_detected: Optional[bool] = None, finalized: Optional[bool] = None,
+              scam_type: Optional[str] = None, started_after: Optional[float] = None,
+              started_before: Optional[float] = None, min_intel: Optional[int] = None,
+              cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[str], Optional[str]]:
+        """
+        One page of session IDs in creation order
+
+        Args:
+            started_after / started_before: Creation time bounds (epoch seconds, inclusive/exclusive)
+            cursor: next_cursor of the previous page
+            limit: Page size
+
+        Returns:
+            (session_ids, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        low = int(cursor) if cursor else -1  # Exclusive lower seq bound
+        if started_after is not None:
+            position = bisect_left(self.created, started_after)
+            if position:
+                low = max(low, self.seqs[position - 1])
+        high = None  # Exclusive upper seq bound
+        if started_before is not None:
+            position = bisect_left(self.created, started_before)
+            high = self.seqs[position] if position < len(self.seqs) else None
+
+        # Walk the smallest candidate list; check the other filters per entry
+        candidates: List[Tuple[int, Iterator[int]]] = [(len(self.seqs), self._after(self.seqs, low))]
+        if scam_detected is not None:
+            seqs = self.detected[scam_detected]
+            candidates.append((len(seqs), self._after(seqs, low)))
+        if finalized is not None:
+            seqs = self.finalized[finalized]
+            candidates.append((len(seqs), self._after(seqs, low)))
+        if scam_type is not None:
+            seqs = self.by_type.get(scam_type, [])
+            candidates.append((len(seqs), self._after(seqs, low)))
+        if min_intel is not None:
+            buckets = [seqs for count, seqs in self.by_intel.items() if count >= min_intel]
+            candidates.append((sum(map(len, buckets)),
+                               merge(*(self._after(seqs, low) for seqs in buckets))))
+        stream = min(candidates, key=lambda candidate: candidate[0])[1]
+
+        page: List[str] = []
+        last = low
+        for seq in stream:
+            if high is not None and seq >= high:
+                break
+            entry = self.entries[seq]
+            if ((scam_detected is not None and entry.scam_detected != scam_detected)
+                    or (finalized is not None and entry.finalized != finalized)
+                    or (scam_type is not None and entry.scam_type != scam_type)
+                    or (min_intel is not None and entry.intel < min_intel)):
+                continue
+            if len(page) == limit:
+                return page, str(last)
+            page.append(entry.session_id)
+            last = seq
+        return page, None
+
+    @staticmethod
+    def _after(seqs: List[int], low: int) -> Iterator[int]:
+        """Sequence numbers in a sorted list greater than low"""
+        for position in range(bisect_right(seqs, low), len(seqs)):
+            yield seqs[position]
+
+    def summary(self) -> Dict:
+        """Session counts, maintained on write"""
+        return {
+            "total": len(self.seqs),
+            "scamDetected": len(self.detected[True]),
+            "finalized": len(self.finalized[True]),
+            "byScamType": {scam_type: len(seqs) for scam_type, seqs in self.by_type.items()}
+        }
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Per-Session Turn Ordering
+=========================
+
+Two messages for the same sessionId must not interleave: a turn appends to
+session["messages"], merges intelligence and red flags and advances the
+generator's per-session state, and LLM generation runs in a worker thread
+with the event loop free to start the next request meanwhile.
+
+SessionLocks hands out one asyncio.Lock per active session. Turns of one
+session run strictly in arrival order (asyncio.Lock is FIFO); different
+sessions never wait for each other.
+
+Features:
+- Reference-counted: a lock exists only while a turn holds or awaits it,
+  so idle sessions cost nothing and no sweep is needed
+- Queue-wait time per turn, contention count and deepest queue seen
+
+Author: Team YUKT
+License: MIT
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List
+
+
+class SessionLocks:
+    """FIFO mutex per sessionId, dropped as soon as the session goes idle"""
+
+    def __init__(self):
+        # session_id -> [lock, turns holding or waiting]
+        self.locks: Dict[str, List] = {}
+        self.acquired = 0
+        self.contended = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self.locks)
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[float]:
+        """
+        Serialize a turn with the session's other turns
+
+        Yields:
+            Milliseconds spent waiting for earlier turns of the session
+        """
+        entry = self.locks.get(session_id)
+        if entry is None:
+            entry = self.locks[session_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        if entry[1] > 1:
+            self.contended += 1
+            self.max_depth = max(self.max_depth, entry[1])
+
+        started = time.perf_counter()
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._leave(session_id, entry)
+            raise
+        self.acquired += 1
+        try:
+            yield (time.perf_counter() - started) * 1000
+        finally:
+            entry[0].release()
+            self._leave(session_id, entry)
+
+    def _leave(self, session_id: str, entry: List):
+        entry[1] -= 1
+        if entry[1] == 0 and self.locks.get(session_id) is entry:
+            del self.locks[session_id]
+
+    def stats(self) -> Dict:
+        """Active sessions and contention"""
+        return {
+            "activeSessions": len(self.locks),
+            "turns": self.acquired,
+            "contended": self.contended,
+            "maxQueueDepth": self.max_depth
+        }
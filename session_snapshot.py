@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Incremental Session Snapshots
+=============================
+
+A redeploy or crash used to wipe every live engagement: the session table,
+the generator's per-session persona state, everything mid-conversation.
+SnapshotLog persists that state to one local file and restores it at
+startup, so a scammer talking to the honeypot never notices the restart.
+
+File format: a sequence of frames, each a 4-byte big-endian length and a
+pickled {session_id: state, or None once the session is gone}. Replaying
+the frames in order gives the latest state of every session.
+
+Features:
+- Incremental: only sessions marked dirty since the last snapshot are
+  written, as one appended frame
+- No event-loop stall: sessions are pickled in small chunks on the loop
+  (the only moment state is read), with a yield between chunks; file
+  writes and fsync happen in a worker thread
+- Compaction: once the log outgrows `compact_ratio` x the live data it is
+  rewritten as a full snapshot (temp file + atomic rename)
+- A truncated last frame (crash mid-write) is cut off on restore
+- Restore replays with the cyclic GC paused (it would otherwise rescan
+  the growing heap over and over)
+- Longest pause, total snapshot time and restore time for reporting
+
+Author: Team YUKT
+License: MIT
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import pickle
+import struct
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+class SnapshotLog:
+    """Append-only, periodically compacted log of per-session state"""
+
+    def __init__(self, path: str, chunk_size: int = 500, compact_ratio: float = 2.0,
+                 min_compact_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            path: Snapshot file
+            chunk_size: Sessions pickled per slice of event-loop time
+            compact_ratio: Log size, relative to the last full snapshot, that
+                triggers a rewrite
+            min_compact_bytes: Never compact a log smaller than this
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+
+        self.dirty: set = set()
+        self._writing: Optional[asyncio.Future] = None
+        self.log_bytes = os.path.getsize(path) if os.path.exists(path) else 0
+        self.base_bytes = self.log_bytes
+
+        self.snapshots = 0
+        self.compactions = 0
+        self.sessions_written = 0
+        self.last_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.last_snapshot_ms = 0.0
+        self.restore_ms = 0.0
+        self.restored = 0
+
+    def mark(self, session_id: str):
+        """Session changed (or was dropped) since the last snapshot"""
+        self.dirty.add(session_id)
+
+    # ============= SNAPSHOT =============
+
+    async def snapshot(self, capture: Callable[[str], Optional[Any]],
+                       live_ids: Callable[[], Iterable[str]],
+                       busy: Callable[[str], bool] = lambda session_id: False) -> int:
+        """
+        Write dirty sessions (or everything, when compacting)
+
+        Args:
+            capture: State to persist for a session, None if it no longer exists
+            live_ids: Every current session ID (used when compacting)
+            busy: Sessions mid-turn; they stay dirty for the next snapshot
+
+        Returns:
+            Sessions written
+        """
+        # Frames must land in order: wait for a write left by a cancelled snapshot
+        if self._writing is not None and not self._writing.done():
+            await asyncio.wait({self._writing})
+
+        compact = self.log_bytes > max(self.compact_ratio * self.base_bytes, self.min_compact_bytes)
+        if not compact and not self.dirty:
+            return 0
+        started = time.perf_counter()
+        session_ids = list(live_ids()) if compact else list(self.dirty)
+        self.dirty.clear()
+
+        try:
+            frames: List[bytes] = []
+            longest = 0.0
+            for start in range(0, len(session_ids), self.chunk_size):
+                chunk_started = time.perf_counter()
+                states = {}
+                for session_id in session_ids[start:start + self.chunk_size]:
+                    if busy(session_id):
+                        self.dirty.add(session_id)
+                        continue
+                    state = capture(session_id)
+                    if state is not None or not compact:
+                        states[session_id] = state
+                if states:
+                    frame = pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL)
+                    frames.append(_FRAME_HEADER.pack(len(frame)) + frame)
+                longest = max(longest, time.perf_counter() - chunk_started)
+                await asyncio.sleep(0)  # Let requests run between chunks
+
+            self._writing = asyncio.ensure_future(asyncio.to_thread(self._write, frames, compact))
+            written = await asyncio.shield(self._writing)
+        except BaseException:
+            self.dirty.update(session_ids)  # Written again next time
+            raise
+        if compact:
+            self.compactions += 1
+        if compact or not self.base_bytes:
+            self.base_bytes = written  # A full picture of the live sessions
+        self.snapshots += 1
+        self.sessions_written += len(session_ids)
+        self.last_pause_ms = longest * 1000
+        self.max_pause_ms = max(self.max_pause_ms, self.last_pause_ms)
+        self.last_snapshot_ms = (time.perf_counter() - started) * 1000
+        return len(session_ids)
+
+    def _write(self, frames: List[bytes], replace: bool) -> int:
+        """Append frames (or replace the file with them); returns bytes written"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = b"".join(frames)
+        target = self.path + ".tmp" if replace else self.path
+        with open(target, "wb" if replace else "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if replace:
+            os.replace(target, self.path)
+            self.log_bytes = len(data)
+        else:
+            self.log_bytes += len(data)
+        return len(data)
+
+    # ============= RESTORE =============
+
+    def load(self) -> Dict[str, Any]:
+        """Replay the log: latest state of every session that still exists"""
+        started = time.perf_counter()
+        states: Dict[str, Any] = {}
+        if not os.path.exists(self.path):
+            return states
+        with open(self.path, "rb") as f:
+            data = f.read()
+        position = 0
+        size = len(data)
+        # Millions of new objects: full GC passes would dominate the restore
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            position = self._replay(data, states)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if position < size:
+            # Drop the damaged tail so later appends start on a frame boundary
+            os.truncate(self.path, position)
+            self.log_bytes = position
+        for session_id in [sid for sid, state in states.items() if state is None]:
+            del states[session_id]
+        self.restored = len(states)
+        self.restore_ms = (time.perf_counter() - started) * 1000
+        return states
+
+    def _replay(self, data: bytes, states: Dict[str, Any]) -> int:
+        """Apply every complete frame to states; returns where replay stopped"""
+        position = 0
+        size = len(data)
+        while position + _FRAME_HEADER.size <= size:
+            (length,) = _FRAME_HEADER.unpack_from(data, position)
+            end = position + _FRAME_HEADER.size + length
+            if end > size:
+                logger.warning("⚠️ Snapshot ends in a truncated frame; ignoring it")
+                break
+            try:
+                frame = pickle.loads(data[position + _FRAME_HEADER.size:end])
+            except Exception as e:
+                logger.error(f"❌ Unreadable snapshot frame, stopping restore there: {e}")
+                break
+            states.update(frame)
+            position = end
+        return position
+
+    def stats(self) -> Dict:
+        """Snapshot pauses, sizes and the last restore"""
+        return {
+            "snapshots": self.snapshots,
+            "compactions": self.compactions,
+            "sessionsWritten": self.sessions_written,
+            "dirty": len(self.dirty),
+            "logBytes": self.log_bytes,
+            "lastPauseMs": round(self.last_pause_ms, 3),
+            "maxPauseMs": round(self.max_pause_ms, 3),
+            "lastSnapshotMs": round(self.last_snapshot_ms, 3),
+            "restoredSessions": self.restored,
+            "restoreMs": round(self.restore_ms, 3)
+        }
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Speculative Next-Reply Store
+============================
+
+Between scammer messages a session sits idle, yet every turn waits on a
+full LLM call. In speculative mode the next strategy is predicted right
+after a reply goes out and candidate replies for it are generated in the
+background. If the next message is compatible with the prediction, a
+candidate is served with no LLM call on the critical path; otherwise normal
+generation runs and the speculation counts as wasted.
+
+Features:
+- Global token budget per minute and a cap on speculations in flight
+- One pending speculation per session, valid for the next turn only
+- Expiry after a TTL (scammer went quiet)
+- Hit rate, tokens spent and tokens wasted for reporting
+- Thread-safe (speculative calls finish in worker threads)
+
+Author: Team YUKT
+License: MIT
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class ReplySpeculator:
+    """Budgeted store of pre-generated replies, one slot per session"""
+
+    def __init__(self, tokens_per_minute: int = 20000, max_in_flight: int = 4,
+                 ttl_seconds: float = 300.0):
+        """
+        Args:
+            tokens_per_minute: Global LLM token budget for speculation
+            max_in_flight: Speculative LLM calls allowed at once
+            ttl_seconds: Age after which an unclaimed speculation is dropped
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max_in_flight
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # session_id -> {"strategy", "turn", "candidates", "tokens", "created"}
+        self.pending: Dict[str, Dict] = {}
+        self.in_flight = 0
+        self._window_start = time.monotonic()
+        self._window_tokens = 0
+
+        self.started = 0
+        self.skipped_budget = 0
+        self.hits = 0
+        self.misses = 0
+        self.tokens_spent = 0
+        self.tokens_wasted = 0
+
+    # ============= BUDGET =============
+
+    def reserve(self, estimated_tokens: int) -> bool:
+        """Claim budget for one speculative call; False if over budget"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_tokens = 0
+            if (self.in_flight >= self.max_in_flight
+                    or self._window_tokens + estimated_tokens > self.tokens_per_minute):
+                self.skipped_budget += 1
+                return False
+            self.in_flight += 1
+            self._window_tokens += estimated_tokens
+            self.started += 1
+            return True
+
+    def release(self, session_id: str, strategy: str, turn: int,
+                candidates: List[str], tokens: int):
+        """Finish a reserved call and keep its candidates for the given turn"""
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self.tokens_spent += tokens
+            if not candidates:
+                self.tokens_wasted += tokens
+                return
+            self._discard(session_id)
+            self.pending[session_id] = {
+                "strategy": strategy,
+                "turn": turn,
+                "candidates": candidates,
+                "tokens": tokens,
+                "created": time.monotonic()
+            }
+
+    # ============= LOOKUP =============
+
+    def claim(self, session_id: str, strategy: str, turn: int,
+              choose: Callable[[List[str]], Optional[str]]) -> Optional[str]:
+        """
+        Use the session's speculation for this turn, if it fits
+
+        The speculation is consumed either way. It is a hit only when it was
+        made for this turn and strategy, is not stale, and `choose` accepts
+        one of its candidates.
+        """
+        with self._lock:
+            entry = self.pending.pop(session_id, None)
+        if entry is None:
+            return None
+        reply = None
+        if (entry["turn"] == turn and entry["strategy"] == strategy
+                and time.monotonic() - entry["created"] <= self.ttl_seconds):
+            reply = choose(entry["candidates"])
+        with self._lock:
+            if reply is None:
+                self.misses += 1
+                self.tokens_wasted += entry["tokens"]
+            else:
+                self.hits += 1
+        return reply
+
+    def discard(self, session_id: str):
+        """Drop a session's unclaimed speculation (counted as wasted)"""
+        with self._lock:
+            self._discard(session_id)
+
+    def _discard(self, session_id: str):
+        """discard() body (lock held)"""
+        entry = self.pending.pop(session_id, None)
+        if entry is not None:
+            self.tokens_wasted += entry["tokens"]
+
+    def stats(self) -> Dict:
+        """Hit rate and token spend"""
+        with self._lock:
+            resolved = self.hits + self.misses
+            return {
+                "started": self.started,
+                "skippedBudget": self.skipped_budget,
+                "inFlight": self.in_flight,
+                "pending": len(self.pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / resolved, 4) if resolved else 0.0,
+                "tokensSpent": self.tokens_spent,
+                "tokensWasted": self.tokens_wasted
+            }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Confusable & Obfuscation Normalizer
+===================================
+
+Scammers dodge keyword and identifier patterns with look-alike characters:
+Cyrillic/Greek homoglyphs, full-width or Indic digits, zero-width spaces,
+"[at]"/"(dot)" and numbers spelled out as words. normalize_message() undoes
+all of it once per message, before any extractor or detector sees the text.
+
+Features:
+- Precomputed str.translate table (built once at import):
+  zero-width/invisible characters removed, full-width ASCII, math
+  alphanumerics, enclosed and super/subscript digits, Indic and other
+  native digits, Cyrillic/Greek homoglyphs, dash and dot variants
+- One compiled regex for "[at]"/"(dot)" style obfuscation and repeated
+  separators, one for spelled-out digit runs ("nine eight double seven" -> 9877)
+- Each pass is skipped when a cheap check shows it cannot apply
+
+Case is preserved; lowercasing stays with the individual stages.
+
+Author: Team YUKT
+License: MIT
+"""
+
+import re
+import unicodedata
+from typing import Dict
+
+# ============= TRANSLATION TABLE =============
+
+_INVISIBLE = [
+    0x00AD,                    # Soft hyphen
+    0x034F,                    # Combining grapheme joiner
+    0x180E,                    # Mongolian vowel separator
+    *range(0x200B, 0x2010),    # Zero-width space/joiners, LRM/RLM
+    *range(0x202A, 0x202F),    # Bidi embeddings/overrides
+    *range(0x2060, 0x2065),    # Word joiner, invisible operators
+    0xFEFF,                    # Zero-width no-break space / BOM
+]
+
+# Characters that NFKC-fold to plain ASCII (full-width, math bold/italic,
+# circled and super/subscript digits)
+_NFKC_RANGES = [
+    (0x00B2, 0x00B3), (0x00B9, 0x00B9),
+    (0x2070, 0x209F),
+    (0x2460, 0x24FF),
+    (0xFF01, 0xFF5E),
+    (0x1D400, 0x1D7FF),
+]
+
+# Zero of each native digit block (Arabic-Indic, Devanagari, Bengali,
+# Gurmukhi, Gujarati, Oriya, Tamil, Telugu, Kannada, Malayalam, Thai, ...)
+_DIGIT_ZEROS = [
+    0x0660, 0x06F0, 0x07C0, 0x0966, 0x09E6, 0x0A66, 0x0AE6, 0x0B66, 0x0BE6,
+    0x0C66, 0x0CE6, 0x0D66, 0x0DE6, 0x0E50, 0x0ED0, 0x0F20, 0x1040, 0x17E0,
+    0x1810, 0xFF10,
+]
+
+# Latin look-alikes that NFKC leaves alone
+_HOMOGLYPHS = {
+    # Cyrillic
+    "А": "A", "В": "B", "Е": "E", "К": "K", "М": "M", "Н": "H", "О": "O",
+    "Р": "P", "С": "C", "Т": "T", "У": "Y", "Х": "X", "Ѕ": "S", "І": "I",
+    "Ј": "J", "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y",
+    "х": "x", "ѕ": "s", "і": "i", "ј": "j", "ԁ": "d", "һ": "h", "ӏ": "l",
+    # Greek
+    "Α": "A", "Β": "B", "Ε": "E", "Ζ": "Z", "Η": "H", "Ι": "I", "Κ": "K",
+    "Μ": "M", "Ν": "N", "Ο": "O", "Ρ": "P", "Τ": "T", "Υ": "Y", "Χ": "X",
+    "α": "a", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t",
+    "υ": "u", "χ": "x",
+    # Punctuation used inside identifiers
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "−": "-", "﹣": "-",
+    "․": ".", "。": ".", "｡": ".", "﹒": ".", "﹫": "@",
+}
+
+
+def _build_table() -> Dict[int, object]:
+    table: Dict[int, object] = {cp: None for cp in _INVISIBLE}
+
+    for start, end in _NFKC_RANGES:
+        for cp in range(start, end + 1):
+            folded = unicodedata.normalize("NFKC", chr(cp))
+            if folded != chr(cp) and folded.isascii() and folded.isprintable():
+                table[cp] = folded
+
+    for zero in _DIGIT_ZEROS:
+        for offset in range(10):
+            ch = chr(zero + offset)
+            if unicodedata.decimal(ch, None) == offset:
+                table[zero + offset] = str(offset)
+
+    for ch, latin in _HOMOGLYPHS.items():
+        table[ord(ch)] = latin
+    return table
+
+
+_TABLE = _build_table()
+
+# ============= OBFUSCATION REGEX =============
+
+_NUMBER_WORDS = {
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4",
+    "five": "5", "six": "6", "seven": "7", "eight": "8", "nine": "9"
+}
+_REPEATS = {"double": 2, "triple": 3}
+
+_DIGIT_TOKEN = r'(?:(?:double|triple)[\s\-]+)?(?:zero|one|two|three|four|five|six|seven|eight|nine|\d)'
+
+_OBFUSCATION = re.compile(
+    r'(?P<at>\s*[\[\(\{]\s*at\s*[\]\)\}]\s*)'
+    r'|(?P<dot>\s*[\[\(\{]\s*dot\s*[\]\)\}]\s*)'
+    r'|(?P<underscores>_{2,})'
+    r'|(?P<dashes>-{2,})',
+    re.IGNORECASE
+)
+# Lookahead skips positions that cannot start a number word or digit
+_SPELLED_DIGITS = re.compile(
+    rf'\b(?=[zotfsend\d]){_DIGIT_TOKEN}(?:[\s,\-]+{_DIGIT_TOKEN}){{2,}}\b',
+    re.IGNORECASE
+)
+_TOKEN = re.compile(_DIGIT_TOKEN, re.IGNORECASE)
+
+
+def _spelled_digits(match: re.Match) -> str:
+    """'nine eight double seven' -> '9877'; pure digit runs stay untouched"""
+    run = match.group()
+    digits = []
+    spelled = False
+    for token in _TOKEN.findall(run):
+        parts = token.lower().split()
+        if len(parts) == 1 and "-" in parts[0]:
+            parts = parts[0].split("-")
+        word = parts[-1]
+        digit = _NUMBER_WORDS.get(word, word)
+        spelled = spelled or word in _NUMBER_WORDS
+        digits.append(digit * (_REPEATS[parts[0]] if len(parts) > 1 else 1))
+    return "".join(digits) if spelled else run
+
+
+def _replace(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind == "at":
+        return "@"
+    if kind == "dot":
+        return "."
+    if kind == "underscores":
+        return "_"
+    return "-"
+
+
+def normalize_message(text: str) -> str:
+    """
+    Undo confusable characters and common obfuscation
+
+    Examples:
+        "ｃａｌｌ ９８７６５４３２１０"            -> "call 9876543210"
+        "scammer[at]ybl"                        -> "scammer@ybl"
+        "nine eight seven six five four..."     -> "987654..."
+        "Ur<U+200B>gent: verify y<U+043E>ur KYC"  -> "Urgent: verify your KYC"
+    """
+    if not text:
+        return text
+    # Each pass runs only when a cheap check says it can change something;
+    # most messages are plain ASCII with no obfuscation
+    if not text.isascii():
+        text = text.translate(_TABLE)
+    if "[" in text or "(" in text or "{" in text or "__" in text or "--" in text:
+        text = _OBFUSCATION.sub(_replace, text)
+    lower = text.lower()
+    if any(word in lower for word in _NUMBER_WORDS):
+        text = _SPELLED_DIGITS.sub(_spelled_digits, text)
+    return text
@@ -4,7 +4,7 @@ Performance metrics collection and reporting
 
 import time
 from typing import Dict, List, Optional
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime
 import statistics
 
@@ -14,9 +14,14 @@ class MetricsCollector:
     Collect and analyze performance metrics
     """
     
-    def __init__(self):
-        """Initialize metrics collector"""
-        self.metrics = defaultdict(list)
+    def __init__(self, max_samples: int = 1000):
+        """
+        Initialize metrics collector
+        
+        Args:
+            max_samples: Recent values kept per metric (bounds memory)
+        """
+        self.metrics = defaultdict(lambda: deque(maxlen=max_samples))
         self.counters = defaultdict(int)
         self.timers = {}
     